@@ -1,6 +1,12 @@
 from .extension import *
 from .modellink_manager import *
+from .modellink_manager import ModelLinkManager
 from .model_event_registry import *
+from .signal_graph import SignalGraph
+from .signal_table import SignalTable
+from .relationship_cache import RelationshipCache
+from .work_queue import WorkQueue
+from .detection_cache import DetectionCache
 import injector
 import carb.events
 
@@ -9,10 +15,14 @@ PREFIX = "sick.modellink.core"
 
 MODELLINK_ADDED = carb.events.type_from_string(f"{PREFIX}.MODELLINK_ADDED")
 MODELLINK_REMOVED = carb.events.type_from_string(f"{PREFIX}.MODELLINK_REMOVED")
+MODELLINK_BATCH_ADDED = carb.events.type_from_string(f"{PREFIX}.MODELLINK_BATCH_ADDED")
+MODELLINK_BATCH_REMOVED = carb.events.type_from_string(f"{PREFIX}.MODELLINK_BATCH_REMOVED")
 MODELLINK_ACTIVATOR_ADDED = carb.events.type_from_string(f"{PREFIX}.MODELLINK_ACTIVATOR_ADDED")
 MODELLINK_ACTIVATOR_REMOVED = carb.events.type_from_string(f"{PREFIX}.MODELLINK_ACTIVATOR_REMOVED")
 MODELLINK_ACTIVATOR_ENABLED = carb.events.type_from_string(f"{PREFIX}.MODELLINK_ACTIVATOR_ENABLED")
 MODELLINK_ACTIVATOR_DISABLED = carb.events.type_from_string(f"{PREFIX}.MODELLINK_ACTIVATOR_DISABLED")
+MODELLINK_SCHEDULER_STATS = carb.events.type_from_string(f"{PREFIX}.MODELLINK_SCHEDULER_STATS")
+MODELLINK_LINKING_PROGRESS = carb.events.type_from_string(f"{PREFIX}.MODELLINK_LINKING_PROGRESS")
 
 
 def get_event_stream() -> carb.events.IEventStream:
@@ -20,4 +30,29 @@ def get_event_stream() -> carb.events.IEventStream:
 
 
 def get_model_event_registry() -> ModelEventRegistry:
-    return ModelEventRegistry.instance
\ No newline at end of file
+    return ModelEventRegistry.instance
+
+
+def get_signal_graph() -> SignalGraph:
+    return ModelLinkManager().get_signal_graph()
+
+
+def get_signal_table() -> SignalTable:
+    return ModelLinkManager().get_signal_table()
+
+
+def get_relationship_cache() -> RelationshipCache:
+    return ModelLinkManager().get_relationship_cache()
+
+
+def get_work_queue() -> WorkQueue:
+    return ModelLinkManager().get_work_queue()
+
+
+def get_detection_cache() -> DetectionCache:
+    return ModelLinkManager().get_detection_cache()
+
+
+def post(link_path, item, policy: str = "latest", source: str | None = None):
+    """ Thread-safe, queues item for the link at link_path, see WorkQueue.post(). """
+    ModelLinkManager().post(link_path, item, policy, source)
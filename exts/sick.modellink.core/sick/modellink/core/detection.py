@@ -0,0 +1,273 @@
+import fnmatch
+import re
+import carb
+from pxr import Usd, Sdf, Tf
+
+
+class Prefilter:
+    """ Cheap conditions a prim must meet before the function of a custom activator is called.
+        All given conditions must be met.
+
+    Args:
+        type_names (list[str], optional): the type name of the prim must be one of them
+        attributes (list[str], optional): the prim must have all of these attributes
+        metadata (list[str], optional): customData or assetInfo of the prim must contain all of these keys
+        paths (list[str], optional): the path of the prim must match one of these glob patterns (e.g. '/World/*/Sensor*')
+            or be at or below one of these paths (without wildcards)
+    """
+    __slots__ = ('type_names', '_attributes', '_metadata', '_roots', '_pattern', 'has_paths')
+
+    def __init__(self, type_names=None, attributes=None, metadata=None, paths=None) -> None:
+        self.type_names = frozenset(type_names) if type_names else None
+        self._attributes = tuple(attributes or ())
+        self._metadata = tuple(metadata or ())
+        paths = paths or ()
+        self._roots = tuple(Sdf.Path(p) for p in paths if not any(c in p for c in "*?["))
+        globs = [fnmatch.translate(p) for p in paths if any(c in p for c in "*?[")]
+        self._pattern = re.compile("|".join(globs)) if globs else None
+        self.has_paths = bool(paths)
+
+    def matches(self, prim: Usd.Prim) -> bool:
+        """ Checks all conditions except the type names, which the Detector looks up in an index.
+        """
+        for name in self._attributes:
+            if not prim.HasAttribute(name):
+                return False
+        for key in self._metadata:
+            if prim.GetCustomDataByKey(key) is None and prim.GetAssetInfoByKey(key) is None:
+                return False
+        if self._roots or self._pattern:
+            path = prim.GetPath()
+            if not any(path.HasPrefix(root) for root in self._roots) and \
+                    not (self._pattern and self._pattern.match(str(path))):
+                return False
+        return True
+
+
+SKIP_KEY = "modellink:skip"
+
+# results of Scope.classify()
+INSIDE = 0  # prims are linked
+ABOVE = 1  # not linked, but an include root is below
+OUTSIDE = 2  # neither the prim nor its descendants are linked, the traversal prunes it
+
+
+class Scope:
+    """ The subtrees in which prims are linked.
+
+    Args:
+        include (list[str], optional): the roots of the subtrees, all prims if not given
+        exclude (list[str], optional): the roots of subtrees excluded from them
+    """
+    __slots__ = ('include', 'exclude')
+
+    def __init__(self, include=None, exclude=None) -> None:
+        self.include = tuple(Sdf.Path(p) for p in include) if include else None
+        self.exclude = tuple(Sdf.Path(p) for p in exclude) if exclude else ()
+
+    def classify(self, path: Sdf.Path) -> int:
+        for root in self.exclude:
+            if path.HasPrefix(root):
+                return OUTSIDE
+        if self.include is None:
+            return INSIDE
+        for root in self.include:
+            if path.HasPrefix(root):
+                return INSIDE
+        for root in self.include:
+            if root.HasPrefix(path):
+                return ABOVE
+        return OUTSIDE
+
+    def contains(self, path: Sdf.Path) -> bool:
+        return self.classify(path) == INSIDE
+
+
+class Detector:
+    """ Finds the activator of a prim, compiled from the activators of the ModelLinkManager.
+        The rules are checked from the most to the least specific:
+            'schema': the type name of the prim equals the reference, a dict lookup
+            'class': linkedClass in customData or assetInfo, only read if there are such activators
+            'isa': the type of the prim is or derives from the reference, e.g. @linked(isa='Xformable');
+                   the most derived match is memoized per type name
+            'api': the reference is applied to the prim, e.g. @linked(has_api='PhysicsRigidBodyAPI')
+            'custom': the function of the activator returns True, it is only called if the prim meets the Prefilter
+                      of the activator; the candidates are looked up per type name
+        An activator with a Scope only detects prims inside of it.
+        The result for an instance proxy is remembered for its prim in the prototype and reused for the
+        instance proxies of all other instances ('prototype'), unless an activator depends on the path.
+        The compiled tables are built on the first detection after invalidate() was called.
+
+    Args:
+        manager (ModelLinkManager): the manager holding the activators
+    """
+
+    def __init__(self, manager) -> None:
+        self._manager = manager
+        self._compiled = False
+        self._schema: dict[str, object] = {}
+        self._class: dict[str, object] = {}
+        self._isa: list[tuple[Tf.Type, object]] = []  # most derived first
+        self._isa_memo: dict[str, object | None] = {}  # type name -> activator
+        self._api: dict[str, object] = {}
+        self._custom: list = []
+        self._custom_memo: dict[str, tuple] = {}  # type name -> custom activators whose type prefilter it passes
+        self._predicate_calls: dict[str, int] = {}
+        self._scoped = False
+        self._path_dependent = False
+        self._prototype_memo: dict[Sdf.Path, object | None] = {}  # prim in prototype -> activator
+        self._scope = Scope()  # the union of the scopes of all activators
+        self._stats = {"schema": 0, "class": 0, "isa": 0, "api": 0, "custom": 0, "prototype": 0, "none": 0}
+
+    #############################
+    # Public methods
+    #############################
+    def detect(self, prim: Usd.Prim):
+        """ Returns the activator for prim, or None.
+        """
+        if not self._compiled:
+            self._compile()
+        if not self._path_dependent and prim.IsInstanceProxy():
+            key = prim.GetPrimInPrototype().GetPath()
+            if key in self._prototype_memo:
+                self._stats["prototype"] += 1
+                return self._prototype_memo[key]
+            activator = self._prototype_memo[key] = self._detect(prim)
+            return activator
+        return self._detect(prim)
+
+    def invalidate(self):
+        """ Compiles the tables again before the next detection, called when activators are added or removed.
+        """
+        self._compiled = False
+
+    def clear_prototypes(self):
+        """ Forgets the results for prims in prototypes, called before linking, e.g. when the stage was opened.
+        """
+        self._prototype_memo = {}
+
+    def get_stats(self) -> dict[str, int]:
+        """ Returns how many prims were detected by each kind of rule, by the result for their prototype
+            ('prototype') and by none ('none').
+        """
+        return dict(self._stats)
+
+    def get_scope(self) -> Scope:
+        """ Returns the union of the scopes of all activators, the traversal can prune the subtrees outside of it.
+        """
+        if not self._compiled:
+            self._compile()
+        return self._scope
+
+    def get_predicate_calls(self) -> dict[str, int]:
+        """ Returns how often the function of each custom activator was called, by reference of the activator.
+        """
+        return dict(self._predicate_calls)
+
+    #############################
+    # Private methods
+    #############################
+    def _detect(self, prim: Usd.Prim):
+        stats = self._stats
+        type_name = prim.GetTypeName()
+        if self._schema:
+            activator = self._schema.get(type_name)
+            if activator is not None and self._in_scope(activator, prim):
+                stats["schema"] += 1
+                return activator
+
+        if self._class:
+            custom_data = prim.GetCustomDataByKey("linkedClass") or prim.GetAssetInfoByKey("linkedClass")
+            activator = self._class.get(custom_data) if custom_data else None
+            if activator is not None and self._in_scope(activator, prim):
+                stats["class"] += 1
+                return activator
+
+        if self._isa:
+            if type_name in self._isa_memo:
+                activator = self._isa_memo[type_name]
+            else:
+                activator = self._isa_memo[type_name] = self._find_isa(type_name)
+            if activator is not None and self._in_scope(activator, prim):
+                stats["isa"] += 1
+                return activator
+
+        if self._api:
+            for name in prim.GetAppliedSchemas():
+                # multiple-apply schemas are applied with an instance name, e.g. 'CollectionAPI:lights'
+                activator = self._api.get(name) or self._api.get(name.split(':')[0])
+                if activator is not None and self._in_scope(activator, prim):
+                    stats["api"] += 1
+                    return activator
+
+        if self._custom:
+            candidates = self._custom_memo.get(type_name)
+            if candidates is None:
+                candidates = self._custom_memo[type_name] = tuple(
+                    a for a in self._custom if a.prefilter is None or a.prefilter.type_names is None or type_name in a.prefilter.type_names)
+            calls = self._predicate_calls
+            for activator in candidates:
+                if activator.prefilter is not None and not activator.prefilter.matches(prim):
+                    continue
+                if not self._in_scope(activator, prim):
+                    continue
+                calls[activator.reference] += 1
+                if activator.detectFunc(prim):
+                    stats["custom"] += 1
+                    return activator
+        stats["none"] += 1
+        return None
+
+    def _compile(self):
+        self._schema = {}
+        self._class = {}
+        self._api = {}
+        self._custom = []
+        isa = []
+        for activator in self._manager.get_activators():
+            kind = activator.detectType
+            if kind == 'schema':
+                self._schema[activator.reference] = activator
+            elif kind == 'class':
+                self._class[activator.reference] = activator
+            elif kind == 'isa':
+                base = Usd.SchemaRegistry.GetTypeFromName(activator.reference)
+                if base.isUnknown:
+                    carb.log_warn(f"{activator.clazz.__name__}: unknown schema type '{activator.reference}'")
+                    continue
+                isa.append((base, activator))
+            elif kind == 'api':
+                self._api[activator.reference] = activator
+            else:
+                self._custom.append(activator)
+                self._predicate_calls.setdefault(activator.reference, 0)
+        activators = list(self._manager.get_activators())
+        scopes = [a.scope for a in activators]
+        self._scoped = any(scope is not None for scope in scopes)
+        self._path_dependent = self._scoped or any(a.prefilter is not None and a.prefilter.has_paths
+                                                   for a in activators)
+        if scopes and all(scope is not None and scope.include is not None for scope in scopes):
+            include = {root for scope in scopes for root in scope.include}
+        else:
+            include = None
+        # only subtrees excluded by all activators can be pruned
+        exclude = set.intersection(*(set(scope.exclude) if scope else set() for scope in scopes)) if scopes else set()
+        self._scope = Scope(include, exclude)
+        isa.sort(key=lambda entry: len(entry[0].GetAllAncestorTypes()), reverse=True)
+        self._isa = isa
+        self._isa_memo = {}
+        self._custom_memo = {}
+        self._prototype_memo = {}
+        self._compiled = True
+
+    def _in_scope(self, activator, prim: Usd.Prim) -> bool:
+        return not self._scoped or activator.scope is None or activator.scope.contains(prim.GetPath())
+
+    def _find_isa(self, type_name: str):
+        prim_type = Usd.SchemaRegistry.GetTypeFromName(type_name) if type_name else Tf.Type.Unknown
+        if prim_type.isUnknown:
+            return None
+        for base, activator in self._isa:
+            if prim_type.IsA(base):
+                return activator
+        return None
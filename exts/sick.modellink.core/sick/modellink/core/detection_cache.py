@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import types
+import carb
+import carb.settings
+import carb.tokens
+from pxr import Usd
+
+
+ENABLED_SETTING = "/exts/sick.modellink.core/detectionCache"
+VALIDATE_SETTING = "/exts/sick.modellink.core/detectionCacheValidate"
+PATH_SETTING = "/exts/sick.modellink.core/detectionCachePath"
+_INSTANCE_PROXIES_SETTING = "/exts/sick.modellink.core/linkInstanceProxies"
+_SKIP_MARKER_SETTING = "/exts/sick.modellink.core/skipMarker"
+
+_VERSION = 1
+
+
+class DetectionCache:
+    """ Remembers on disk which prims of a stage were linked by which activator, so reopening the stage
+        can link them without traversing the stage and detecting every prim.
+        An entry is keyed by the layers used by the stage, each with its modification time and size
+        (or a hash of its content if it is anonymous or has unsaved changes), and by the registered activators,
+        the scope of the ModelLinkManager and the settings linkInstanceProxies and skipMarker. Any change of these misses the entry.
+        The entries are stored as JSON files in the directory of the setting detectionCachePath
+        (default '${data}/modellink/detection_cache').
+        With the setting detectionCacheValidate, a hit is compared with a real detection of the stage
+        before anything is linked, mismatches are logged and the detected links are used.
+
+        It can be accessed by: sick.modellink.core.get_detection_cache()
+
+    Args:
+        manager (ModelLinkManager): the manager holding the activators
+    """
+
+    def __init__(self, manager) -> None:
+        self._manager = manager
+        self._last: tuple[Usd.Stage, str] | None = None  # the key computed by the last load()
+        self._stats = {"hits": 0, "misses": 0, "mismatches": 0, "stored": 0}
+
+    #############################
+    # Public methods
+    #############################
+    def is_enabled(self) -> bool:
+        return bool(carb.settings.get_settings().get(ENABLED_SETTING))
+
+    def is_validating(self) -> bool:
+        return bool(carb.settings.get_settings().get(VALIDATE_SETTING))
+
+    def load(self, stage: Usd.Stage) -> dict[str, str] | None:
+        """ Returns the cached links of stage, prim path -> activator id, or None if there is no valid entry.
+        """
+        if not self.is_enabled():
+            return None
+        key = self._compute_key(stage)
+        self._last = (stage, key)
+        try:
+            with open(self._get_file(key), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self._stats["misses"] += 1
+            return None
+        except (OSError, ValueError) as e:
+            carb.log_warn(f"Detection cache: cannot read the entry {key}: {e}")
+            self._stats["misses"] += 1
+            return None
+        if data.get("version") != _VERSION or data.get("key") != key:
+            self._stats["misses"] += 1
+            return None
+        self._stats["hits"] += 1
+        return dict(data["links"])
+
+    def store(self, stage: Usd.Stage, links: dict[str, str]):
+        """ Stores the links of stage, prim path -> activator id.
+        """
+        if not self.is_enabled():
+            return
+        if self._last is not None and self._last[0] == stage:
+            # the key of the layers as load() found them: the links may have authored since (e.g. Enabler
+            # or TransformWriter), but reopening the saved stage starts from the state before that
+            key = self._last[1]
+        else:
+            key = self._compute_key(stage)
+        self._last = None
+        path = self._get_file(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, "w", encoding="utf-8") as f:
+                json.dump({"version": _VERSION, "key": key, "links": sorted(links.items())}, f)
+            os.replace(temp, path)
+            self._stats["stored"] += 1
+        except OSError as e:
+            carb.log_warn(f"Detection cache: cannot write the entry {key}: {e}")
+
+    def validate(self, cached: dict[str, str], detected: dict[str, str]) -> bool:
+        """ Compares a cache hit with the links found by detection, logs the differences.
+        """
+        if cached == detected:
+            return True
+        self._stats["mismatches"] += 1
+        missing = sorted(detected.keys() - cached.keys())
+        stale = sorted(cached.keys() - detected.keys())
+        changed = sorted(p for p in cached.keys() & detected.keys() if cached[p] != detected[p])
+        carb.log_warn(f"Detection cache mismatch: {len(missing)} missing, {len(stale)} stale, "
+                      f"{len(changed)} changed, e.g. {(missing + stale + changed)[:5]}")
+        return False
+
+    def get_stats(self) -> dict[str, int]:
+        """ Returns the number of 'hits', 'misses', 'mismatches' found by validation and entries 'stored'.
+        """
+        return dict(self._stats)
+
+    @staticmethod
+    def activator_id(activator) -> str:
+        """ Returns an id of the activator that is the same in every session.
+        """
+        clazz = activator.clazz
+        return f"{clazz.__module__}.{clazz.__qualname__}:{activator.detectType}:{activator.reference}"
+
+    #############################
+    # Private methods
+    #############################
+    def _compute_key(self, stage: Usd.Stage) -> str:
+        stamps = []
+        for layer in stage.GetUsedLayers():
+            real_path = layer.realPath
+            if real_path and not layer.anonymous and not layer.dirty and os.path.isfile(real_path):
+                stat = os.stat(real_path)
+                stamp = f"{stat.st_mtime_ns}:{stat.st_size}"
+            else:
+                stamp = hashlib.sha1(layer.ExportToString().encode()).hexdigest()
+            # the identifier of an anonymous layer, e.g. the session layer, differs in every session
+            stamps.append(("anon" if layer.anonymous else layer.identifier, stamp))
+        digest = hashlib.sha1(repr(sorted(stamps)).encode())
+        for activator in sorted(self._manager.get_activators(), key=self.activator_id):
+            digest.update(self.activator_id(activator).encode())
+            digest.update(repr((activator.enabled, self._describe(activator.scope),
+                                self._describe(activator.prefilter))).encode())
+            code = getattr(activator.detectFunc, "__code__", None)
+            if activator.detectType == 'custom' and code is not None:
+                digest.update(code.co_code)
+                # nested functions are left out, their repr contains an address
+                consts = tuple(c for c in code.co_consts if not isinstance(c, types.CodeType))
+                digest.update(repr(consts).encode())
+        digest.update(repr(self._describe(self._manager.get_scope())).encode())
+        settings = carb.settings.get_settings()
+        digest.update(str(bool(settings.get(_INSTANCE_PROXIES_SETTING))).encode())
+        digest.update(str(bool(settings.get(_SKIP_MARKER_SETTING))).encode())
+        return digest.hexdigest()
+
+    def _describe(self, obj) -> tuple | None:
+        if obj is None:
+            return None
+        values = ((name, getattr(obj, name)) for name in type(obj).__slots__)
+        # sets are sorted, their order differs between sessions
+        return tuple((name, repr(sorted(value) if isinstance(value, frozenset) else value)) for name, value in values)
+
+    def _get_file(self, key: str) -> str:
+        directory = carb.settings.get_settings().get(PATH_SETTING) or "${data}/modellink/detection_cache"
+        directory = carb.tokens.get_tokens_interface().resolve(directory)
+        return os.path.join(directory, f"{key}.json")
@@ -1,9 +1,10 @@
 import carb
+import carb.settings
 import omni
 from pxr import Usd, Tf
 import sick.modellink.core
 from .event_providers import EventProvider, EventStreamProvider
-from .modellink_manager import ModelLinkManager
+from .modellink_manager import ModelLinkManager, ASYNC_LINKING_SETTING, RECONCILE_SETTING
 
 
 class ModelEventRegistry:
@@ -25,6 +26,8 @@ class ModelEventRegistry:
         self._stage_listener = self._context.get_stage_event_stream().create_subscription_to_pop(self._on_stage_event)
         self._event_providers = []
         self._register_event_providers()
+        self._frame_listener = omni.kit.app.get_app().get_pre_update_event_stream().create_subscription_to_pop(
+            self._on_frame, order=-100, name="sick.modellink.core frame")
         self._handle_stage_open()
         self._modellink_listener = ModelLinkManager().get_event_stream().create_subscription_to_pop(self._on_modellink_event)
 
@@ -37,6 +40,7 @@ class ModelEventRegistry:
     def clear(self):
         self._clear_usd_events()
         self._stage_listener = None
+        self._frame_listener = None
 
     ############################
     # Private methods
@@ -48,6 +52,12 @@ class ModelEventRegistry:
         elif e.type == int(sick.modellink.core.MODELLINK_REMOVED):
             carb.log_info(f"MODELLINK_REMOVED {e.payload}")
             self._activate_event_providers()
+        elif e.type == int(sick.modellink.core.MODELLINK_BATCH_ADDED):
+            carb.log_info(f"MODELLINK_BATCH_ADDED {len(e.payload['prim_paths'])} links")
+            self._activate_event_providers()
+        elif e.type == int(sick.modellink.core.MODELLINK_BATCH_REMOVED):
+            carb.log_info(f"MODELLINK_BATCH_REMOVED {len(e.payload['prim_paths'])} links")
+            self._activate_event_providers()
         elif e.type == int(sick.modellink.core.MODELLINK_ACTIVATOR_ADDED):
             carb.log_info(f"MODELLINK_ACTIVATOR_ADDED {e.payload}")
         elif e.type == int(sick.modellink.core.MODELLINK_ACTIVATOR_REMOVED):
@@ -56,6 +66,11 @@ class ModelEventRegistry:
             carb.log_info(f"MODELLINK_ACTIVATOR_ENABLED {e.payload}")
         elif e.type == int(sick.modellink.core.MODELLINK_ACTIVATOR_DISABLED):
             carb.log_info(f"MODELLINK_ACTIVATOR_DISABLED {e.payload}")
+        elif e.type == int(sick.modellink.core.MODELLINK_SCHEDULER_STATS):
+            carb.log_info(f"MODELLINK_SCHEDULER_STATS {e.payload}")
+        elif e.type == int(sick.modellink.core.MODELLINK_LINKING_PROGRESS):
+            if e.payload["done"]:
+                carb.log_info(f"MODELLINK_LINKING_PROGRESS {e.payload}")
 
 
     def _is_event_type_used(self, provider):
@@ -75,14 +90,30 @@ class ModelEventRegistry:
         stage = self._context.get_stage()   # TODO: check why usdrt is not working if scene reloaded
         self._stage = stage
 
-        self._manager.link_entire_stage(self._stage)
+        self._manager.invalidate_call_plans()
+        self._manager.get_relationship_cache().clear()
+        self._manager.get_signal_table().clear()
+        settings = carb.settings.get_settings()
+        if settings.get(RECONCILE_SETTING):
+            self._manager.reconcile_stage(self._stage)
+        elif settings.get(ASYNC_LINKING_SETTING):
+            self._manager.link_stage_async(self._stage)
+        else:
+            self._manager.link_entire_stage(self._stage)
 
         self._setup_usd_events(stage)
 
 
     def _handle_stage_close(self):
         self._clear_usd_events()
-        self._manager.clear_links()
+        self._manager.invalidate_call_plans()
+        if carb.settings.get_settings().get(RECONCILE_SETTING):
+            # kept for reopening the stage
+            self._manager.suspend_links()
+        else:
+            self._manager.clear_links()
+        self._manager.get_relationship_cache().clear()
+        self._manager.get_signal_table().clear()
         self._stage = None
 
 
@@ -90,7 +121,10 @@ class ModelEventRegistry:
         self._clear_usd_events()
         self._stage = stage
         self._listener = Tf.Notice.Register(Usd.Notice.ObjectsChanged, self._handle_usd_event, self._stage)
-        # self._activate_event_providers()
+        self._activate_event_providers()
+
+    def _on_frame(self, e: carb.events.IEvent):
+        self._manager.begin_frame()
 
     def _on_event(self, event):
         self._manager.dispatch_events(event)
@@ -135,15 +169,17 @@ class ModelEventRegistry:
         if sender is None or sender != self._stage:
             return
 
-        for resync_path in objects_changed.GetResyncedPaths():
-            if resync_path.IsPrimPath():
-                prim = self._stage.GetPrimAtPath(resync_path)
-                if prim and prim.IsActive():
-                    self._manager.create_new_link(prim)
-                if not prim:
-                    self._manager.remove_link(resync_path)
-
-        for changed_path in objects_changed.GetChangedInfoOnlyPaths():
-            if changed_path.IsPropertyPath():
-                self._manager.property_changed(changed_path)
+        resynced_paths = objects_changed.GetResyncedPaths()
+        changed_info_paths = objects_changed.GetChangedInfoOnlyPaths()
+        self._manager.get_relationship_cache().changed(resynced_paths, changed_info_paths)
+
+        # resynced paths are sorted, so descendants of an already handled root can be skipped
+        root = None
+        for resync_path in sorted(p for p in resynced_paths if p.IsPrimPath()):
+            if root is None or not resync_path.HasPrefix(root):
+                root = resync_path
+                self._manager.relink_subtree(root, self._stage)
+
+        self._manager.properties_changed([p for p in changed_info_paths if p.IsPropertyPath()],
+                                         [p for p in resynced_paths if p.IsPropertyPath()])
 
@@ -1,15 +1,47 @@
+import bisect
+import functools
+from concurrent.futures import Future, ThreadPoolExecutor
+import heapq
 import inspect
-from typing import Callable, Iterator
+import os
+import time
+from contextlib import contextmanager
+from typing import Callable, Iterable, Iterator, get_type_hints
+import carb
+import carb.settings
 from carb import events
 from omni import timeline, usd
-from pxr import Usd, Sdf
+from pxr import Usd, Sdf, Tf
 from injector import Injector, get_bindings, inject, noninjectable
 import sick.modellink.core
 from sick.modellink.core.event_providers import type_for
 from .omniverse_di_module import OmniverseDIModule
+from .signal_graph import SignalGraph
+from .signal_table import SignalTable
+from .relationship_cache import RelationshipCache
+from .work_queue import WorkQueue
+from .detection import Detector, Prefilter, Scope, SKIP_KEY, INSIDE, OUTSIDE
+from .detection_cache import DetectionCache
 
 
-def on_update(*args, editmode: bool = False):
+FRAME_BUDGET_SETTING = "/exts/sick.modellink.core/frameBudgetMs"
+MAX_DEFER_FRAMES_SETTING = "/exts/sick.modellink.core/maxDeferFrames"
+OFFLOAD_WORKERS_SETTING = "/exts/sick.modellink.core/offloadWorkers"
+ASYNC_LINKING_SETTING = "/exts/sick.modellink.core/asyncLinking"
+INSTANCE_PROXIES_SETTING = "/exts/sick.modellink.core/linkInstanceProxies"
+SKIP_MARKER_SETTING = "/exts/sick.modellink.core/skipMarker"
+LINKING_SLICE_SETTING = "/exts/sick.modellink.core/asyncLinkingSliceMs"
+RECONCILE_SETTING = "/exts/sick.modellink.core/reconcileLinks"
+_PRIORITIES = {"high": 0, "normal": 1, "low": 2}
+_REBIND_EVENT = type_for("rebind")
+
+
+def _new_scheduler_stats() -> dict:
+    return {"frames": 0, "deferred": 0, "overruns": 0, "max_overrun_ms": 0.0}
+
+
+def on_update(*args, editmode: bool = False, batch: bool = False, hz: float | None = None,
+              priority: str = "normal", offload: bool = False):
     """ Decorator to link a method to the update event.
         The method is called every frame.
         e.g.
@@ -27,20 +59,61 @@ def on_update(*args, editmode: bool = False):
             def your_method(prim: Usd.Prim):
                 pass    
 
+        A batch method is called once per frame for the whole class, like a classmethod,
+        with the instances of all links of the class (and their prims, if it has a 'prims' parameter):
+        4)  @on_update(batch=True)
+            def your_method(cls, instances: list, prims: list):
+                pass
+
+        A method may be called less often than every frame, the calls of the instances of a class are spread
+        evenly over the frames. The time elapsed since the last call is passed to a parameter 'dt':
+        5)  @on_update(hz=10)
+            def your_method(dt: float):
+                pass
+
+        High priority methods are called first. Low priority methods are only called while the frame budget
+        (setting /exts/sick.modellink.core/frameBudgetMs, default 0 = unlimited) is not used up,
+        the others are called in later frames:
+        6)  @on_update(priority="low")
+            def your_method():
+                pass
+
+        With offload, the method is computed on a worker thread and must not use the stage: it only gets the result
+        of the snapshot() method of the instance (also if None), which is called on the main thread. Methods with
+        Usd.Prim or Usd.Stage parameters and methods of classes without snapshot() are not registered.
+        It returns the writes:
+        a dict of attribute names (or property paths) and values, or a callable. They are committed
+        on the main thread at the beginning of the next frame:
+        7)  def snapshot(self):
+                return self._samples.copy()
+
+            @on_update(offload=True)
+            def your_method(self, snapshot) -> dict:
+                return {"vac:value": float(np.mean(snapshot))}
+
     Args:
         editmode (bool, optional): If True, the method is called even if the timeline is paused. Defaults to False.
+        batch (bool, optional): If True, the method is called once for all instances of the class. Defaults to False.
+        hz (float, optional): If set, the method is called at most hz times per second. Defaults to None.
+        priority (str, optional): "high", "normal" or "low". Defaults to "normal".
+        offload (bool, optional): If True, the method is computed on a worker thread. Defaults to False.
     """
     no_args = len(args) == 1 and inspect.isfunction(args[0])
     _editmode = not no_args and editmode
+    _batch = not no_args and batch
+    _hz = None if no_args else hz
+    _priority = "normal" if no_args else priority
+    _offload = not no_args and offload
 
     def inner(f):
         manager = ModelLinkManager()
-        manager.register_event(f, "update", _editmode)
+        manager.register_event(f, "update", _editmode, _batch, _hz, _priority, _offload)
         return f
     return inner(args[0]) if no_args else inner
 
 
-def on_pre_update(*args, editmode: bool = False):
+def on_pre_update(*args, editmode: bool = False, batch: bool = False, hz: float | None = None,
+                  priority: str = "normal", offload: bool = False):
     """ Decorator to link a method to the preupdate event.
         The method is called every frame before the update event.
         e.g.
@@ -60,13 +133,22 @@ def on_pre_update(*args, editmode: bool = False):
 
     Args:
         editmode (bool, optional): If True, the method is called even if the timeline is paused. Defaults to False.
+        batch (bool, optional): If True, the method is called once for all instances of the class,
+            see on_update. Defaults to False.
+        hz (float, optional): If set, the method is called at most hz times per second, see on_update. Defaults to None.
+        priority (str, optional): "high", "normal" or "low", see on_update. Defaults to "normal".
+        offload (bool, optional): If True, the method is computed on a worker thread, see on_update. Defaults to False.
     """
     no_args = len(args) == 1 and inspect.isfunction(args[0])
     _editmode = not no_args and editmode
+    _batch = not no_args and batch
+    _hz = None if no_args else hz
+    _priority = "normal" if no_args else priority
+    _offload = not no_args and offload
 
     def inner(f):
         manager = ModelLinkManager()
-        manager.register_event(f, "pre_update", _editmode)
+        manager.register_event(f, "pre_update", _editmode, _batch, _hz, _priority, _offload)
         return f
     return inner(args[0]) if no_args else inner
 
@@ -79,6 +161,24 @@ def on_destroy(f):
     return f
 
 
+def on_rebind(f):
+    """ Decorator to link a method to the rebind event.
+        With the setting reconcileLinks, a link is kept when the stage is reopened or its prim is resynced,
+        e.g. by a reloaded layer, if the prim still exists and is detected by the same activator.
+        The method is called with the new prim and should refresh everything read from the old one, e.g.
+
+            @on_rebind
+            def rebind(self, prim: Usd.Prim, stage: Usd.Stage):
+                self.prim = prim
+                self.stage = stage
+
+        Links of classes without such a method are created again.
+    """
+    manager = ModelLinkManager()
+    manager.register_event(f, "rebind", True)
+    return f
+
+
 def on_play(f):
     """ Decorator to link a method to the play event.
     """
@@ -126,27 +226,81 @@ def on_event(_id: str | int):
     return inner
 
 
+def on_post(*args, param_name: str = 'value'):
+    """ Decorator to link a method to the values posted to the link from any thread,
+        see sick.modellink.core.post(). The method is called on the main thread at the beginning of a frame.
+        e.g.
+
+        1)  @on_post
+            def your_method(self, value: float):
+                pass
+
+        2)  @on_post(param_name='message')
+            def your_method(self, message: str):
+                pass
+
+    Args:
+        param_name (str, optional): the name of the parameter the value is passed to. Defaults to 'value'.
+    """
+    no_args = len(args) == 1 and inspect.isfunction(args[0])
+    _param_name = 'value' if no_args else param_name
+
+    def inner(f):
+        manager = ModelLinkManager()
+        manager.add_post_handler(f, _param_name)
+        return f
+
+    if no_args:
+        return inner(args[0])
+    return inner
+
+
 # decorator to link a method to a prim attribute
-def usd_attr(paths: str, param_name: str | None = None):
+def usd_attr(paths: str, param_name: str | None = None, coalesce: bool = False, grouped: bool = False):
     """ Decorator to link a method to a prim attribute. The method is called when the attribute changes.
         The changed value is passed to the method as argument with the name of the attribute
         or the name specified in param_name.
+        e.g.
+
+        1)  @usd_attr('size')
+            def your_method(self, size: float):
+                pass
+
+        2)  @usd_attr('vac:value', param_name='value', coalesce=True)
+            def your_method(self, value: float):
+                pass
+
+        3)  @usd_attr('vac:offset;vac:factor', grouped=True)
+            def your_method(self, changes: dict):
+                pass
+
     Args:
         paths (str): the names of the attributes (separated by semicolons) of the prim to be observed
         param_name (str | None, optional): the name of the parameter to be passed to the function. Defaults to the path.
+        coalesce (bool, optional): If True, changes are collected during a frame and the method is called once per attribute
+            with the latest value at the beginning of the next frame, before the 'pre_update' event. Defaults to False.
+        grouped (bool, optional): If True, the method is called once per change notice instead of once per attribute.
+            A dict of the changed attribute names and their values is passed as 'changes' or the name specified in param_name.
+            Defaults to False.
     """
+    if grouped and param_name is None:
+        param_name = 'changes'
+
     def inner(f):
         manager = ModelLinkManager()
         semicolon_separated_paths = [p.strip() for p in paths.split(';') if p.strip()]
         do_injection = True
         for path in semicolon_separated_paths:
-            manager.add_usd_attr(f, path, param_name, do_injection)
+            manager.add_usd_attr(f, path, param_name, do_injection, coalesce, grouped)
             do_injection = False 
         return f
     return inner
 
 
-def linked(*args, enabled: bool = True):
+def linked(*args, enabled: bool = True, isa: str | type | None = None, has_api: str | type | None = None,
+           type_names: list[str] | None = None, attributes: list[str] | None = None,
+           metadata: list[str] | None = None, paths: list[str] | None = None,
+           include: list[str] | None = None, exclude: list[str] | None = None):
     """ Decorator to link a class to a prim. The correct prim is recognized using 'detection'. 
     The detection can be specified as an argument to the decorator.
 
@@ -175,13 +329,32 @@ def linked(*args, enabled: bool = True):
         e.g.
             def yourFunction(prim):
                 return prim.HasAttribute('yourAttribute')
+
+        The function is only called for prims meeting the prefilters given by type_names, attributes,
+        metadata (keys of customData or assetInfo) and paths (glob patterns or subtree roots), see Prefilter.
+        e.g.
+            @linked(yourFunction, type_names=['Xform'], attributes=['yourAttribute'], paths=['/World/Line*'])
+
+    4)  @linked(isa='Xformable') or @linked(isa=UsdGeom.Xformable)
+        The prim must have the schema or a schema derived from it, e.g. 'Cube'.
+
+    5)  @linked(has_api='PhysicsRigidBodyAPI') or @linked(has_api=UsdPhysics.RigidBodyAPI)
+        The API schema must be applied to the prim.
+
+    Any rule can be restricted to the subtrees at the include paths, without the subtrees at the exclude paths.
+    If all activators have include paths, the traversal skips everything else.
+        e.g.
+            @linked('Cube', include=['/World/Lines'], exclude=['/World/Lines/Archive'])
     """
     no_args = len(args) == 1 and inspect.isclass(args[0])
     rule = None if no_args or len(args) == 0 else args[0]
+    prefilter = Prefilter(type_names, attributes, metadata, paths) \
+        if type_names or attributes or metadata or paths else None
+    scope = Scope(include, exclude) if include or exclude else None
 
     def inner(c):
         if inspect.isclass(c):
-            activator = ModelLinkActivator(c, rule, enabled)
+            activator = ModelLinkActivator(c, rule, enabled, isa, has_api, prefilter, scope)
             manager = ModelLinkManager()
             manager.add_activator(activator)
         return c
@@ -203,18 +376,34 @@ class ModelLinkActivator():
             If a function is provided, the function is called with the prim as argument.
             If nothing is provided, the class name is used as reference. 
             In this case, the prim must contain the entry linkedClass='yourClass' in customData or assetInfo (Metadata of the prim)
+        isa (str | type, optional): instead of rule, a schema the schema of the prim must be or derive from
+        has_api (str | type, optional): instead of rule, an API schema that must be applied to the prim
+        prefilter (Prefilter, optional): conditions checked before the function of a custom rule is called
+        scope (Scope, optional): the subtrees in which prims are detected
     """
 
     type_class = 'class'
     type_schema = 'schema'
     type_custom = 'custom'
+    type_isa = 'isa'
+    type_api = 'api'
 
-    def __init__(self, clazz, rule, enabled=True) -> None:
+    def __init__(self, clazz, rule, enabled=True, isa=None, has_api=None, prefilter: Prefilter | None = None,
+                 scope: Scope | None = None) -> None:
         self.enabled = enabled
         self.members = Members()
         self.clazz = clazz
         self.detectFunc = self._default_detect
-        if not rule:
+        self.prefilter = prefilter
+        self.scope = scope
+        if isa:
+            self.detectType = ModelLinkActivator.type_isa
+            self.reference = isa if type(isa) is str else Tf.Type.Find(isa).typeName
+        elif has_api:
+            self.detectType = ModelLinkActivator.type_api
+            self.reference = has_api if type(has_api) is str else \
+                Usd.SchemaRegistry.GetSchemaTypeName(Tf.Type.Find(has_api))
+        elif not rule:
             self.detectType = ModelLinkActivator.type_class
             self.reference = str(clazz.__name__)
         elif type(rule) is str:
@@ -231,39 +420,243 @@ class ModelLinkActivator():
     def set_members(self, members):
         self.members = members
 
-    def call_attr_changed(self, changed_path: Sdf.Path, instance, prim):
-        attr = changed_path.name
-
-        value = prim.GetAttribute(attr).Get()
-        if attr in self.members.attr:
-            self._call(self.members.attr[attr], instance, prim, value)
-
-    def call_event(self, event_type: int, instance, prim):
-        if event_type in self.members.event:
-            playing = timeline.get_timeline_interface().is_playing()
-            for event in self.members.event[event_type]:
-                if playing or bool(event.__meta_editmode__):
-                    self._call(event, instance, prim, None)
-
     #############################
     # Private methods
     #############################
-    def _call(self, func, instance, prim, value):
-        if not bool(func.__bindings__):
-            func(instance)
+    def _default_detect(self, *args) -> bool:
+        return True
+
+
+class CallPlan:
+    """ A handler of a ModelLink with its injected parameters resolved in advance.
+        Only the prim and the value parameters are filled in at call time.
+        The injected parameters are resolved on the first call and again after invalidate() was called.
+
+    Args:
+        func (Callable): the handler, as registered by a decorator
+        instance (object): the instance the handler is called on
+    """
+    __slots__ = ('_func', '_instance', '_prim_params', '_value_param', '_bound', 'coalesce', 'grouped')
+
+    def __init__(self, func, instance) -> None:
+        self._func = func
+        self._instance = instance
+        self.coalesce = bool(getattr(func, '__meta_coalesce__', False))
+        self.grouped = bool(getattr(func, '__meta_grouped__', False))
+        self._prim_params = tuple(getattr(func, '__meta_prim_params__', ()))
+        self._value_param = getattr(func, '__meta_value_param__', None)
+        self._bound = None
+
+    def invalidate(self):
+        self._bound = None
+
+    def bind(self):
+        """ Resolves the injected parameters now, e.g. on the main thread before calling the plan on another thread.
+        """
+        if self._bound is None:
+            self._compile()
+
+    def call_value(self, value):
+        """ Calls the handler with value only, also if it is None, e.g. on a worker thread without a prim.
+        """
+        bound = self._bound or self._compile()
+        return bound(**{self._value_param: value}) if self._value_param is not None else bound()
+
+    def __call__(self, prim, value=None):
+        bound = self._bound or self._compile()
+        if not self._prim_params and (value is None or self._value_param is None):
+            return bound()
+        kargs = {k: prim for k in self._prim_params}
+        if value is not None and self._value_param is not None:
+            kargs[self._value_param] = value
+        return bound(**kargs)
+
+    def _compile(self):
+        bound = self._func.__get__(self._instance)
+        bindings = get_bindings(self._func)
+        if bool(bindings):
+            injector = ModelLinkManager()._injector
+            bound = functools.partial(bound, **{k: injector.get(v) for k, v in bindings.items()})
+        self._bound = bound
+        return bound
+
+
+def _clamp_dt(dt: float, period: float) -> float:
+    # a handler due within the last frame is called at most one period and one frame after the previous call,
+    # longer times are stalls, e.g. while the timeline was paused
+    limit = period + ModelLinkManager()._frame_dt
+    return min(dt, limit) if limit else dt
+
+
+class BatchCall:
+    """ A batch handler of a class, called once per event with the instances and prims of all links of the class.
+        The lists are kept until a link is added or removed, so a handler may cache data computed from them
+        as long as it gets the same list.
+
+        With hz, it is called at most hz times per second, with the elapsed time as 'dt' if it has such a parameter.
+        'dt' is at most the period plus the duration of the last frame, and restarts while the handler
+        is not called because the timeline is not playing.
+
+    Args:
+        func (Callable): the handler, as registered by a decorator with batch=True
+        clazz (type): the linked class, passed to the handler like to a classmethod
+        event_type (int): the event the handler is registered for
+    """
+    __slots__ = ('_func', '_clazz', 'event_type', '_with_prims', '_with_dt', '_period', '_last', '_links',
+                 '_instances', '_prims')
+
+    def __init__(self, func, clazz, event_type: int) -> None:
+        self._func = func
+        self._clazz = clazz
+        self.event_type = event_type
+        parameters = inspect.signature(func).parameters
+        self._with_prims = 'prims' in parameters
+        self._with_dt = 'dt' in parameters
+        self._period = 1.0 / func.__meta_hz__ if func.__meta_hz__ else 0.0
+        self._last = time.perf_counter()
+        self._links: dict[Sdf.Path, tuple[object, Usd.Prim]] = {}
+        self._instances: list | None = None
+        self._prims: list[Usd.Prim] | None = None
+
+    def add(self, path: Sdf.Path, link: 'ModelLink', plan: CallPlan):
+        self._links[path] = (link._instance, link._prim)
+        self._instances = None
+
+    def remove(self, path: Sdf.Path) -> bool:
+        """ Returns True if no link is left. """
+        if self._links.pop(path, None) is not None:
+            self._instances = None
+        return not self._links
+
+    def reset(self):
+        """ Restarts the elapsed time, called while the handler is skipped. """
+        self._last = time.perf_counter()
+
+    def __call__(self, prim=None):
+        now = time.perf_counter()
+        dt = now - self._last
+        if dt < self._period:
             return
-        if hasattr(func, '__meta_prim_params__'):
-            kargs = {k: prim for k in func.__meta_prim_params__}
-        else:
-            kargs = {}
-        if value is not None and hasattr(func, '__meta_value_param__'):
-            kargs[func.__meta_value_param__] = value
+        self._last = now
+        dt = _clamp_dt(dt, self._period)
+        if self._instances is None:
+            self._instances = [instance for instance, _ in self._links.values()]
+            self._prims = [p for _, p in self._links.values()]
+        kwargs = {}
+        if self._with_prims:
+            kwargs['prims'] = self._prims
+        if self._with_dt:
+            kwargs['dt'] = dt
+        return self._func(self._clazz, self._instances, **kwargs)
+
+
+class RateGroup:
+    """ Calls a handler of all links of a class at most hz times per second, with the elapsed time as value ('dt').
+        The first call of every link is delayed by a fraction of the period, taken from the golden ratio sequence,
+        so the calls of many links are spread evenly over the frames instead of happening in the same frame.
+        Called once per event, it only visits the links which are due (a heap ordered by due time).
+        'dt' is limited like the one of a BatchCall. While the handler is skipped, e.g. because the timeline
+        is paused, all due times are moved on, so the calls are still spread over the frames after the pause.
 
-        injector = ModelLinkManager()._injector
-        injector.call_with_injection(func, instance, kwargs=kargs)
+    Args:
+        func (Callable): the handler, as registered by a decorator with hz
+        event_type (int): the event the handler is registered for
+    """
+    __slots__ = ('_func', 'event_type', '_period', '_heap', '_entries', '_count', '_tick')
+
+    _GOLDEN_RATIO_CONJUGATE = 0.6180339887498949
+
+    def __init__(self, func, event_type: int) -> None:
+        self._func = func
+        self.event_type = event_type
+        self._period = 1.0 / func.__meta_hz__
+        self._heap: list[list] = []  # [due, sequence, plan, prim, last call]
+        self._entries: dict[Sdf.Path, list] = {}
+        self._count = 0
+        self._tick = time.perf_counter()  # the last call or reset
+
+    def add(self, path: Sdf.Path, link: 'ModelLink', plan: CallPlan):
+        now = time.perf_counter()
+        phase = (self._count * self._GOLDEN_RATIO_CONJUGATE) % 1.0
+        entry = [now + phase * self._period, self._count, plan, link._prim, now]
+        self._count += 1
+        self._remove_entry(path)
+        self._entries[path] = entry
+        heapq.heappush(self._heap, entry)
+
+    def remove(self, path: Sdf.Path) -> bool:
+        """ Returns True if no link is left. """
+        self._remove_entry(path)
+        return not self._entries
+
+    def reset(self):
+        """ Moves the due times and the last calls of all links by the time skipped, called while the handler
+            is skipped. All entries are moved by the same time, so their order and phases are kept.
+        """
+        now = time.perf_counter()
+        skipped, self._tick = now - self._tick, now
+        for entry in self._heap:
+            entry[0] += skipped
+            entry[4] += skipped
+
+    def __call__(self, prim=None):
+        heap = self._heap
+        now = self._tick = time.perf_counter()
+        due = []
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if entry[2] is None:  # removed
+                continue
+            # keep the phase, skip periods missed e.g. by a long frame
+            entry[0] += self._period * (1 + (now - entry[0]) // self._period)
+            due.append(entry)
+        for entry in due:
+            heapq.heappush(heap, entry)
+        for entry in due:
+            plan = entry[2]
+            if plan is not None:
+                dt, entry[4] = _clamp_dt(now - entry[4], self._period), now
+                plan(entry[3], dt)
+
+    def _remove_entry(self, path: Sdf.Path):
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            entry[2] = None
+
+
+class OffloadCall:
+    """ A handler of a ModelLink computed on a worker thread of the ModelLinkManager.
+        When called, the snapshot of the instance is taken and the handler is submitted, unless the previous
+        computation has not been committed yet. The result is committed by the manager in the next frame.
+
+    Args:
+        path (Sdf.Path): the path of the link
+        link (ModelLink): the link the handler belongs to
+        plan (CallPlan): the plan of the handler, called with the snapshot as value ('snapshot')
+    """
+    __slots__ = ('path', 'link', '_plan', '_snapshot', 'future')
+
+    def __init__(self, path: Sdf.Path, link: 'ModelLink', plan: CallPlan) -> None:
+        self.path = path
+        self.link = link
+        self._plan = plan
+        self._snapshot = link._instance.snapshot
+        self.future: Future | None = None
+
+    def __call__(self, prim=None):
+        if self.future is not None:
+            return
+        snapshot = self._snapshot()
+        self._plan.bind()
+        self.future = ModelLinkManager()._submit_offload(self, snapshot)
+
+    def compute(self, snapshot):
+        """ Runs the handler on a worker thread, with nothing but the snapshot.
+        """
+        return self._plan.call_value(snapshot)
 
-    def _default_detect(self, *args) -> bool:
-        return True
+
+_TIMED_CALLS = (BatchCall, RateGroup)
 
 
 class ModelLink:
@@ -278,15 +671,92 @@ class ModelLink:
         self._instance = instance
         self._prim = prim
         self._activator: ModelLinkActivator = activator
+        self._attr_plans: dict[str, CallPlan] = {}
+        self._event_plans: dict[int, list[CallPlan]] = {}
+        self._post_plan: CallPlan | None = None
+        self._build_plans()
 
     def destroy(self):
         pass
 
+    def rebind(self, prim: Usd.Prim):
+        """ Links the instance to prim, the new prim at the same path, and calls its @on_rebind handlers.
+        """
+        self._prim = prim
+        self.invalidate_plans()
+        self.dispatch_event(_REBIND_EVENT)
+
+    def invalidate_plans(self):
+        for plan in self._attr_plans.values():
+            plan.invalidate()
+        for plans in self._event_plans.values():
+            for plan in plans:
+                plan.invalidate()
+        if self._post_plan:
+            self._post_plan.invalidate()
+
     def property_changed(self, changed_path):
-        self._activator.call_attr_changed(changed_path, self._instance, self._prim)
+        plan = self._attr_plans.get(changed_path.name)
+        if plan:
+            plan(self._prim, self._prim.GetAttribute(changed_path.name).Get())
 
     def dispatch_event(self, event_type: int):
-        self._activator.call_event(event_type, self._instance, self._prim)
+        if event_type in self._event_plans:
+            playing = timeline.get_timeline_interface().is_playing()
+            for plan, func in zip(self._event_plans[event_type], self._activator.members.event[event_type]):
+                if getattr(func, '__meta_batch__', False) or getattr(func, '__meta_offload__', False):
+                    continue
+                if playing or bool(func.__meta_editmode__):
+                    plan(self._prim)
+
+    def _build_plans(self):
+        members = self._activator.members
+        # a handler observing several attributes shares one plan, grouped changes are collected per plan
+        plans = {func: CallPlan(func, self._instance) for func in set(members.attr.values())}
+        self._attr_plans = {path: plans[func] for path, func in members.attr.items()}
+        self._event_plans = {event_type: [CallPlan(func, self._instance) for func in funcs]
+                             for event_type, funcs in members.event.items()}
+        self._post_plan = CallPlan(members.post, self._instance) if members.post else None
+
+
+class LinkingPass:
+    """ The state of linking a stage incrementally, see ModelLinkManager.link_stage_async().
+        Changed properties of prims not linked yet are buffered per prim path, each at most once,
+        for at most MAX_CHANGED_PRIMS prims, and dropped when the traversal visits the prim without linking it.
+
+    Args:
+        stage (Usd.Stage): the stage to be linked
+        traverse (Callable): returns the prims of the stage to be considered for linking
+    """
+    __slots__ = ('stage', 'prims', 'renew', 'visited', 'linked', 'restarts', 'changes', '_traverse')
+    MAX_CHANGED_PRIMS = 10000
+
+    def __init__(self, stage: Usd.Stage, traverse: Callable[[Usd.Prim], Iterator[Usd.Prim]]) -> None:
+        self.stage = stage
+        self._traverse = traverse
+        self.prims = traverse(stage.GetPseudoRoot())
+        self.renew = True  # the first traversal renews existing links, a restarted one skips them
+        self.visited = 0
+        self.linked = 0
+        self.restarts = 0
+        # prim path -> ordered set of its changed properties, delivered if the prim is linked when visited
+        self.changes: dict[Sdf.Path, dict[Sdf.Path, None]] = {}
+
+    def buffer_change(self, prim_path: Sdf.Path, changed_path: Sdf.Path) -> bool:
+        """ Keeps a changed property of a prim not linked yet, returns False if the buffer is full.
+        """
+        changes = self.changes.get(prim_path)
+        if changes is None:
+            if len(self.changes) >= self.MAX_CHANGED_PRIMS:
+                return False
+            changes = self.changes[prim_path] = {}
+        changes[changed_path] = None
+        return True
+
+    def restart(self):
+        self.prims = self._traverse(self.stage.GetPseudoRoot())
+        self.renew = False
+        self.restarts += 1
 
 
 class Members:
@@ -294,6 +764,7 @@ class Members:
     def __init__(self) -> None:
         self.attr = {}
         self.event = {}
+        self.post = None
 
 
 class ModelLinkManager:
@@ -320,8 +791,11 @@ class ModelLinkManager:
 
     def add_activator(self, activator: ModelLinkActivator):
         self._activators[activator.detectType][activator.reference] = activator
+        self._detector.invalidate()
         self._move_members_to_activator(activator.clazz.__name__, activator)
+        self._check_offloaded(activator)
         self._event_cache = None
+        self.invalidate_call_plans()
         self._fire_modellink_event(sick.modellink.core.MODELLINK_ACTIVATOR_ADDED,
                                    payload={"detector": activator.detectType,
                                             "reference": activator.reference,
@@ -345,7 +819,8 @@ class ModelLinkManager:
                                                 "class_name": activator.clazz.__name__})
 
 
-    def add_usd_attr(self, func, path: str, param_name: str | None, do_injection: bool = True):
+    def add_usd_attr(self, func, path: str, param_name: str | None, do_injection: bool = True,
+                     coalesce: bool = False, grouped: bool = False):
         if param_name is None:
             param_name = path.split('.')[-1]
             param_name = param_name.replace(':', '_')
@@ -356,9 +831,23 @@ class ModelLinkManager:
 
         if do_injection:
             self._prepare_injection(func, param_name)
+        func.__meta_coalesce__ = coalesce
+        func.__meta_grouped__ = grouped
         self._members[name].attr[path] = func
 
-    def register_event(self, func, event_id: str | int, editmode: bool = False):
+    def add_post_handler(self, func, param_name: str = 'value'):
+        name = self._extract_class_name(func)
+        if name not in self._members:
+            self._members[name] = Members()
+        if self._members[name].post is not None:
+            carb.log_warn(f"{func.__qualname__} replaces the @on_post handler {self._members[name].post.__qualname__}")
+        self._prepare_injection(func, param_name)
+        if param_name in inspect.signature(func).parameters:
+            func.__meta_value_param__ = param_name
+        self._members[name].post = func
+
+    def register_event(self, func, event_id: str | int, editmode: bool = False, batch: bool = False,
+                       hz: float | None = None, priority: str = "normal", offload: bool = False):
         if type(event_id) is str:
             event_type = type_for(event_id)
         else:
@@ -371,8 +860,26 @@ class ModelLinkManager:
         if event_type not in self._members[name].event:
             self._members[name].event[event_type] = []
 
-        self._prepare_injection(func)
+        if offload and (batch or hz):
+            carb.log_warn(f"{func.__qualname__}: offload cannot be combined with batch or hz, it is ignored")
+            offload = False
+        if offload and self._uses_stage(func):
+            carb.log_warn(f"{func.__qualname__}: an offloaded method only gets the snapshot, "
+                          f"it must not have Usd.Prim or Usd.Stage parameters; it is not registered")
+            return
+        if not batch:
+            # the elapsed time or the snapshot is passed like the value of an attribute
+            self._prepare_injection(func, 'dt' if hz else 'snapshot' if offload else None)
+        if offload and 'snapshot' in inspect.signature(func).parameters:
+            func.__meta_value_param__ = 'snapshot'
         func.__meta_editmode__ = editmode
+        func.__meta_batch__ = batch
+        func.__meta_hz__ = hz
+        func.__meta_offload__ = offload
+        if priority not in _PRIORITIES:
+            carb.log_warn(f"Unknown priority '{priority}' of {func.__qualname__}, using 'normal'")
+            priority = "normal"
+        func.__meta_priority__ = _PRIORITIES[priority]
         self._members[name].event[event_type].append(func)
 
     def get_registered_events(self) -> set[int]:
@@ -384,6 +891,13 @@ class ModelLinkManager:
         return self._event_cache
 
 
+    def invalidate_call_plans(self):
+        """ Forces all ModelLinks to resolve the injected parameters of their handlers again.
+            Called when the stage is opened or closed and when activators change.
+        """
+        for link in self._links.values():
+            link.invalidate_plans()
+
     def discard_namespace(self, namespace):
         for _map in self._activators.values():
             for key, value in list(_map.items()):
@@ -397,41 +911,315 @@ class ModelLinkManager:
                     self._discard_intern(value, _map, key)
 
     def clear_links(self):
-        for key in list(self._links.keys()):
-            self.remove_link(key)
+        self._linking = None
+        suspended, self._suspended = self._suspended, {}
+        with self.bulk_linking():
+            for key in list(self._links.keys()):
+                self.remove_link(key)
+            for key, link in suspended.items():
+                self._discard_link(key, link)
+
+    def suspend_links(self):
+        """ Keeps the links without dispatching to them, instead of clear_links() when the stage is closed.
+            reconcile_stage() rebinds them to the prims of the reopened stage.
+        """
+        self._linking = None
+        for path in self._links:
+            self._remove_dispatch_entries(path)
+        self._suspended.update(self._links)
+        self._links = {}
+        self._link_paths = []
+        self._watched_attrs = {}
+        self._coalesced_changes = {}
+        self._coalesced_groups = {}
+        self._offloaded = []
+        self._signal_graph.invalidate()
+
+    def reconcile_stage(self, stage: Usd.Stage):
+        """ Links the opened stage, keeping the suspended links (see suspend_links()) of prims
+            that exist again and are detected by the same activator, if their class has an @on_rebind handler.
+            Only links of added, removed or changed prims are created or removed.
+            Without suspended links the stage is linked by link_entire_stage().
+        """
+        if not self._suspended:
+            self.link_entire_stage(stage)
+            return
+        self._linking = None
+        suspended, self._suspended = self._suspended, {}
+        self._detector.clear_prototypes()
+        prims = self._traverse(stage.GetPseudoRoot()) if stage else ()
+        self._reconcile(prims, suspended)
 
     def clear(self):
         self.clear_links()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        self._offloaded = []
+        self._work_queue.clear()
+        self._signal_graph.clear()
+        self._signal_table.clear()
+        self._relationship_cache.clear()
         self._clear_activators()
         self._clear_members()
 
     def create_new_link(self, prim: Usd.Prim):
         activator = self._find_activator(prim)
         if activator and activator.enabled:
-            instance = self._create(activator.clazz, prim)  # also handles injection
-            self._links[prim.GetPrimPath()] = ModelLink(instance, prim, activator)
-            self._fire_modellink_event(sick.modellink.core.MODELLINK_ADDED,
-                                       payload={"prim_path": prim.GetPrimPath(),
-                                                "class_name": activator.clazz.__name__})
+            self._link_prim(prim, activator)
 
     def remove_link(self, resync_path):
         link = self._links.pop(resync_path, None)
         if link:
+            self._remove_dispatch_entries(resync_path)
+            self._watched_attrs.pop(resync_path, None)
+            self._signal_graph.invalidate()
+            index = bisect.bisect_left(self._link_paths, resync_path)
+            del self._link_paths[index]
             link.destroy()
-            self._fire_modellink_event(sick.modellink.core.MODELLINK_REMOVED,
-                                       payload={"prim_path": resync_path,
-                                                "class_name": link._activator.clazz.__name__})
+            if self._bulk is not None:
+                self._bulk["removed"].append(str(resync_path))
+            else:
+                self._fire_modellink_event(sick.modellink.core.MODELLINK_REMOVED,
+                                           payload={"prim_path": resync_path,
+                                                    "class_name": link._activator.clazz.__name__})
+
+    @contextmanager
+    def bulk_linking(self):
+        """ Context manager for creating or removing many links at once.
+            Instead of one MODELLINK_ADDED/MODELLINK_REMOVED event per link, a single MODELLINK_BATCH_ADDED
+            and MODELLINK_BATCH_REMOVED event with all 'prim_paths' is fired when the outermost context exits.
+            e.g.
+
+            with ModelLinkManager().bulk_linking():
+                for prim in prims:
+                    ModelLinkManager().create_new_link(prim)
+        """
+        if self._bulk is not None:  # nested, the outermost context fires the events
+            yield
+            return
+        self._bulk = {"added": [], "removed": []}
+        try:
+            yield
+        finally:
+            bulk, self._bulk = self._bulk, None
+            if bulk["removed"]:
+                self._fire_modellink_event(sick.modellink.core.MODELLINK_BATCH_REMOVED,
+                                           payload={"prim_paths": bulk["removed"]})
+            if bulk["added"]:
+                self._fire_modellink_event(sick.modellink.core.MODELLINK_BATCH_ADDED,
+                                           payload={"prim_paths": bulk["added"]})
 
     def property_changed(self, changed_path):
-        prim_path = changed_path.GetPrimPath()
-        link = self._links.get(prim_path, None)
-        if link:
-            link.property_changed(changed_path)
+        self.properties_changed((changed_path,))
+
+    def properties_changed(self, changed_paths, resynced_paths=()):
+        """ Delivers the changed properties of one change notice to the @usd_attr handlers.
+            Grouped handlers are called once at the end, with all of their attributes that changed.
+            Resynced properties (created or removed) are only reported to the property observers.
+        """
+        if self._property_observers:
+            for resynced_path in resynced_paths:
+                self._notify_property_observers(resynced_path)
+        with self.write_transaction():
+            self._properties_changed(changed_paths)
+
+    def deliver_values(self, prim_path: Sdf.Path, values: dict[str, object]):
+        """ Calls the @usd_attr handlers of the link at prim_path with the given attribute values,
+            without reading them from the stage. Used by the SignalGraph, which delivers the latest values
+            once per frame, so coalesced handlers are called directly as well.
+        """
+        watched = self._watched_attrs.get(prim_path)
+        if not watched:
+            return
+        prim = self._links[prim_path]._prim
+        groups = {}
+        for name, value in values.items():
+            plan = watched.get(name)
+            if plan is None:
+                continue
+            if plan.grouped:
+                groups.setdefault(plan, {})[name] = value
+            else:
+                plan(prim, value)
+        for plan, changes in groups.items():
+            plan(prim, changes)
+
+    def deliver_posted(self, prim_path: Sdf.Path, item) -> bool:
+        """ Calls item with the instance of the link at prim_path if it is callable,
+            otherwise passes it to the @on_post handler of the link. Used by the WorkQueue.
+            Returns False if there is no such link or handler.
+        """
+        link = self._links.get(prim_path)
+        if link is None:
+            return False
+        if callable(item):
+            item(link._instance)
+            return True
+        if link._post_plan is None:
+            return False
+        link._post_plan(link._prim, item)
+        return True
+
+    def add_property_observer(self, name: str, callback: Callable[[Sdf.Path], None]):
+        """ Calls callback with the path of every changed or resynced property with the given name, on any prim.
+            Values written by set_value(..., notify=False) are not reported.
+            Used to keep data depending on properties like relationship targets up to date.
+        """
+        self._property_observers.setdefault(name, []).append(callback)
+
+    def remove_property_observer(self, name: str, callback: Callable[[Sdf.Path], None]):
+        callbacks = self._property_observers.get(name, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+        if not callbacks:
+            self._property_observers.pop(name, None)
+
+    def get_signal_graph(self) -> SignalGraph:
+        return self._signal_graph
+
+    def get_signal_table(self) -> SignalTable:
+        return self._signal_table
+
+    def get_relationship_cache(self) -> RelationshipCache:
+        return self._relationship_cache
+
+    def get_work_queue(self) -> WorkQueue:
+        return self._work_queue
+
+    def get_detection_cache(self) -> DetectionCache:
+        return self._detection_cache
+
+    def post(self, link_path: Sdf.Path | str, item, policy: str = "latest", source: str | None = None):
+        """ Thread-safe, queues a value for the @on_post handler of the link at link_path, or a callable
+            called with its instance, see WorkQueue.post().
+        """
+        self._work_queue.post(link_path, item, policy, source)
+
+    def begin_frame(self):
+        """ Called by the ModelEventRegistry once per frame, before the 'pre_update' event is dispatched.
+            Delivers the attribute changes collected for @usd_attr(..., coalesce=True) handlers
+            and the signals of the SignalGraph, and mirrors the SignalTable to the stage.
+            Links the next prims of a stage linked incrementally (link_stage_async()), commits the results
+            of handlers computed on worker threads (@on_update(offload=True)) and delivers the items posted
+            to the WorkQueue before.
+            The time spent here counts towards the frame budget of the scheduler.
+        """
+        start = time.perf_counter()
+        self._frame_dt, self._frame_start = start - self._frame_start, start
+        self._end_frame()
+        playing = timeline.get_timeline_interface().is_playing()
+        if playing and not self._playing:
+            # rate-limited handlers only called while playing start again with the first played frame
+            for group in self._group_calls.values():
+                if not group._func.__meta_editmode__:
+                    group.reset()
+        self._playing = playing
+        if self._linking is not None:
+            self._link_slice(start)
+        with self.write_transaction():
+            self._commit_offloaded()
+            self._work_queue.drain()
+            self._deliver_coalesced()
+        self._signal_graph.evaluate()
+        self._signal_table.update()
+        self._frame_spent = time.perf_counter() - start
+
+    def get_scheduler_stats(self) -> dict:
+        """ Returns the counters of the scheduler since the extension started:
+            'frames', 'deferred' (low priority handler calls moved to a later frame),
+            'overruns' (frames exceeding the budget) and 'max_overrun_ms'.
+        """
+        return dict(self._scheduler_stats)
+
+    def get_detection_stats(self) -> dict[str, int]:
+        """ Returns how many prims were detected by each kind of rule ('schema', 'class', 'isa', 'api', 'custom')
+            and how many by none ('none').
+        """
+        return self._detector.get_stats()
+
+    def get_predicate_calls(self) -> dict[str, int]:
+        """ Returns how often the function of each custom activator was called, by reference of the activator.
+        """
+        return self._detector.get_predicate_calls()
+
+    def get_notice_stats(self) -> dict[str, int]:
+        """ Returns how many changed properties were delivered to @usd_attr handlers ('processed')
+            and how many were dropped because no handler observes them ('dropped').
+        """
+        return dict(self._notice_stats)
 
     def dispatch_events(self, event_type: int):
-        for link in self._links.values():
-            if link:
-                link.dispatch_event(event_type)
+        """ Calls the handlers of event_type, high priority first. Low priority handlers are called
+            round-robin while the frame budget (setting /exts/sick.modellink.core/frameBudgetMs) lasts,
+            but every one of them at least once within maxDeferFrames frames. Without a budget (the default 0)
+            all of them are called in every frame.
+        """
+        entries, low_entries = self._get_dispatch_entries(event_type)
+        if not entries and not low_entries:
+            return
+        start = time.perf_counter()
+        playing = timeline.get_timeline_interface().is_playing()
+        with self.write_transaction():
+            for plan, prim, editmode, _ in entries:
+                if playing or editmode:
+                    plan(prim)
+                elif isinstance(plan, _TIMED_CALLS):
+                    plan.reset()  # the time while not playing does not count
+            if low_entries:
+                self._dispatch_low(event_type, low_entries, playing, start)
+        self._frame_spent += time.perf_counter() - start
+
+    @contextmanager
+    def write_transaction(self):
+        """ Context manager for batching attribute writes.
+            Values set by set_value() inside this context are written when the outermost context exits,
+            all within one Sdf.ChangeBlock, so that one change notice is sent instead of one per write.
+            Events and attribute changes are always dispatched inside a write transaction.
+        """
+        self._write_depth += 1
+        try:
+            yield
+        finally:
+            self._write_depth -= 1
+            if self._write_depth == 0 and self._pending_writes:
+                self.flush_writes()
+
+    def set_value(self, attr: Usd.Attribute, value, timecode: Usd.TimeCode = Usd.TimeCode.Default(), notify: bool = True):
+        """ Sets the value of an existing attribute. Inside a write transaction the value is only collected
+            and the last value set is written when the transaction ends, reading the attribute before
+            that still returns the previous value.
+            If notify is False, the change is not delivered to the @usd_attr handlers of the prim,
+            e.g. because they already received the value.
+        """
+        if self._write_depth:
+            self._pending_writes[attr] = (value, timecode, notify)
+        else:
+            self._pending_writes = {attr: (value, timecode, notify)}
+            self.flush_writes()
+
+    def flush_writes(self):
+        """ Writes all values collected by set_value() within one Sdf.ChangeBlock.
+            Attributes that became invalid in the meantime, e.g. because a handler removed their prim,
+            are skipped, and a failed write is logged, so neither discards the other writes.
+        """
+        writes, self._pending_writes = self._pending_writes, {}
+        silent_paths = self._silent_paths
+        self._silent_paths = {attr.GetPath() for attr, (_, _, notify) in writes.items() if not notify}
+        try:
+            with Sdf.ChangeBlock():
+                for attr, (value, timecode, _) in writes.items():
+                    if not attr.IsValid():
+                        continue
+                    if self._link_proxies and attr.GetPrim().IsInstanceProxy():
+                        continue  # instance proxies cannot be authored, their prototype is shared
+                    try:
+                        attr.Set(value, timecode)
+                    except Tf.ErrorException as e:
+                        carb.log_warn(f"Cannot write {attr.GetPath()}: {e}")
+        finally:
+            # the change notice was sent when the change block ended
+            self._silent_paths = silent_paths
 
     def get_activators(self) -> Iterator[ModelLinkActivator]:
         for activator in self._activators.values():
@@ -448,12 +1236,103 @@ class ModelLinkManager:
             stage = usd.get_context().get_stage()
 
         if stage:
-            for prim in stage.Traverse():
-                if renew_all or prim.GetPath() not in self._links:
-                    self.create_new_link(prim)
+            self._detector.clear_prototypes()
+            with self.bulk_linking():
+                for prim in self._traverse(stage.GetPseudoRoot()):
+                    if renew_all or prim.GetPath() not in self._links:
+                        self.create_new_link(prim)
+
+    def set_scope(self, include: list[str] | None = None, exclude: list[str] | None = None):
+        """ Restricts linking to the subtrees at the include paths (all prims if None), without the subtrees
+            at the exclude paths. The traversal does not enter subtrees outside of this scope, nor, with the
+            setting skipMarker, the subtrees of prims with customData 'modellink:skip' = True (the customData of
+            every traversed prim is only read then). Activators can be restricted further,
+            see @linked(include=..., exclude=...). Applies to the next linking, e.g. update_links().
+            With the setting linkInstanceProxies, the traversal also enters instances and links their
+            instance proxies, which are detected once per prim in the prototype.
+        """
+        self._scope = Scope(include, exclude)
+
+    def get_scope(self) -> Scope:
+        """ Returns the scope set by set_scope(). """
+        return self._scope
 
     def link_entire_stage(self, stage):
+        """ Links all prims of the stage.
+            With the setting detectionCache, the links found are stored on disk (see DetectionCache) and
+            reopening the unchanged stage links the cached paths without traversing the stage and detecting prims.
+        """
+        self._linking = None
+        cache = self._detection_cache
+        cached = cache.load(stage) if stage else None
+        if cached is not None:
+            if cache.is_validating():
+                detected = self._detect_stage(stage)
+                if not cache.validate(cached, detected):
+                    cache.store(stage, detected)
+                    cached = detected
+            self._link_cached(stage, cached)
+            return
         self.update_links(renew_all=True, stage=stage)
+        if stage and cache.is_enabled():
+            cache.store(stage, {str(path): DetectionCache.activator_id(link._activator)
+                                for path, link in self._links.items()})
+
+    def link_stage_async(self, stage: Usd.Stage):
+        """ Links the stage incrementally instead of all at once like link_entire_stage().
+            begin_frame() links the prims found within a time slice per frame (setting asyncLinkingSliceMs)
+            and fires MODELLINK_LINKING_PROGRESS with the number of 'visited' prims, the 'linked' prims and 'done'.
+            Changes of attributes of prims not linked yet are delivered to their handlers once they are linked,
+            changes beyond the buffer of LinkingPass.MAX_CHANGED_PRIMS prims count as dropped (get_notice_stats()).
+            The traversal restarts after a subtree was relinked, e.g. because it was resynced.
+        """
+        if not stage:
+            stage = usd.get_context().get_stage()
+        self._detector.clear_prototypes()
+        self._linking = LinkingPass(stage, self._traverse) if stage else None
+
+    def is_linking(self) -> bool:
+        """ Returns True while a stage is linked incrementally. """
+        return self._linking is not None
+
+    def get_link_paths_under(self, root: Sdf.Path) -> list[Sdf.Path]:
+        """ Returns the paths of all links at or below root, in path order.
+            The cost depends on the number of links found, not on the number of all links.
+        """
+        paths = self._link_paths
+        start = bisect.bisect_left(paths, root)
+        end = start
+        while end < len(paths) and paths[end].HasPrefix(root):
+            end += 1
+        return paths[start:end]
+
+    def relink_subtree(self, root: Sdf.Path, stage: Usd.Stage | None = None):
+        """ Renews all links at or below root in one pass, e.g. after root was resynced.
+            Links of prims that no longer exist or are inactive are removed,
+            all other prims of the subtree are linked again.
+            With the setting reconcileLinks, links that can be rebound are kept, see reconcile_stage().
+        """
+        if not stage:
+            stage = usd.get_context().get_stage()
+
+        prim = stage.GetPrimAtPath(root) if stage else None
+        if prim and prim.IsInPrototype():
+            # prototypes are not linked, but their instances are if instance proxies are linked
+            self._relink_instances(prim)
+            return
+        if carb.settings.get_settings().get(RECONCILE_SETTING):
+            links = {path: self._links[path] for path in self.get_link_paths_under(root)}
+            self._reconcile(self._traverse(prim) if prim and prim.IsActive() else (), links)
+        else:
+            with self.bulk_linking():
+                for path in self.get_link_paths_under(root):
+                    self.remove_link(path)
+                if prim and prim.IsActive():
+                    for prim in self._traverse(prim):
+                        self.create_new_link(prim)
+        if self._linking is not None:
+            # the traversal may be invalid now
+            self._linking.restart()
 
     #############################
     # Private methods
@@ -465,12 +1344,51 @@ class ModelLinkManager:
         self._activators = {
             'class': {},
             'schema': {},
+            'isa': {},
+            'api': {},
             'custom': {}
         }
+        self._detector = Detector(self)
+        self._scope = Scope()
+        self._link_proxies = False
         self._members: dict[str, Members] = {}
         self._links: dict[str, ModelLink] = {}
         self._modellink_event_stream = events.acquire_events_interface().create_event_stream()
         self._event_cache = None
+        # event type -> prim path -> handlers of that link, flattened lazily for dispatching
+        self._dispatch_table: dict[int, dict[Sdf.Path | BatchCall | RateGroup, list[tuple]]] = {}
+        self._group_calls: dict[Callable, BatchCall | RateGroup] = {}
+        self._link_groups: dict[Sdf.Path, list[BatchCall | RateGroup]] = {}
+        self._dispatch_lists: dict[int, tuple[tuple, tuple]] = {}
+        self._low_cursors: dict[int, int] = {}  # event type -> next low priority entry
+        self._frame_budget = 0.0  # seconds, 0 = unlimited
+        self._max_defer_frames = 10
+        self._frame_spent = 0.0
+        self._scheduler_stats = _new_scheduler_stats()
+        self._scheduler_window = _new_scheduler_stats()
+        self._window_start = time.perf_counter()
+        self._frame_start = self._window_start
+        self._frame_dt = 0.0  # duration of the last frame, 0 before the first one
+        self._playing = False
+        self._executor: ThreadPoolExecutor | None = None
+        self._offloaded: list[OffloadCall] = []  # submitted, committed by begin_frame()
+        self._linking: LinkingPass | None = None
+        self._suspended: dict[Sdf.Path, ModelLink] = {}  # links of the closed stage, see suspend_links()
+        self._bulk: dict[str, list[str]] | None = None
+        self._link_paths: list[Sdf.Path] = []  # sorted, the links of a subtree are adjacent
+        self._watched_attrs: dict[Sdf.Path, dict[str, CallPlan]] = {}  # prim path -> observed attribute names
+        self._notice_stats = {"processed": 0, "dropped": 0}
+        self._coalesced_changes: dict[Sdf.Path, None] = {}
+        self._coalesced_groups: dict[tuple[Sdf.Path, CallPlan], dict[str, None]] = {}
+        self._write_depth = 0
+        self._pending_writes: dict[Usd.Attribute, tuple] = {}
+        self._silent_paths: set[Sdf.Path] = set()
+        self._property_observers: dict[str, list[Callable]] = {}
+        self._signal_table = SignalTable(self)
+        self._signal_graph = SignalGraph(self)
+        self._relationship_cache = RelationshipCache()
+        self._work_queue = WorkQueue(self)
+        self._detection_cache = DetectionCache(self)
 
     def _fire_modellink_event(self, event_type: int, payload):
         self._modellink_event_stream.push(event_type, payload=payload)
@@ -502,6 +1420,24 @@ class ModelLinkManager:
             noninjectable(*names)(func)
             func.__meta_prim_params__ = prim_param_names
 
+    def _uses_stage(self, func) -> bool:
+        try:
+            hints = get_type_hints(func)
+        except Exception:
+            hints = getattr(func, '__annotations__', {})
+        return any(hint in (Usd.Prim, Usd.Stage) for name, hint in hints.items() if name != 'return')
+
+    def _check_offloaded(self, activator: ModelLinkActivator):
+        # offloaded methods are computed with the snapshot of the instance, they are removed if there is none
+        if callable(getattr(activator.clazz, 'snapshot', None)):
+            return
+        for funcs in activator.members.event.values():
+            offloaded = [func for func in funcs if getattr(func, '__meta_offload__', False)]
+            for func in offloaded:
+                carb.log_warn(f"{func.__qualname__}: offloaded, but {activator.clazz.__name__} has no snapshot() "
+                              f"method; it is not registered")
+                funcs.remove(func)
+
     def _move_members_to_activator(self, class_name: str, activator: ModelLinkActivator | None = None):
         if class_name in self._members:
             members = self._members[class_name]
@@ -510,25 +1446,347 @@ class ModelLinkManager:
                 activator.set_members(members)
                 del self._members[class_name]
 
+    def _properties_changed(self, changed_paths):
+        groups = {}
+        for changed_path in changed_paths:
+            if changed_path in self._silent_paths:
+                continue
+            if self._property_observers and changed_path.name in self._property_observers:
+                self._notify_property_observers(changed_path)
+            # drop changes of attributes nobody observes before touching the stage
+            prim_path = changed_path.GetPrimPath()
+            watched = self._watched_attrs.get(prim_path)
+            plan = watched.get(changed_path.name) if watched else None
+            if plan is None:
+                if self._linking is not None and prim_path not in self._links and \
+                        self._linking.buffer_change(prim_path, changed_path):
+                    continue
+                self._notice_stats["dropped"] += 1
+                continue
+            self._notice_stats["processed"] += 1
+            if plan.coalesce:
+                # ordered sets, the values are read when delivered
+                if plan.grouped:
+                    self._coalesced_groups.setdefault((prim_path, plan), {})[changed_path.name] = None
+                else:
+                    self._coalesced_changes[changed_path] = None
+            elif plan.grouped:
+                groups.setdefault((prim_path, plan), {})[changed_path.name] = None
+            else:
+                self._links[prim_path].property_changed(changed_path)
+        if groups:
+            self._deliver_groups(groups)
+
+    def _notify_property_observers(self, path: Sdf.Path):
+        for callback in self._property_observers.get(path.name, ()):
+            callback(path)
+
+    def _deliver_coalesced(self):
+        if self._coalesced_changes:
+            changes, self._coalesced_changes = self._coalesced_changes, {}
+            for changed_path in changes:
+                link = self._links.get(changed_path.GetPrimPath())
+                if link:
+                    link.property_changed(changed_path)
+        if self._coalesced_groups:
+            groups, self._coalesced_groups = self._coalesced_groups, {}
+            self._deliver_groups(groups)
+
+    def _deliver_groups(self, groups: dict[tuple[Sdf.Path, CallPlan], dict[str, None]]):
+        for (prim_path, plan), names in groups.items():
+            link = self._links.get(prim_path)
+            # skip plans of links that were removed or renewed in the meantime
+            if link and link._attr_plans.get(next(iter(names))) is plan:
+                prim = link._prim
+                plan(prim, {name: prim.GetAttribute(name).Get() for name in names})
+
+    def _add_link(self, path: Sdf.Path, link: ModelLink):
+        if path in self._links:
+            self._remove_dispatch_entries(path)
+        else:
+            bisect.insort(self._link_paths, path)
+        self._links[path] = link
+        self._signal_graph.invalidate()
+        if link._attr_plans:
+            self._watched_attrs[path] = link._attr_plans
+        else:
+            self._watched_attrs.pop(path, None)
+        funcs = link._activator.members.event
+        for event_type, plans in link._event_plans.items():
+            entries = []
+            for plan, func in zip(plans, funcs[event_type]):
+                if func.__meta_batch__ or func.__meta_hz__:
+                    self._add_to_group(path, link, event_type, func, plan)
+                elif func.__meta_offload__:
+                    entries.append((OffloadCall(path, link, plan), link._prim, bool(func.__meta_editmode__),
+                                    func.__meta_priority__))
+                else:
+                    entries.append((plan, link._prim, bool(func.__meta_editmode__), func.__meta_priority__))
+            if entries:
+                self._dispatch_table.setdefault(event_type, {})[path] = entries
+                self._dispatch_lists.pop(event_type, None)
+
+    def _add_to_group(self, path: Sdf.Path, link: ModelLink, event_type: int, func, plan: CallPlan):
+        group = self._group_calls.get(func)
+        if group is None:
+            # one dispatch entry for all links of the class, keyed by the group instead of a path
+            if func.__meta_batch__:
+                group = BatchCall(func, link._activator.clazz, event_type)
+            else:
+                group = RateGroup(func, event_type)
+            self._group_calls[func] = group
+            self._dispatch_table.setdefault(event_type, {})[group] = [
+                (group, None, bool(func.__meta_editmode__), func.__meta_priority__)]
+            self._dispatch_lists.pop(event_type, None)
+        group.add(path, link, plan)
+        self._link_groups.setdefault(path, []).append(group)
+
+    def _remove_dispatch_entries(self, path: Sdf.Path):
+        for event_type, table in self._dispatch_table.items():
+            if table.pop(path, None) is not None:
+                self._dispatch_lists.pop(event_type, None)
+        for group in self._link_groups.pop(path, ()):
+            if group.remove(path):
+                del self._group_calls[group._func]
+                self._dispatch_table[group.event_type].pop(group, None)
+                self._dispatch_lists.pop(group.event_type, None)
+
+    def _get_dispatch_entries(self, event_type: int) -> tuple[tuple, tuple]:
+        # a flattened snapshot, so handlers may add or remove links while being dispatched,
+        # split into the entries always called (sorted by priority) and the low priority ones
+        entries = self._dispatch_lists.get(event_type)
+        if entries is None:
+            table = self._dispatch_table.get(event_type, {})
+            flat = sorted((entry for link_entries in table.values() for entry in link_entries), key=lambda e: e[3])
+            entries = (tuple(e for e in flat if e[3] < _PRIORITIES["low"]),
+                       tuple(e for e in flat if e[3] == _PRIORITIES["low"]))
+            self._dispatch_lists[event_type] = entries
+        return entries
+
+    def _dispatch_low(self, event_type: int, entries: tuple, playing: bool, start: float):
+        count = len(entries)
+        cursor = self._low_cursors.get(event_type, 0) % count
+        # starvation protection, every entry is called at least once within max_defer_frames
+        minimum = -(-count // self._max_defer_frames)
+        deadline = start + self._frame_budget - self._frame_spent
+        called = 0
+        while called < count:
+            if called >= minimum and self._frame_budget and time.perf_counter() >= deadline:
+                break
+            plan, prim, editmode, _ = entries[(cursor + called) % count]
+            if playing or editmode:
+                plan(prim)
+            elif isinstance(plan, _TIMED_CALLS):
+                plan.reset()
+            called += 1
+        self._low_cursors[event_type] = (cursor + called) % count
+        if called < count:
+            self._scheduler_stats["deferred"] += count - called
+            self._scheduler_window["deferred"] += count - called
+
+    def _end_frame(self):
+        # books the time of the previous frame and publishes the stats about once per second
+        for stats in (self._scheduler_stats, self._scheduler_window):
+            stats["frames"] += 1
+            if self._frame_budget and self._frame_spent > self._frame_budget:
+                stats["overruns"] += 1
+                overrun_ms = (self._frame_spent - self._frame_budget) * 1000.0
+                stats["max_overrun_ms"] = max(stats["max_overrun_ms"], overrun_ms)
+        self._frame_spent = 0.0
+
+        settings = carb.settings.get_settings()
+        self._frame_budget = max(0.0, float(settings.get(FRAME_BUDGET_SETTING) or 0)) / 1000.0
+        self._max_defer_frames = max(1, int(settings.get(MAX_DEFER_FRAMES_SETTING) or 10))
+
+        now = time.perf_counter()
+        if now - self._window_start >= 1.0:
+            window = self._scheduler_window
+            if window["deferred"] or window["overruns"]:
+                self._fire_modellink_event(sick.modellink.core.MODELLINK_SCHEDULER_STATS,
+                                           payload=dict(window, budget_ms=self._frame_budget * 1000.0))
+            self._scheduler_window = _new_scheduler_stats()
+            self._window_start = now
+
+    def _traverse(self, root: Usd.Prim) -> Iterator[Usd.Prim]:
+        # the prims at or below root which may be linked, pruning subtrees outside of the scope
+        scopes = (self._scope, self._detector.get_scope())
+        settings = carb.settings.get_settings()
+        self._link_proxies = bool(settings.get(INSTANCE_PROXIES_SETTING))
+        skip_marker = bool(settings.get(SKIP_MARKER_SETTING))
+        parent = root.GetParent()
+        while skip_marker and parent and not parent.IsPseudoRoot():
+            if parent.GetCustomDataByKey(SKIP_KEY):
+                return
+            parent = parent.GetParent()
+        if self._link_proxies:
+            prims = iter(Usd.PrimRange(root, Usd.TraverseInstanceProxies(Usd.PrimDefaultPredicate)))
+        else:
+            prims = iter(Usd.PrimRange(root))
+        for prim in prims:
+            path = prim.GetPath()
+            if path == Sdf.Path.absoluteRootPath:
+                continue
+            state = max(scope.classify(path) for scope in scopes)
+            if state == OUTSIDE or (skip_marker and prim.GetCustomDataByKey(SKIP_KEY)):
+                prims.PruneChildren()
+            elif state == INSIDE:
+                yield prim
+
+    def _relink_instances(self, prim: Usd.Prim):
+        if not bool(carb.settings.get_settings().get(INSTANCE_PROXIES_SETTING)):
+            return
+        self._detector.clear_prototypes()
+        prototype = prim
+        while not prototype.IsPrototype():
+            prototype = prototype.GetParent()
+        for instance in prototype.GetInstances():
+            self.relink_subtree(prim.GetPath().ReplacePrefix(prototype.GetPath(), instance.GetPath()),
+                                instance.GetStage())
+
+    def _link_slice(self, start: float):
+        linking = self._linking
+        slice_ms = carb.settings.get_settings().get(LINKING_SLICE_SETTING)
+        deadline = start + (4.0 if slice_ms is None else float(slice_ms)) / 1000.0
+        links = self._links
+        replay = []
+        done = True
+        prims = linking.prims
+        with self.bulk_linking():
+            for prim in prims:
+                linking.visited += 1
+                path = prim.GetPath()
+                # the buffered changes of a visited prim are delivered if it is linked now, dropped otherwise
+                changes = linking.changes.pop(path, None) if linking.changes else None
+                if linking.renew or path not in links:
+                    self.create_new_link(prim)
+                    if path in links:
+                        linking.linked += 1
+                        if changes:
+                            replay.extend(changes)
+                if linking.prims is not prims:  # restarted by a resync caused by the new link
+                    done = False
+                    break
+                if linking.visited % 64 == 0 and time.perf_counter() >= deadline:
+                    done = False
+                    break
+        if replay:
+            with self.write_transaction():
+                self._properties_changed(replay)
+        if done:
+            self._linking = None
+        self._fire_modellink_event(sick.modellink.core.MODELLINK_LINKING_PROGRESS,
+                                   payload={"visited": linking.visited, "linked": linking.linked, "done": done})
+
+    def _submit_offload(self, call: OffloadCall, snapshot) -> Future:
+        if self._executor is None:
+            workers = int(carb.settings.get_settings().get(OFFLOAD_WORKERS_SETTING) or 0)
+            self._executor = ThreadPoolExecutor(max_workers=workers if workers > 0 else os.cpu_count() or 1,
+                                                thread_name_prefix="modellink-offload")
+        self._offloaded.append(call)
+        return self._executor.submit(call.compute, snapshot)
+
+    def _commit_offloaded(self):
+        if not self._offloaded:
+            return
+        running = []
+        for call in self._offloaded:
+            future = call.future
+            if not future.done():
+                running.append(call)
+                continue
+            call.future = None
+            if self._links.get(call.path) is not call.link:
+                continue  # unlinked while computing
+            if future.cancelled():
+                continue
+            error = future.exception()
+            if error is not None:
+                carb.log_warn(f"Offloaded handler of {call.path} failed: {error!r}")
+                continue
+            self._commit_result(call, future.result())
+        self._offloaded = running
+
+    def _commit_result(self, call: OffloadCall, result):
+        if result is None:
+            return
+        if callable(result):
+            result()
+            return
+        prim = call.link._prim
+        stage = prim.GetStage()
+        for key, value in result.items():
+            if isinstance(key, Sdf.Path) or key.startswith('/'):
+                attr = stage.GetAttributeAtPath(Sdf.Path(key))
+            else:
+                attr = prim.GetAttribute(key)
+            if not attr:
+                carb.log_warn(f"Offloaded handler of {call.path} returned a value for the unknown attribute {key}")
+                continue
+            self.set_value(attr, value)
+
     def _find_activator(self, prim: Usd.Prim):
-        # first look for schema
-        if bool(self._activators['schema']):
-            schema = prim.GetTypeName()
-            if schema in self._activators['schema']:
-                return self._activators['schema'][schema]
-
-        # second look for classlinks
-        if bool(self._activators['class']):
-            custom_data = prim.GetCustomDataByKey("linkedClass") or prim.GetAssetInfoByKey("linkedClass")
-            if custom_data in self._activators['class']:
-                return self._activators['class'][custom_data]
-
-        # then look for custom
-        if bool(self._activators['custom']):
-            for activator in self._activators['custom'].values():
-                if activator.detectFunc(prim):
-                    return activator
-        return None
+        return self._detector.detect(prim)
+
+    def _link_prim(self, prim: Usd.Prim, activator: ModelLinkActivator):
+        instance = self._create(activator.clazz, prim)  # also handles injection
+        self._add_link(prim.GetPrimPath(), ModelLink(instance, prim, activator))
+        if self._bulk is not None:
+            self._bulk["added"].append(str(prim.GetPrimPath()))
+        else:
+            self._fire_modellink_event(sick.modellink.core.MODELLINK_ADDED,
+                                       payload={"prim_path": prim.GetPrimPath(),
+                                                "class_name": activator.clazz.__name__})
+
+    def _reconcile(self, prims: Iterable[Usd.Prim], links: dict[Sdf.Path, ModelLink]):
+        # links are the current or suspended links of the prims that may be found, the others are removed
+        with self.bulk_linking():
+            for prim in prims:
+                activator = self._find_activator(prim)
+                if not activator or not activator.enabled:
+                    continue
+                path = prim.GetPath()
+                link = links.pop(path, None)
+                if link is not None and link._activator is activator and \
+                        _REBIND_EVENT in activator.members.event:
+                    link.rebind(prim)
+                    self._add_link(path, link)
+                    continue
+                if link is not None:
+                    self._discard_link(path, link)
+                self._link_prim(prim, activator)
+            for path, link in links.items():
+                self._discard_link(path, link)
+
+    def _discard_link(self, path: Sdf.Path, link: ModelLink):
+        # removes a current link, or destroys a suspended one
+        if self._links.get(path) is link:
+            self.remove_link(path)
+            return
+        link.destroy()
+        if self._bulk is not None:
+            self._bulk["removed"].append(str(path))
+        else:
+            self._fire_modellink_event(sick.modellink.core.MODELLINK_REMOVED,
+                                       payload={"prim_path": path, "class_name": link._activator.clazz.__name__})
+
+    def _detect_stage(self, stage: Usd.Stage) -> dict[str, str]:
+        # the links a full linking of stage would create, prim path -> activator id
+        detected = {}
+        for prim in self._traverse(stage.GetPseudoRoot()):
+            activator = self._find_activator(prim)
+            if activator and activator.enabled:
+                detected[str(prim.GetPath())] = DetectionCache.activator_id(activator)
+        return detected
+
+    def _link_cached(self, stage: Usd.Stage, links: dict[str, str]):
+        activators = {DetectionCache.activator_id(a): a for a in self.get_activators()}
+        self._link_proxies = bool(carb.settings.get_settings().get(INSTANCE_PROXIES_SETTING))
+        with self.bulk_linking():
+            for path, activator_id in links.items():
+                prim = stage.GetPrimAtPath(path)
+                activator = activators.get(activator_id)
+                if prim and activator is not None and activator.enabled:
+                    self._link_prim(prim, activator)
 
     def _find_activator_by_class_name(self, name) -> ModelLinkActivator | None:
         for _map in self._activators.values():
@@ -538,16 +1796,20 @@ class ModelLinkManager:
         return None
 
     def _remove_links_for_activator(self, activator: ModelLinkActivator):
-        for key, link in list(self._links.items()):
-            if link._activator is activator:
-                self.remove_link(key)
+        with self.bulk_linking():
+            for key, link in list(self._links.items()):
+                if link._activator is activator:
+                    self.remove_link(key)
 
     def _clear_activators(self):
         self._activators = {
             'class': {},
             'schema': {},
+            'isa': {},
+            'api': {},
             'custom': {}
         }
+        self._detector.invalidate()
         # TODO: event -> cleared all activators
 
     def _clear_members(self):
@@ -556,7 +1818,9 @@ class ModelLinkManager:
     def _discard_intern(self, value, _map, key):
         self._remove_links_for_activator(value)
         del _map[key]
+        self._detector.invalidate()
         self._event_cache = None
+        self.invalidate_call_plans()
 
         self._fire_modellink_event(sick.modellink.core.MODELLINK_ACTIVATOR_REMOVED,
                                    payload={"detector": value.detectType,
@@ -0,0 +1,170 @@
+import bisect
+from pxr import Usd, Sdf
+
+
+class _Entry:
+    # resolved targets of one relationship, with the prims and attributes looked up so far
+    __slots__ = ('targets', 'prims', 'attributes', 'relationships', 'dependencies', 'mapping')
+
+    def __init__(self, targets, relationships) -> None:
+        self.targets: tuple[Sdf.Path, ...] = targets
+        self.prims: tuple[Usd.Prim, ...] | None = None
+        self.attributes: dict[str | None, tuple[Usd.Attribute, ...]] = {}
+        self.relationships: set[Sdf.Path] = relationships  # the relationship and all relationships forwarded to
+        self.dependencies: set[Sdf.Path] = set(relationships) | set(targets)
+        self.mapping: tuple[Sdf.Path, Sdf.Path] | None = None  # (prototype, instance) of an instance proxy
+
+
+class RelationshipCache:
+    """ Caches the forwarded targets of relationships and the prims and attributes they resolve to.
+        An entry is invalidated when the targets of the relationship (or of a relationship it forwards to) change,
+        and when the source, a target prim or a looked up attribute is resynced, e.g. created or removed.
+        The ModelEventRegistry reports all changes of the stage by calling changed().
+        The targets of a relationship of an instance proxy are resolved once for the prim in the prototype,
+        the targets inside the prototype are mapped to the instance.
+
+        It can be accessed by: sick.modellink.core.get_relationship_cache()
+    """
+
+    def __init__(self) -> None:
+        self._entries: dict[tuple[Sdf.Path, str], _Entry] = {}
+        self._dependents: dict[Sdf.Path, set[tuple[Sdf.Path, str]]] = {}
+        self._dependency_paths: list[Sdf.Path] = []  # sorted keys of _dependents, for resynced subtrees
+
+    #############################
+    # Public methods
+    #############################
+    def get_targets(self, prim: Usd.Prim, relationship: str) -> tuple[Sdf.Path, ...]:
+        """ Returns the forwarded targets of the relationship of prim, like Usd.Relationship.GetForwardedTargets().
+        """
+        return self._get_entry(prim, relationship).targets
+
+    def get_prims(self, prim: Usd.Prim, relationship: str) -> tuple[Usd.Prim, ...]:
+        """ Returns the valid prims targeted by the relationship of prim.
+        """
+        entry = self._get_entry(prim, relationship)
+        if entry.prims is None:
+            stage = prim.GetStage()
+            prims = (stage.GetPrimAtPath(target) for target in entry.targets if target.IsPrimPath())
+            entry.prims = tuple(p for p in prims if p)
+        return entry.prims
+
+    def get_attributes(self, prim: Usd.Prim, relationship: str, attr_name: str | None = None) -> tuple[Usd.Attribute, ...]:
+        """ Returns the existing attributes targeted by the relationship of prim.
+            If attr_name is given, the attribute with this name of each target prim is returned,
+            otherwise the targets are expected to be attributes.
+        """
+        entry = self._get_entry(prim, relationship)
+        attributes = entry.attributes.get(attr_name)
+        if attributes is None:
+            stage = prim.GetStage()
+            if attr_name:
+                paths = [target.AppendProperty(attr_name) for target in entry.targets if target.IsPrimPath()]
+                dependencies = paths
+                if entry.mapping:
+                    # changes inside instances are reported for the prototype
+                    prototype, instance = entry.mapping
+                    dependencies = paths + [path.ReplacePrefix(instance, prototype) for path in paths]
+                self._add_dependencies((prim.GetPath(), relationship), entry, dependencies)
+            else:
+                paths = [target for target in entry.targets if target.IsPropertyPath()]
+            attributes = tuple(a for a in (stage.GetAttributeAtPath(path) for path in paths) if a)
+            entry.attributes[attr_name] = attributes
+        return attributes
+
+    def changed(self, resynced_paths, changed_info_paths):
+        """ Invalidates the entries affected by a change notice of the stage.
+        """
+        for path in resynced_paths:
+            for dependency in self._get_dependencies_under(path):
+                self._invalidate_dependents(dependency)
+        for path in changed_info_paths:
+            # only changed targets of relationships matter, values of attributes do not
+            keys = self._dependents.get(path)
+            if keys:
+                for key in list(keys):
+                    entry = self._entries.get(key)
+                    if entry and path in entry.relationships:
+                        self._invalidate(key)
+
+    def clear(self):
+        self._entries = {}
+        self._dependents = {}
+        self._dependency_paths = []
+
+    #############################
+    # Private methods
+    #############################
+    def _get_entry(self, prim: Usd.Prim, relationship: str) -> _Entry:
+        key = (prim.GetPath(), relationship)
+        entry = self._entries.get(key)
+        if entry is None and prim.IsInstanceProxy():
+            entry = self._get_proxy_entry(key, prim, relationship)
+        elif entry is None:
+            relationships = set()
+            targets = self._resolve(prim.GetStage(), key[0].AppendProperty(relationship), relationships)
+            entry = _Entry(tuple(dict.fromkeys(targets)), relationships)
+            self._entries[key] = entry
+            self._add_dependencies(key, entry, entry.dependencies)
+        return entry
+
+    def _get_proxy_entry(self, key, prim: Usd.Prim, relationship: str) -> _Entry:
+        instance = prim.GetParent()
+        while not instance.IsInstance():
+            instance = instance.GetParent()
+        prototype_entry = self._get_entry(prim.GetPrimInPrototype(), relationship)
+        prototype, instance_path = instance.GetPrototype().GetPath(), instance.GetPath()
+        targets = tuple(target.ReplacePrefix(prototype, instance_path) for target in prototype_entry.targets)
+        entry = _Entry(targets, set(prototype_entry.relationships))
+        entry.mapping = (prototype, instance_path)
+        self._entries[key] = entry
+        self._add_dependencies(key, entry, prototype_entry.dependencies | entry.dependencies | {instance_path})
+        return entry
+
+    def _resolve(self, stage: Usd.Stage, rel_path: Sdf.Path, visited: set[Sdf.Path]) -> list[Sdf.Path]:
+        # same as GetForwardedTargets(), but remembers the relationships forwarded to
+        visited.add(rel_path)
+        rel = stage.GetRelationshipAtPath(rel_path)
+        if not rel:
+            return []
+        targets = []
+        for target in rel.GetTargets():
+            if target.IsPropertyPath() and stage.GetRelationshipAtPath(target):
+                if target not in visited:
+                    targets.extend(self._resolve(stage, target, visited))
+            else:
+                targets.append(target)
+        return targets
+
+    def _add_dependencies(self, key, entry: _Entry, paths):
+        for path in paths:
+            entry.dependencies.add(path)
+            dependents = self._dependents.get(path)
+            if dependents is None:
+                dependents = self._dependents[path] = set()
+                bisect.insort(self._dependency_paths, path)
+            dependents.add(key)
+
+    def _get_dependencies_under(self, root: Sdf.Path) -> list[Sdf.Path]:
+        paths = self._dependency_paths
+        start = bisect.bisect_left(paths, root)
+        end = start
+        while end < len(paths) and paths[end].HasPrefix(root):
+            end += 1
+        return paths[start:end]
+
+    def _invalidate_dependents(self, path: Sdf.Path):
+        for key in list(self._dependents.get(path, ())):
+            self._invalidate(key)
+
+    def _invalidate(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for path in entry.dependencies:
+            dependents = self._dependents.get(path)
+            if dependents is not None:
+                dependents.discard(key)
+                if not dependents:
+                    del self._dependents[path]
+                    del self._dependency_paths[bisect.bisect_left(self._dependency_paths, path)]
@@ -0,0 +1,162 @@
+import heapq
+import carb
+from pxr import Usd, Sdf
+
+
+class SignalGraph:
+    """ Propagates signals between linked prims once per frame.
+        A signal is sent along a relationship of a prim to an attribute of the target prims.
+        Instead of writing the attribute and waiting for the change notice, the graph delivers the value
+        directly to the @usd_attr handler of the target, which may send further signals.
+        Prims are evaluated in the topological order of the relationships used for sending,
+        every prim at most once per frame, so cycles cannot loop forever.
+        Signals are delivered by ModelLinkManager.begin_frame(), so a signal sent during a frame reaches
+        its targets in the next frame; signals sent by their handlers are delivered in the same evaluation,
+        only values sent back within a cycle wait for the next frame. As every prim gets the latest values
+        once per frame, @usd_attr(coalesce=True) handlers are called like the others.
+        The delivered values are stored in the SignalTable, which mirrors them to the attributes.
+
+        It can be accessed by: sick.modellink.core.get_signal_graph()
+
+    Args:
+        manager (ModelLinkManager): the manager delivering the values to the links
+    """
+
+    def __init__(self, manager) -> None:
+        self._manager = manager
+        self._relationships: set[str] = set()
+        self._ranks: dict[Sdf.Path, int] | None = None
+        self._pending: dict[Sdf.Path, dict[str, object]] = {}
+        self._heap: list[tuple[int, Sdf.Path]] | None = None  # only while evaluating
+
+    #############################
+    # Public methods
+    #############################
+    def send(self, prim: Usd.Prim, relationship: str, attr_name: str, value):
+        """ Sends value to the attribute attr_name of all (forwarded) targets of the relationship of prim.
+            The relationship becomes part of the graph the first time it is used.
+        """
+        if relationship not in self._relationships:
+            self._add_relationship(relationship)
+        for target in self._manager.get_relationship_cache().get_targets(prim, relationship):
+            self.set_signal(target.GetPrimPath(), attr_name, value)
+
+    def send_many(self, prims, relationship: str, attr_name: str, values):
+        """ Sends a value per prim, e.g. the outputs computed by a batch handler.
+        """
+        if relationship not in self._relationships:
+            self._add_relationship(relationship)
+        cache = self._manager.get_relationship_cache()
+        for prim, value in zip(prims, values):
+            for target in cache.get_targets(prim, relationship):
+                self.set_signal(target.GetPrimPath(), attr_name, value)
+
+    def set_signal(self, prim_path: Sdf.Path, attr_name: str, value):
+        """ Sets the attribute attr_name of the prim at prim_path, the value is delivered when the graph is evaluated.
+        """
+        inputs = self._pending.get(prim_path)
+        if inputs is None:
+            inputs = self._pending[prim_path] = {}
+            if self._heap is not None:
+                heapq.heappush(self._heap, (self._rank(prim_path), prim_path))
+        inputs[attr_name] = value
+
+    def invalidate(self):
+        """ Compiles the order of the prims again before the next evaluation.
+            Called when links are added or removed and when targets of the relationships change.
+        """
+        self._ranks = None
+
+    def get_relationships(self) -> set[str]:
+        return self._relationships
+
+    def evaluate(self):
+        """ Delivers all pending signals in topological order and stores the values in the SignalTable.
+            Called by ModelLinkManager.begin_frame() once per frame.
+        """
+        if not self._pending:
+            return
+        if self._ranks is None:
+            self._compile()
+
+        table = self._manager.get_signal_table()
+        evaluated = set()
+        deferred = {}
+        self._heap = [(self._rank(path), path) for path in self._pending]
+        heapq.heapify(self._heap)
+        try:
+            with self._manager.write_transaction():
+                while self._heap:
+                    _, path = heapq.heappop(self._heap)
+                    inputs = self._pending.pop(path, None)
+                    if inputs is None:
+                        continue
+                    if path in evaluated:
+                        # sent back within a cycle, changed values are delivered next frame
+                        changed = {k: v for k, v in inputs.items() if table.get(table.get_id(path, k)) != v}
+                        if changed:
+                            deferred[path] = changed
+                        continue
+                    evaluated.add(path)
+                    for attr_name, value in inputs.items():
+                        table.set(table.get_id(path, attr_name), value)
+                    self._manager.deliver_values(path, inputs)
+        finally:
+            self._heap = None
+            self._pending.update(deferred)
+
+    def clear(self):
+        for name in self._relationships:
+            self._manager.remove_property_observer(name, self._on_relationship_changed)
+        self._relationships = set()
+        self._pending = {}
+        self._ranks = None
+
+    #############################
+    # Private methods
+    #############################
+    def _add_relationship(self, relationship: str):
+        self._relationships.add(relationship)
+        self._manager.add_property_observer(relationship, self._on_relationship_changed)
+        self.invalidate()
+
+    def _on_relationship_changed(self, path: Sdf.Path):
+        self.invalidate()
+
+    def _rank(self, path: Sdf.Path) -> int:
+        # prims that are not part of the graph are sinks
+        return self._ranks.get(path, len(self._ranks))
+
+    def _compile(self):
+        # Kahn's algorithm over the relationships used for sending
+        cache = self._manager.get_relationship_cache()
+        edges: dict[Sdf.Path, set[Sdf.Path]] = {}
+        in_degree: dict[Sdf.Path, int] = {}
+        for link in self._manager.get_modellinks():
+            path = link._prim.GetPrimPath()
+            in_degree.setdefault(path, 0)
+            targets = edges.setdefault(path, set())
+            for name in self._relationships:
+                if link._prim.HasRelationship(name):
+                    targets.update(t.GetPrimPath() for t in cache.get_targets(link._prim, name))
+            targets.discard(path)
+            for target in targets:
+                in_degree[target] = in_degree.get(target, 0) + 1
+
+        ranks = {}
+        ready = [path for path, degree in in_degree.items() if degree == 0]
+        while ready:
+            path = ready.pop()
+            ranks[path] = len(ranks)
+            for target in edges.get(path, ()):
+                in_degree[target] -= 1
+                if in_degree[target] == 0:
+                    ready.append(target)
+
+        cyclic = [path for path in in_degree if path not in ranks]
+        if cyclic:
+            carb.log_warn(f"Signal graph contains cycles, {len(cyclic)} prims are in or behind a cycle (e.g. {cyclic[0]}), "
+                          "their signals are delivered at most once per frame")
+            for path in sorted(cyclic):
+                ranks[path] = len(ranks)
+        self._ranks = ranks
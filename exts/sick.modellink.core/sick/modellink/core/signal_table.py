@@ -0,0 +1,176 @@
+import time
+import carb.settings
+import numpy as np
+from omni import usd
+from pxr import Usd, Sdf
+
+
+MIRROR_RATE_SETTING = "/exts/sick.modellink.core/signalMirrorRate"
+
+# type code of a signal -> dtype of its column, a signal is stored in the column of the type of its last value
+_BOOL, _INT, _FLOAT, _OBJECT = range(4)
+_DTYPES = (bool, np.int64, np.float64, object)
+
+
+def _type_code(value) -> int:
+    if isinstance(value, (bool, np.bool_)):
+        return _BOOL
+    if isinstance(value, (int, np.integer)):
+        return _INT
+    if isinstance(value, (float, np.floating)):
+        return _FLOAT
+    return _OBJECT
+
+
+class SignalTable:
+    """ Holds the current values of the signals exchanged between linked prims.
+        A signal is an attribute of a prim, addressed by an integer ID. The values are kept in typed NumPy columns
+        indexed by that ID, so they can be read and written without touching the stage.
+        Changed values are mirrored to the attributes (without calling their @usd_attr handlers):
+        every frame, at the rate in Hz of the setting /exts/sick.modellink.core/signalMirrorRate,
+        or, if the rate is negative, only when mirror() is called. Signals of selected prims are mirrored
+        every frame, so the property window shows current values.
+
+        It can be accessed by: sick.modellink.core.get_signal_table()
+
+    Args:
+        manager (ModelLinkManager): the manager writing the values to the stage
+    """
+
+    def __init__(self, manager, capacity: int = 256) -> None:
+        self._manager = manager
+        self._ids: dict[tuple[Sdf.Path, str], int] = {}
+        self._ids_by_prim: dict[Sdf.Path, list[int]] = {}
+        self._keys: list[tuple[Sdf.Path, str]] = []
+        self._attrs: list[Usd.Attribute | None] = []
+        self._types = np.full(capacity, _OBJECT, dtype=np.int8)
+        self._columns = [np.zeros(capacity, dtype=dtype) if dtype is not object else np.full(capacity, None)
+                         for dtype in _DTYPES]
+        self._changed = np.zeros(capacity, dtype=bool)
+        self._observed: set[str] = set()
+        self._last_mirror = 0.0
+
+    #############################
+    # Public methods
+    #############################
+    def get_id(self, prim_path: Sdf.Path, attr_name: str) -> int:
+        """ Returns the ID of the signal attr_name of the prim at prim_path, it is added if unknown.
+        """
+        key = (prim_path, attr_name)
+        signal_id = self._ids.get(key)
+        if signal_id is None:
+            signal_id = self._add(key)
+        return signal_id
+
+    def find_id(self, prim_path: Sdf.Path, attr_name: str) -> int | None:
+        return self._ids.get((prim_path, attr_name))
+
+    def set(self, signal_id: int, value):
+        code = _type_code(value)
+        self._types[signal_id] = code
+        self._columns[code][signal_id] = value
+        self._changed[signal_id] = True
+
+    def get(self, signal_id: int):
+        value = self._columns[self._types[signal_id]][signal_id]
+        return value.item() if isinstance(value, np.generic) else value
+
+    def get_value(self, prim_path: Sdf.Path, attr_name: str, default=None):
+        """ Returns the current value of a signal, or default if the signal is unknown.
+            Use this instead of reading the attribute, which may not be mirrored yet.
+        """
+        signal_id = self._ids.get((prim_path, attr_name))
+        return default if signal_id is None else self.get(signal_id)
+
+    def update(self):
+        """ Mirrors changed values according to the mirror rate, and those of selected prims.
+            Called by ModelLinkManager.begin_frame() once per frame.
+        """
+        if not self._changed.any():
+            return
+        rate = carb.settings.get_settings().get(MIRROR_RATE_SETTING) or 0
+        now = time.monotonic()
+        if rate == 0 or (rate > 0 and now - self._last_mirror >= 1.0 / rate):
+            self._last_mirror = now
+            self.mirror()
+            return
+        selection = usd.get_context().get_selection().get_selected_prim_paths()
+        if selection:
+            self.mirror([Sdf.Path(path) for path in selection])
+
+    def mirror(self, prim_paths: list[Sdf.Path] | None = None):
+        """ Writes the changed values of all signals, or of the signals of the given prims, to the stage.
+        """
+        if prim_paths is None:
+            ids = np.flatnonzero(self._changed[:len(self._keys)])
+        else:
+            ids = [i for path in prim_paths for i in self._ids_by_prim.get(path, ()) if self._changed[i]]
+        if len(ids) == 0:
+            return
+        self._changed[ids] = False
+        stage = usd.get_context().get_stage()
+        if not stage:
+            return
+        with self._manager.write_transaction():
+            for signal_id in ids:
+                attr = self._get_attribute(stage, signal_id)
+                if attr:
+                    self._manager.set_value(attr, self.get(signal_id), notify=False)
+
+    def clear(self):
+        for name in self._observed:
+            self._manager.remove_property_observer(name, self._on_signal_changed)
+        self._observed = set()
+        self._ids = {}
+        self._ids_by_prim = {}
+        self._keys = []
+        self._attrs = []
+        self._changed[:] = False
+
+    #############################
+    # Private methods
+    #############################
+    def _add(self, key: tuple[Sdf.Path, str]) -> int:
+        signal_id = len(self._keys)
+        if signal_id == len(self._types):
+            self._grow()
+        self._ids[key] = signal_id
+        self._ids_by_prim.setdefault(key[0], []).append(signal_id)
+        self._keys.append(key)
+        self._attrs.append(None)
+        self._types[signal_id] = _OBJECT
+        self._columns[_OBJECT][signal_id] = None
+        self._changed[signal_id] = False
+        if key[1] not in self._observed:
+            # values authored by others, e.g. in the property window, are taken over
+            self._observed.add(key[1])
+            self._manager.add_property_observer(key[1], self._on_signal_changed)
+        return signal_id
+
+    def _grow(self):
+        capacity = 2 * len(self._types)
+        self._types = np.concatenate((self._types, np.full(capacity - len(self._types), _OBJECT, dtype=np.int8)))
+        self._changed = np.concatenate((self._changed, np.zeros(capacity - len(self._changed), dtype=bool)))
+        self._columns = [np.concatenate((column, np.zeros(capacity - len(column), dtype=column.dtype)
+                                         if column.dtype != object else np.full(capacity - len(column), None)))
+                         for column in self._columns]
+
+    def _get_attribute(self, stage: Usd.Stage, signal_id: int) -> Usd.Attribute | None:
+        attr = self._attrs[signal_id]
+        if not attr:
+            prim_path, attr_name = self._keys[signal_id]
+            prim = stage.GetPrimAtPath(prim_path)
+            attr = self._attrs[signal_id] = prim.GetAttribute(attr_name) if prim else None
+        return attr
+
+    def _on_signal_changed(self, path: Sdf.Path):
+        signal_id = self._ids.get((path.GetPrimPath(), path.name))
+        if signal_id is not None:
+            stage = usd.get_context().get_stage()
+            attr = self._get_attribute(stage, signal_id) if stage else None
+            if attr:
+                value = attr.Get()
+                code = _type_code(value)
+                self._types[signal_id] = code
+                self._columns[code][signal_id] = value
+                self._changed[signal_id] = False
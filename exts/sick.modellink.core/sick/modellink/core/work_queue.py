@@ -0,0 +1,153 @@
+import threading
+from collections import deque
+import carb
+import carb.settings
+from pxr import Sdf
+
+
+BATCH_SIZE_SETTING = "/exts/sick.modellink.core/postBatchSize"
+CAPACITY_SETTING = "/exts/sick.modellink.core/postQueueCapacity"
+
+LATEST = "latest"
+KEEP_ALL = "keep_all"
+AGGREGATE = "aggregate"
+_POLICIES = (LATEST, KEEP_ALL, AGGREGATE)
+
+
+class _Channel:
+    __slots__ = ('policy', 'items', 'queued')
+
+    def __init__(self, policy: str) -> None:
+        self.policy = policy
+        self.items: deque = deque()
+        self.queued = False
+
+
+class WorkQueue:
+    """ Passes values and callables from other threads, e.g. network clients, to linked prims on the main thread.
+        post() may be called from any thread. Once per frame, before the update events, ModelLinkManager.begin_frame()
+        drains the queue: a value is passed to the @on_post handler of the link at the posted path,
+        a callable is called with the instance of that link.
+        Every source of a link (link path and source name) has a policy for values not delivered yet:
+            'latest': only the last one is kept,
+            'keep_all': all are delivered in order, at most postQueueCapacity are kept (the oldest are dropped),
+            'aggregate': all are delivered at once as a list to one call of the handler.
+        At most postBatchSize items are delivered per frame, the rest is delivered in the next frames,
+        this also limits the length of an aggregated list.
+
+        It can be accessed by: sick.modellink.core.get_work_queue() or posted to by sick.modellink.core.post()
+
+    Args:
+        manager (ModelLinkManager): the manager delivering the items to the links
+    """
+
+    def __init__(self, manager) -> None:
+        self._manager = manager
+        self._lock = threading.Lock()
+        self._channels: dict[tuple[Sdf.Path, str | None], _Channel] = {}
+        self._ready: deque[tuple[Sdf.Path, str | None]] = deque()  # channels with items, in order of posting
+        self._depth = 0
+        self._capacity = 10000
+        self._stats = {"posted": 0, "delivered": 0, "dropped": 0, "max_depth": 0}
+
+    #############################
+    # Public methods
+    #############################
+    def post(self, link_path: Sdf.Path | str, item, policy: str = LATEST, source: str | None = None):
+        """ Queues item (a value or a callable) for the link at link_path. Thread-safe.
+
+        Args:
+            link_path (Sdf.Path | str): the path of the linked prim
+            item: a value passed to the @on_post handler, or a callable called with the linked instance
+            policy (str, optional): 'latest', 'keep_all' or 'aggregate', see WorkQueue. Defaults to 'latest'.
+            source (str | None, optional): the name of the source, every source has its own policy. Defaults to None.
+        """
+        if policy not in _POLICIES:
+            carb.log_warn(f"Unknown post policy '{policy}', using '{LATEST}'")
+            policy = LATEST
+        key = (Sdf.Path(link_path), source)
+        with self._lock:
+            channel = self._channels.get(key)
+            if channel is None:
+                channel = self._channels[key] = _Channel(policy)
+            channel.policy = policy
+            items = channel.items
+            if policy == LATEST:
+                self._drop(len(items))
+                items.clear()
+            elif len(items) >= self._capacity:
+                self._drop(1)
+                items.popleft()
+            items.append(item)
+            self._depth += 1
+            self._stats["posted"] += 1
+            self._stats["max_depth"] = max(self._stats["max_depth"], self._depth)
+            if not channel.queued:
+                channel.queued = True
+                self._ready.append(key)
+
+    def drain(self) -> int:
+        """ Delivers up to postBatchSize queued items on the calling (main) thread, returns the number delivered.
+            Called by ModelLinkManager.begin_frame() once per frame.
+        """
+        if not self._ready:
+            return 0
+        settings = carb.settings.get_settings()
+        limit = int(settings.get(BATCH_SIZE_SETTING) or 1000)
+        self._capacity = int(settings.get(CAPACITY_SETTING) or 10000)
+        batch = []
+        with self._lock:
+            taken = 0
+            while self._ready and taken < limit:
+                key = self._ready.popleft()
+                channel = self._channels[key]
+                items = channel.items
+                count = min(len(items), limit - taken)
+                if channel.policy == AGGREGATE:
+                    batch.append((key[0], [items.popleft() for _ in range(count)], count))
+                else:
+                    batch.extend((key[0], items.popleft(), 1) for _ in range(count))
+                taken += count
+                if items:
+                    self._ready.append(key)  # the rest is delivered in the next frame
+                else:
+                    channel.queued = False
+            self._depth -= taken
+
+        delivered = 0
+        with self._manager.write_transaction():
+            for path, item, count in batch:
+                if self._manager.deliver_posted(path, item):
+                    delivered += count
+        with self._lock:
+            self._stats["delivered"] += delivered
+            self._stats["dropped"] += taken - delivered
+        return delivered
+
+    def get_depth(self, link_path: Sdf.Path | str | None = None, source: str | None = None) -> int:
+        """ Returns the number of queued items of a source, or of all sources if link_path is None.
+        """
+        if link_path is None:
+            return self._depth
+        channel = self._channels.get((Sdf.Path(link_path), source))
+        return len(channel.items) if channel else 0
+
+    def get_stats(self) -> dict[str, int]:
+        """ Returns the number of items 'posted', 'delivered', 'dropped' (overwritten, over capacity
+            or without link), the current 'depth' and the 'max_depth' of the queue.
+        """
+        with self._lock:
+            return dict(self._stats, depth=self._depth)
+
+    def clear(self):
+        with self._lock:
+            self._channels = {}
+            self._ready = deque()
+            self._depth = 0
+
+    #############################
+    # Private methods
+    #############################
+    def _drop(self, count: int):
+        self._depth -= count
+        self._stats["dropped"] += count
@@ -6,6 +6,8 @@ from sick.modellink.core.modellink_manager import linked
     The function 'my_custom_function' is used to detect the prim to be linked.
     The function should return True if the prim should be linked, otherwise False.
     In this example, the prim is linked if it has an attribute 'id' with value 42.
+    The prefilter attributes=['id'] lets the manager skip prims without that attribute
+    before calling the function, the function still checks it to be usable on its own.
 
     To see it in action:
     - Drag and drop an .usda file contained in '/data/testfiles/' into the stage
@@ -16,7 +18,7 @@ def my_custom_function(prim: Usd.Prim):
     return prim.HasAttribute('id') and prim.GetAttribute('id').Get() == 42
 
 
-@linked(my_custom_function)
+@linked(my_custom_function, attributes=['id'])
 class MyCustomHandler:
 
     def __init__(self) -> None:
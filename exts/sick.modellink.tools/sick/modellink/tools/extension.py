@@ -69,7 +69,9 @@ class ModelLinkToolsExtension(omni.ext.IExt):
                 or e.type == int(ml.MODELLINK_ACTIVATOR_DISABLED):
             self._activators_model.set_list(manager.get_activators())
 
-        if e.type == int(ml.MODELLINK_ADDED) or e.type == int(ml.MODELLINK_REMOVED):
+        if e.type == int(ml.MODELLINK_ADDED) or e.type == int(ml.MODELLINK_REMOVED) \
+                or e.type == int(ml.MODELLINK_BATCH_ADDED) \
+                or e.type == int(ml.MODELLINK_BATCH_REMOVED):
             self._links_model.set_list(manager.get_modellinks())
 
 
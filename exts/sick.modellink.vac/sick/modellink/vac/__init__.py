@@ -7,7 +7,8 @@ from .rotor import Rotor
 from .coupler import Coupler
 from .mqtt_coupler import MqttCoupler
 from .wave_generator import WaveGenerator
-from .utils import set_translation_on_xform, set_rotation_on_xform
+from .utils import set_translation_on_xform, set_rotation_on_xform, set_translations, set_rotations, \
+    set_orientations, get_transform_writer
 
 __all__ = [
     "Enabler",
@@ -20,4 +21,8 @@ __all__ = [
     "WaveGenerator",
     "set_translation_on_xform",
     "set_rotation_on_xform",
+    "set_translations",
+    "set_rotations",
+    "set_orientations",
+    "get_transform_writer",
 ]
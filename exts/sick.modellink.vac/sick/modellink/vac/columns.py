@@ -0,0 +1,102 @@
+import carb.settings
+import numpy as np
+from typing import Callable
+
+
+COLUMNAR_SETTING = "/exts/sick.modellink.vac/columnar"
+
+
+def columnar_enabled() -> bool:
+    """ Returns True if components keep their parameters in a ColumnStore, see extension.toml. """
+    return bool(carb.settings.get_settings().get(COLUMNAR_SETTING))
+
+
+class ColumnStore:
+    """ Keeps values of many instances of a component as NumPy columns, one row per instance,
+        so a batch handler can compute all of them vectorized.
+        Rows of removed instances are reused. Changed rows are marked dirty until take_dirty() is called.
+
+    Args:
+        columns (dict): name -> (dtype, shape of one value), e.g. {"direction": (float, (3,))}
+        capacity (int, optional): the initial number of rows, the columns grow as needed. Defaults to 64.
+    """
+
+    def __init__(self, columns: dict[str, tuple[type, tuple]], capacity: int = 64) -> None:
+        self._columns = {name: np.zeros((capacity,) + shape, dtype=dtype) for name, (dtype, shape) in columns.items()}
+        self._owners = np.empty(capacity, dtype=object)
+        self._dirty = np.zeros(capacity, dtype=bool)
+        self._slots: dict[object, int] = {}
+        self._free: list[int] = []
+        self._size = 0
+
+    #############################
+    # Public methods
+    #############################
+    def __contains__(self, instance) -> bool:
+        return instance in self._slots
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def sync(self, instances, load: Callable[[object], dict]):
+        """ Adds a row for every new instance, filled with load(instance), and frees the rows of instances
+            which are not in instances anymore.
+        """
+        current = set(instances)
+        for instance in [i for i in self._slots if i not in current]:
+            self._remove(instance)
+        for instance in instances:
+            if instance not in self._slots:
+                self._add(instance)
+                self.set(instance, **load(instance))
+
+    def set(self, instance, dirty: bool = False, **values) -> bool:
+        """ Sets the values of the row of instance, returns False if the instance has no row.
+        """
+        slot = self._slots.get(instance)
+        if slot is None:
+            return False
+        for name, value in values.items():
+            self._columns[name][slot] = value
+        if dirty:
+            self._dirty[slot] = True
+        return True
+
+    def take_dirty(self) -> tuple[np.ndarray, np.ndarray]:
+        """ Returns the dirty rows and their instances and clears the dirty marks.
+        """
+        slots = np.flatnonzero(self._dirty[:self._size])
+        self._dirty[slots] = False
+        return slots, self._owners[slots]
+
+    #############################
+    # Private methods
+    #############################
+    def _add(self, instance):
+        if self._free:
+            slot = self._free.pop()
+        else:
+            slot = self._size
+            if slot == len(self._owners):
+                self._grow()
+            self._size += 1
+        self._slots[instance] = slot
+        self._owners[slot] = instance
+
+    def _remove(self, instance):
+        slot = self._slots.pop(instance)
+        self._owners[slot] = None
+        self._dirty[slot] = False
+        self._free.append(slot)
+
+    def _grow(self):
+        capacity = 2 * len(self._owners)
+        for name, column in self._columns.items():
+            grown = np.zeros((capacity,) + column.shape[1:], dtype=column.dtype)
+            grown[:len(column)] = column
+            self._columns[name] = grown
+        self._owners = np.concatenate((self._owners, np.empty(capacity - len(self._owners), dtype=object)))
+        self._dirty = np.concatenate((self._dirty, np.zeros(capacity - len(self._dirty), dtype=bool)))
@@ -1,6 +1,7 @@
 from pxr import Usd
 from injector import inject
-from sick.modellink.core.modellink_manager import linked, usd_attr
+from sick.modellink.core import get_signal_graph
+from sick.modellink.core.modellink_manager import linked, usd_attr, on_rebind
 
 
 @linked
@@ -24,10 +25,17 @@ class Coupler:
         self.factor = factor_attr.Get() if factor_attr else 1.0
         self.threshold = threshold_attr.Get() if threshold_attr else 0.0
 
-    @usd_attr("vac:format;vac:bool_values;vac:factor;vac:threshold")
+    @usd_attr("vac:format;vac:bool_values;vac:factor;vac:threshold", grouped=True)
     def _update_params(self):
         self._set_params()
 
+    @on_rebind
+    def rebind(self, prim: Usd.Prim, stage: Usd.Stage):
+        # the stage was reopened or the prim resynced, the parameters may have changed
+        self.prim = prim
+        self.stage = stage
+        self._update_params()
+
     def _set_output(self, output_value):
         if isinstance(output_value, bool):
             attr_name = "vac:on"
@@ -35,12 +43,7 @@ class Coupler:
             attr_name = "vac:select"
         else:  # float
             attr_name = "vac:value"
-        rel = self.prim.GetRelationship("stateReceiver")
-        for target in rel.GetForwardedTargets():
-            prim = self.stage.GetPrimAtPath(target)
-            attr = prim.GetAttribute(attr_name)
-            if attr:
-                attr.Set(output_value, Usd.TimeCode.Default())
+        get_signal_graph().send(self.prim, "stateReceiver", attr_name, output_value)
 
     @usd_attr("vac:on", param_name="input_bool")
     def convert_bool(self, input_bool: bool):
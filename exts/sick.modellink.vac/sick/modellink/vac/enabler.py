@@ -1,6 +1,7 @@
 from pxr import Usd, UsdGeom
 from injector import inject
-from sick.modellink.core.modellink_manager import linked, usd_attr
+from sick.modellink.core.modellink_manager import linked, usd_attr, on_rebind
+from sick.modellink.core import get_relationship_cache, get_signal_table
 
 
 @linked
@@ -12,9 +13,15 @@ class Enabler:
         self.stage = stage
         self.enable_light(False)
 
+    @on_rebind
+    def rebind(self, prim: Usd.Prim, stage: Usd.Stage):
+        self.prim = prim
+        self.stage = stage
+
     @usd_attr("vac:on", param_name="enabled")
     def enable_light(self, enabled: bool):
-        rel = self.prim.GetRelationship("vac:target")
-        for target in rel.GetForwardedTargets():
-            attr = self.stage.GetAttributeAtPath(target)
-            attr.Set(UsdGeom.Tokens.inherited if enabled else UsdGeom.Tokens.invisible)
\ No newline at end of file
+        # the visibility is a signal of the target, the SignalTable mirrors it to the stage
+        table = get_signal_table()
+        visibility = UsdGeom.Tokens.inherited if enabled else UsdGeom.Tokens.invisible
+        for attr in get_relationship_cache().get_attributes(self.prim, "vac:target"):
+            table.set(table.get_id(attr.GetPrim().GetPath(), attr.GetName()), visibility)
@@ -1,5 +1,14 @@
-from pxr import Usd, UsdGeom, Gf
+from pxr import Usd, UsdGeom, Gf, Sdf
 import carb
+from sick.modellink.core.modellink_manager import ModelLinkManager
+
+_ROTATE_OP_TYPES = [UsdGeom.XformOp.TypeRotateXYZ, UsdGeom.XformOp.TypeRotateXZY,
+                    UsdGeom.XformOp.TypeRotateYXZ, UsdGeom.XformOp.TypeRotateYZX,
+                    UsdGeom.XformOp.TypeRotateZXY, UsdGeom.XformOp.TypeRotateZYX]
+# rotate attribute and value type per prim, until the xformOpOrder of the prim changes
+_rotate_ops: dict[Sdf.Path, tuple[Usd.Attribute, type]] = {}
+_observing = False
+
 
 def hasRotate(prim: Usd.Prim) -> bool:
 
@@ -10,9 +19,7 @@ def hasRotate(prim: Usd.Prim) -> bool:
     xform_ops = xformable.GetOrderedXformOps()
 
     for op in xform_ops:
-        if op.GetOpType() in [UsdGeom.XformOp.TypeRotateXYZ, UsdGeom.XformOp.TypeRotateXZY,
-                              UsdGeom.XformOp.TypeRotateYXZ, UsdGeom.XformOp.TypeRotateYZX,
-                              UsdGeom.XformOp.TypeRotateZXY, UsdGeom.XformOp.TypeRotateZYX]:
+        if op.GetOpType() in _ROTATE_OP_TYPES:
             return True
         elif op.GetOpType() == UsdGeom.XformOp.TypeOrient:
             return False
@@ -41,13 +48,16 @@ def quaternion_to_rotate(prim):
         xformable.AddRotateXYZOp()
         
 
-# --------------------------------------------------.
-# Set Rotate.
-# --------------------------------------------------.
-def setRotate(prim: Usd.Prim, rV: Gf.Vec3f):
-    if prim is None:
-        return
-    
+def _on_op_order_changed(path: Sdf.Path):
+    _rotate_ops.pop(path.GetPrimPath(), None)
+
+
+def _get_rotate_op(prim: Usd.Prim) -> tuple[Usd.Attribute, type] | None:
+    global _observing
+    if not _observing:
+        ModelLinkManager().add_property_observer(UsdGeom.Tokens.xformOpOrder, _on_op_order_changed)
+        _observing = True
+
     if not hasRotate(prim):
         carb.log_warn("Prim does not have a rotate attribute. Creating one.")
         quaternion_to_rotate(prim)
@@ -55,21 +65,34 @@ def setRotate(prim: Usd.Prim, rV: Gf.Vec3f):
     # Get rotOrder.
     # If rotation does not exist, rotOrder = UsdGeom.XformCommonAPI.RotationOrderXYZ.
     xformAPI = UsdGeom.XformCommonAPI(prim)
-    time_code = Usd.TimeCode.Default()
-    translation, rotation, scale, pivot, rotOrder = xformAPI.GetXformVectors(time_code)
+    rotOrder = xformAPI.GetXformVectors(Usd.TimeCode.Default())[4]
 
     # Convert rotOrder to "xformOp:rotateXYZ" etc.
     t = xformAPI.ConvertRotationOrderToOpType(rotOrder)
-    rotateAttrName = "xformOp:" + UsdGeom.XformOp.GetOpTypeToken(t)
-
-    # Set rotate.
-    rotate = prim.GetAttribute(rotateAttrName).Get()
-    if rotate != None:
-        # Specify a value for each type.
-        if type(rotate) == Gf.Vec3f:
-            prim.GetAttribute(rotateAttrName).Set(Gf.Vec3f(rV))
-        elif type(rotate) == Gf.Vec3d:
-            prim.GetAttribute(rotateAttrName).Set(Gf.Vec3d(rV))
-    else:
-        # xformOpOrder is also updated.
-        xformAPI.SetRotate(Gf.Vec3f(rV), rotOrder)
\ No newline at end of file
+    attr = prim.GetAttribute("xformOp:" + UsdGeom.XformOp.GetOpTypeToken(t))
+    rotate = attr.Get() if attr else None
+    if rotate is None:
+        return None
+    return attr, type(rotate)
+
+
+# --------------------------------------------------.
+# Set Rotate.
+# --------------------------------------------------.
+def setRotate(prim: Usd.Prim, rV: Gf.Vec3f):
+    if prim is None:
+        return
+
+    rotate_op = _rotate_ops.get(prim.GetPath())
+    if rotate_op is None or not rotate_op[0]:
+        rotate_op = _get_rotate_op(prim)
+        if rotate_op is None:
+            # xformOpOrder is also updated, the op is looked up again on the next call
+            xformAPI = UsdGeom.XformCommonAPI(prim)
+            xformAPI.SetRotate(Gf.Vec3f(rV), xformAPI.GetXformVectors(Usd.TimeCode.Default())[4])
+            return
+        _rotate_ops[prim.GetPath()] = rotate_op
+
+    # Specify a value for each type.
+    attr, value_type = rotate_op
+    ModelLinkManager().set_value(attr, value_type(rV))
@@ -1,7 +1,8 @@
 from pxr import Usd
 import omni.kit.raycast.query as rq
 from injector import inject
-from sick.modellink.core.modellink_manager import linked, on_update
+from sick.modellink.core import get_signal_graph
+from sick.modellink.core.modellink_manager import linked, on_update, on_rebind
 
 import carb
 
@@ -15,12 +16,13 @@ class LightBarrierClass:
         self._its_prim = its_prim
         self._stage = stage
 
+    @on_rebind
+    def rebind(self, its_prim: Usd.Prim, stage: Usd.Stage):
+        self._its_prim = its_prim
+        self._stage = stage
+
     def send_signal(self, enabled: bool):
-        rel = self._its_prim.GetRelationship("stateReceiver")
-        for target in rel.GetForwardedTargets():
-            prim = self._stage.GetPrimAtPath(target)
-            attr = prim.GetAttribute("vac:on")
-            attr.Set(enabled)
+        get_signal_graph().send(self._its_prim, "stateReceiver", "vac:on", enabled)
 
     def on_ray(self, ray: rq.Ray, hit: rq.RayQueryResult):
         self.send_signal(hit.valid)
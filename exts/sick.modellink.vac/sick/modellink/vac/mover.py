@@ -1,11 +1,22 @@
-from pxr import Usd, Gf, UsdGeom
+from pxr import Usd, Gf, Vt
 from injector import inject
-from sick.modellink.core.modellink_manager import linked, usd_attr
-from .utils import set_translation_on_xform
+from sick.modellink.core.modellink_manager import linked, usd_attr, on_update, on_rebind
+from sick.modellink.core import get_relationship_cache, get_signal_table
+from .utils import set_translations
+from .columns import ColumnStore, columnar_enabled
+
+import numpy as np
 
 
 @linked
 class Mover:
+    # movers whose value or parameters changed, moved by the next update
+    _dirty: dict["Mover", None] = {}
+    # parameters of all movers, only if columnar_enabled()
+    _COLUMNS = {"direction": (float, (3,)), "offset": (float, ()), "range_min": (float, ()), "range_max": (float, ()),
+                "factor": (float, ()), "clamp": (bool, ()), "value": (float, ())}
+    _store: ColumnStore | None = None
+    _instances: list | None = None
 
     @inject
     def __init__(self, prim: Usd.Prim, stage: Usd.Stage) -> None:
@@ -25,29 +36,64 @@ class Mover:
         self.range_min, self.range_max = range_attr.Get() if range_attr else (0.0, 1.0)
         self.factor = factor_attr.Get() if factor_attr else 1.0
         self.clamp = clamp_attr.Get() if clamp_attr else True
-        self.value = self.prim.GetAttribute("vac:value").Get() if self.prim.GetAttribute("vac:value") else 0.0
+        value_attr = self.prim.GetAttribute("vac:value")
+        # the attribute may not be mirrored yet
+        self.value = get_signal_table().get_value(self.prim.GetPath(), "vac:value", value_attr.Get() if value_attr else 0.0)
+
+    def _params(self) -> dict:
+        return {"direction": self.direction, "offset": self.offset, "range_min": self.range_min,
+                "range_max": self.range_max, "factor": self.factor, "clamp": self.clamp, "value": self.value}
 
-    @usd_attr("vac:direction;vac:offset;vac:range;vac:factor;vac:clamp")
+    @usd_attr("vac:direction;vac:offset;vac:range;vac:factor;vac:clamp", grouped=True)
     def _update_params(self):
         self._set_params()
-        self._move(self.value)
-
-    def _move(self, value: float):
-        # Calculate position
-        scaled_value = value * self.factor + self.offset
-        if self.clamp:
-            scaled_value = max(self.range_min, min(self.range_max, scaled_value))
-        position = self.direction * scaled_value
-
-        # Apply to targets
-        rel = self.prim.GetRelationship("vac:target")
-        for target in rel.GetForwardedTargets():
-            target_prim = self.stage.GetPrimAtPath(target)
-            xform = UsdGeom.Xformable(target_prim)
-            if xform:
-                set_translation_on_xform(xform, position)
+        if Mover._store is None or not Mover._store.set(self, dirty=True, **self._params()):
+            Mover._dirty[self] = None
 
+    @on_rebind
+    def rebind(self, prim: Usd.Prim, stage: Usd.Stage):
+        # the stage was reopened or the prim resynced, the parameters may have changed
+        self.prim = prim
+        self.stage = stage
+        self._update_params()
 
     @usd_attr("vac:value", param_name="value")
     def move(self, value: float):
-        self._move(value)
+        self.value = value
+        if Mover._store is None or not Mover._store.set(self, dirty=True, value=value):
+            Mover._dirty[self] = None
+
+    @on_update(editmode=True, batch=True)
+    def update(cls, instances: list["Mover"]):
+        if instances is not cls._instances:
+            cls._instances = instances
+            if not columnar_enabled():
+                cls._store = None
+            else:
+                cls._store = cls._store if cls._store is not None else ColumnStore(cls._COLUMNS)
+                cls._store.sync(instances, Mover._params)
+
+        if cls._dirty:
+            movers, cls._dirty = list(cls._dirty), {}
+            params = [m._params() for m in movers]
+            cls._move_all(movers, {name: np.array([p[name] for p in params], dtype=dtype)
+                                   for name, (dtype, _) in cls._COLUMNS.items()})
+        if cls._store is not None:
+            slots, movers = cls._store.take_dirty()
+            if len(slots):
+                cls._move_all(movers, {name: cls._store[name][slots] for name in cls._COLUMNS})
+
+    @classmethod
+    def _move_all(cls, movers, columns: dict[str, np.ndarray]):
+        # Calculate positions
+        scaled_value = columns["value"] * columns["factor"] + columns["offset"]
+        clamped = np.clip(scaled_value, columns["range_min"], columns["range_max"])
+        scaled_value = np.where(columns["clamp"], clamped, scaled_value)
+        positions = columns["direction"] * scaled_value[:, None]
+
+        # Apply to targets: the Vt array converts the rows to Gf values, each target is still written on its own
+        cache = get_relationship_cache()
+        targets = [cache.get_prims(m.prim, "vac:target") if m.prim else () for m in movers]
+        rows = np.repeat(np.arange(len(movers)), [len(t) for t in targets])
+        set_translations([t for mover_targets in targets for t in mover_targets],
+                         Vt.Vec3dArray.FromNumpy(np.ascontiguousarray(positions[rows])))
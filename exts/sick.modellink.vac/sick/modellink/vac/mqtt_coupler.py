@@ -1,6 +1,7 @@
 from pxr import Usd
 from injector import inject
-from sick.modellink.core.modellink_manager import linked, on_update, usd_attr
+from sick.modellink.core import get_signal_graph, post
+from sick.modellink.core.modellink_manager import linked, on_post, on_rebind, usd_attr
 
 import carb
 import paho.mqtt.client as mqtt
@@ -13,8 +14,8 @@ class MqttCoupler:
     def __init__(self, prim: Usd.Prim, stage: Usd.Stage) -> None:
         self.prim = prim
         self.stage = stage
+        self._path = prim.GetPrimPath()  # used by the network thread, which must not access the stage
         self._set_params()
-        self.pending_value = None  # For thread-safe updates
         # Initialize MQTT client
         self.mqtt_client = mqtt.Client()
         self.mqtt_client.on_message = self.on_message
@@ -22,6 +23,17 @@ class MqttCoupler:
         self.mqtt_client.subscribe(self.topic)
         self.mqtt_client.loop_start()
 
+    @on_rebind
+    def rebind(self, prim: Usd.Prim, stage: Usd.Stage):
+        # the connection is kept, only the topic of the reopened stage is subscribed again
+        self.prim = prim
+        self.stage = stage
+        old_topic = self.topic
+        self._set_params()
+        if self.mqtt_client and self.topic != old_topic:
+            self.mqtt_client.unsubscribe(old_topic)
+            self.mqtt_client.subscribe(self.topic)
+
     def _set_params(self):
         # Load MQTT configuration attributes
         broker_attr = self.prim.GetAttribute("vac:broker")
@@ -31,7 +43,7 @@ class MqttCoupler:
         self.port = port_attr.Get() if port_attr else 1883
         self.topic = topic_attr.Get() if topic_attr else "vac/default"
 
-    @usd_attr("vac:broker;vac:port")
+    @usd_attr("vac:broker;vac:port", grouped=True)
     def _update_params(self):
         self._set_params()
         #if self.mqtt_client:
@@ -43,23 +55,16 @@ class MqttCoupler:
         try:
             payload_str = message.payload.decode().strip('[]')
             value = float(payload_str)
-            self.pending_value = value  # Store for main thread
+            post(self._path, value, policy="keep_all")  # delivered to update() on the main thread
         except ValueError:
             carb.log_warn(f"Invalid MQTT message payload: {message.payload}")
 
-    @on_update(editmode=True)
-    def update(self, prim: Usd.Prim):
-        if self.pending_value is not None:
-            self._set_output(self.pending_value)
-            self.pending_value = None
+    @on_post
+    def update(self, value: float):
+        self._set_output(value)
 
     def _set_output(self, output_value):
-        rel = self.prim.GetRelationship("stateReceiver")
-        for target in rel.GetForwardedTargets():
-            prim = self.stage.GetPrimAtPath(target)
-            attr = prim.GetAttribute("vac:value")
-            if attr:
-                attr.Set(output_value, Usd.TimeCode.Default())
+        get_signal_graph().send(self.prim, "stateReceiver", "vac:value", output_value)
 
     @usd_attr("vac:value", param_name="value")
     def publish_value(self, value: float):
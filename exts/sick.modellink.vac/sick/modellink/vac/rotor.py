@@ -1,12 +1,23 @@
 import carb
-from pxr import Usd, Gf, UsdGeom
+from pxr import Usd, Gf, Vt
 from injector import inject
-from sick.modellink.core.modellink_manager import linked, usd_attr
-from .utils import set_rotation_on_xform
+from sick.modellink.core.modellink_manager import linked, usd_attr, on_update, on_rebind
+from sick.modellink.core import get_relationship_cache, get_signal_table
+from .utils import set_orientations
+from .columns import ColumnStore, columnar_enabled
+
+import numpy as np
 
 
 @linked
 class Rotor:
+    # rotors whose value or parameters changed, rotated by the next update
+    _dirty: dict["Rotor", None] = {}
+    # parameters of all rotors, only if columnar_enabled()
+    _COLUMNS = {"axis": (float, (3,)), "offset": (float, ()), "range_min": (float, ()), "range_max": (float, ()),
+                "factor": (float, ()), "clamp": (bool, ()), "value": (float, ())}
+    _store: ColumnStore | None = None
+    _instances: list | None = None
 
     @inject
     def __init__(self, prim: Usd.Prim, stage: Usd.Stage) -> None:
@@ -27,31 +38,72 @@ class Rotor:
         self.factor = factor_attr.Get() if factor_attr else 1.0
         self.clamp = clamp_attr.Get() if clamp_attr else True
         #safe last value
-        self.value = self.prim.GetAttribute("vac:value").Get() if self.prim.GetAttribute("vac:value") else 0.0
+        value_attr = self.prim.GetAttribute("vac:value")
+        # the attribute may not be mirrored yet
+        self.value = get_signal_table().get_value(self.prim.GetPath(), "vac:value", value_attr.Get() if value_attr else 0.0)
+
 
+    def _params(self) -> dict:
+        return {"axis": self.axis, "offset": self.offset, "range_min": self.range_min,
+                "range_max": self.range_max, "factor": self.factor, "clamp": self.clamp, "value": self.value}
 
-    @usd_attr("vac:axis;vac:offset;vac:range;vac:factor;vac:clamp")
+    @usd_attr("vac:axis;vac:offset;vac:range;vac:factor;vac:clamp", grouped=True)
     def _update_params(self):
         self._set_params()
-        self._rotate(self.value)
+        if Rotor._store is None or not Rotor._store.set(self, dirty=True, **self._params()):
+            Rotor._dirty[self] = None
 
-    def _rotate(self, value: float):
-        #carb.log_info(f"Rotor received value: {value}")
-        # Calculate rotation
-        scaled_value = value * self.factor + self.offset
-        if self.clamp:
-            scaled_value = max(self.range_min, min(self.range_max, scaled_value))
-        rotation = Gf.Rotation(self.axis, scaled_value)
-        #carb.log_info(f"Rotor calculated rotation: {rotation}")
-        # Apply to targets
-        rel = self.prim.GetRelationship("vac:target")
-        for target in rel.GetForwardedTargets():
-            target_prim = self.stage.GetPrimAtPath(target)
-            xform = UsdGeom.Xformable(target_prim)
-            if xform:
-                set_rotation_on_xform(xform, rotation)
+    @on_rebind
+    def rebind(self, prim: Usd.Prim, stage: Usd.Stage):
+        # the stage was reopened or the prim resynced, the parameters may have changed
+        self.prim = prim
+        self.stage = stage
+        self._update_params()
 
     @usd_attr("vac:value", param_name="value")
     def rotate(self, value: float):
-        self._rotate(value)
-        
\ No newline at end of file
+        #carb.log_info(f"Rotor received value: {value}")
+        self.value = value
+        if Rotor._store is None or not Rotor._store.set(self, dirty=True, value=value):
+            Rotor._dirty[self] = None
+
+    @on_update(editmode=True, batch=True)
+    def update(cls, instances: list["Rotor"]):
+        if instances is not cls._instances:
+            cls._instances = instances
+            if not columnar_enabled():
+                cls._store = None
+            else:
+                cls._store = cls._store if cls._store is not None else ColumnStore(cls._COLUMNS)
+                cls._store.sync(instances, Rotor._params)
+
+        if cls._dirty:
+            rotors, cls._dirty = list(cls._dirty), {}
+            params = [r._params() for r in rotors]
+            cls._rotate_all(rotors, {name: np.array([p[name] for p in params], dtype=dtype)
+                                     for name, (dtype, _) in cls._COLUMNS.items()})
+        if cls._store is not None:
+            slots, rotors = cls._store.take_dirty()
+            if len(slots):
+                cls._rotate_all(rotors, {name: cls._store[name][slots] for name in cls._COLUMNS})
+
+    @classmethod
+    def _rotate_all(cls, rotors, columns: dict[str, np.ndarray]):
+        # Calculate rotations, as quaternions like Gf.Rotation(axis, angle).GetQuat()
+        scaled_value = columns["value"] * columns["factor"] + columns["offset"]
+        clamped = np.clip(scaled_value, columns["range_min"], columns["range_max"])
+        scaled_value = np.where(columns["clamp"], clamped, scaled_value)
+        axis = columns["axis"]
+        length = np.linalg.norm(axis, axis=1, keepdims=True)
+        axis = axis / np.where(length > 0, length, 1.0)
+        half_angle = np.radians(scaled_value)[:, None] / 2
+        # memory layout of Gf.Quatd: imaginary part first
+        quats = np.hstack((axis * np.sin(half_angle), np.cos(half_angle)))
+        #carb.log_info(f"Rotor calculated rotations: {quats}")
+
+        # Apply to targets: the Vt array converts the rows to Gf values, each target is still written on its own
+        cache = get_relationship_cache()
+        targets = [cache.get_prims(r.prim, "vac:target") if r.prim else () for r in rotors]
+        rows = np.repeat(np.arange(len(rotors)), [len(t) for t in targets])
+        set_orientations([t for rotor_targets in targets for t in rotor_targets],
+                         Vt.QuatdArray.FromNumpy(np.ascontiguousarray(quats[rows])))
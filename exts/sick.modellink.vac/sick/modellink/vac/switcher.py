@@ -1,6 +1,7 @@
 from pxr import Usd
 from injector import inject
-from sick.modellink.core.modellink_manager import linked, usd_attr
+from sick.modellink.core.modellink_manager import linked, usd_attr, on_rebind
+from sick.modellink.core import get_relationship_cache, get_signal_graph
 
 
 @linked
@@ -12,12 +13,15 @@ class Switcher:
         self.stage = stage
         self.current_state = 0
 
+    @on_rebind
+    def rebind(self, prim: Usd.Prim, stage: Usd.Stage):
+        self.prim = prim
+        self.stage = stage
+
     @usd_attr("vac:select", param_name="select_index")
     def select_target(self, select_index: int):
-        rel = self.prim.GetRelationship("vac:target")
-        targets = rel.GetForwardedTargets()
+        targets = get_relationship_cache().get_targets(self.prim, "vac:target")
         if 0 <= select_index < len(targets):
             target = targets[select_index]
-            attr = self.stage.GetAttributeAtPath(target)
             self.current_state = (self.current_state + 1) % 2  # Toggle state
-            attr.Set(self.current_state, Usd.TimeCode.Default())
\ No newline at end of file
+            get_signal_graph().set_signal(target.GetPrimPath(), target.name, self.current_state)
\ No newline at end of file
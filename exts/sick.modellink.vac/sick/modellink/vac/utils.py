@@ -1,41 +1,156 @@
+import itertools
 import carb
-from pxr import Usd, Gf, UsdGeom
+from pxr import Usd, Sdf, Gf, UsdGeom
+from sick.modellink.core.modellink_manager import ModelLinkManager
+
+
+_TRANSLATE_TYPES = {
+    UsdGeom.XformOp.PrecisionDouble: Gf.Vec3d,
+    UsdGeom.XformOp.PrecisionFloat: Gf.Vec3f,
+    UsdGeom.XformOp.PrecisionHalf: Gf.Vec3h,
+}
+_ORIENT_TYPES = {
+    UsdGeom.XformOp.PrecisionDouble: Gf.Quatd,
+    UsdGeom.XformOp.PrecisionFloat: Gf.Quatf,
+    UsdGeom.XformOp.PrecisionHalf: Gf.Quath,
+}
+
+
+class TransformWriter:
+    """ Writes translations and rotations of prims through ModelLinkManager.set_value().
+        The translate and orient op of every target prim is looked up once, together with the Gf type
+        matching its precision, and looked up again after the xformOpOrder of the prim changed.
+    """
+
+    def __init__(self) -> None:
+        # one dict per op type, hashing the op type for every write is slow
+        self._translate_ops: dict[Sdf.Path, tuple[Usd.Attribute, type]] = {}
+        self._orient_ops: dict[Sdf.Path, tuple[Usd.Attribute, type]] = {}
+        self._observing = False
+
+    #############################
+    # Public methods
+    #############################
+    def set_translation(self, target: Usd.Prim | UsdGeom.Xformable, position: Gf.Vec3d):
+        self._set(self._translate_ops, target, UsdGeom.XformOp.TypeTranslate, position)
+
+    def set_translations(self, targets, positions):
+        """ Sets the translation of many targets in one write transaction: one set_value() per target,
+            sent as one change notice when the transaction ends.
+
+        Args:
+            targets: prims or xformables
+            positions: a position per target (e.g. a Vt.Vec3dArray), or one position for all of them
+        """
+        if isinstance(positions, (Gf.Vec3d, Gf.Vec3f)):
+            positions = itertools.repeat(positions)
+        with ModelLinkManager().write_transaction():
+            for target, position in zip(targets, positions):
+                self._set(self._translate_ops, target, UsdGeom.XformOp.TypeTranslate, position)
+
+    def set_rotation(self, target: Usd.Prim | UsdGeom.Xformable, rotation: Gf.Rotation):
+        self._set(self._orient_ops, target, UsdGeom.XformOp.TypeOrient, rotation.GetQuat())
+
+    def set_rotations(self, targets, rotations):
+        """ Sets the rotation of many targets in one write transaction.
+
+        Args:
+            targets: prims or xformables
+            rotations: a Gf.Rotation per target, or one rotation for all of them
+        """
+        if isinstance(rotations, Gf.Rotation):
+            rotations = itertools.repeat(rotations)
+        with ModelLinkManager().write_transaction():
+            for target, rotation in zip(targets, rotations):
+                self._set(self._orient_ops, target, UsdGeom.XformOp.TypeOrient, rotation.GetQuat())
+
+    def set_orientations(self, targets, orientations):
+        """ Sets the orient op of many targets in one write transaction, e.g. to quaternions computed by NumPy:
+            one set_value() per target, sent as one change notice when the transaction ends.
+
+        Args:
+            targets: prims or xformables
+            orientations: a quaternion per target (e.g. a Vt.QuatdArray), or one quaternion for all of them
+        """
+        if isinstance(orientations, (Gf.Quatd, Gf.Quatf)):
+            orientations = itertools.repeat(orientations)
+        with ModelLinkManager().write_transaction():
+            for target, orientation in zip(targets, orientations):
+                self._set(self._orient_ops, target, UsdGeom.XformOp.TypeOrient, orientation)
+
+    def invalidate(self, prim_path: Sdf.Path):
+        self._translate_ops.pop(prim_path, None)
+        self._orient_ops.pop(prim_path, None)
+
+    def clear(self):
+        self._translate_ops = {}
+        self._orient_ops = {}
+
+    #############################
+    # Private methods
+    #############################
+    def _set(self, ops: dict, target, op_type: UsdGeom.XformOp.Type, value):
+        path = target.GetPath()
+        op = ops.get(path)
+        if op is None or not op[0]:
+            op = self._resolve_op(target, op_type)
+            if op is None:
+                return
+            ops[path] = op
+        attr, value_type = op
+        ModelLinkManager().set_value(attr, value if type(value) is value_type else value_type(value))
+
+    def _resolve_op(self, target, op_type: UsdGeom.XformOp.Type) -> tuple[Usd.Attribute, type] | None:
+        if not self._observing:
+            ModelLinkManager().add_property_observer(UsdGeom.Tokens.xformOpOrder, self._on_op_order_changed)
+            self._observing = True
+        if target.GetPrim().IsInstanceProxy():
+            # instance proxies are read-only
+            return None
+        xform = UsdGeom.Xformable(target)
+        if not xform:
+            return None
+        op = next((op for op in xform.GetOrderedXformOps() if op.GetOpType() == op_type), None)
+        if not op:
+            # Add the op if none exists
+            if op_type == UsdGeom.XformOp.TypeTranslate:
+                op = xform.AddTranslateOp(UsdGeom.XformOp.PrecisionDouble)
+            else:
+                op = xform.AddOrientOp(UsdGeom.XformOp.PrecisionDouble)
+        types = _TRANSLATE_TYPES if op_type == UsdGeom.XformOp.TypeTranslate else _ORIENT_TYPES
+        return op.GetAttr(), types[op.GetPrecision()]
+
+    def _on_op_order_changed(self, path: Sdf.Path):
+        self.invalidate(path.GetPrimPath())
+
+
+_transform_writer = TransformWriter()
+
+
+def get_transform_writer() -> TransformWriter:
+    return _transform_writer
 
 
 def set_translation_on_xform(xform: UsdGeom.Xformable, position: Gf.Vec3d):
     """Safely set translation on an Xform, adding translate op if necessary."""
-    ops = xform.GetOrderedXformOps() or []
-    translate_op = None
-    for op in ops:
-        if op.GetOpType() == UsdGeom.XformOp.TypeTranslate:
-            translate_op = op
-            break
-    if not translate_op:
-        # Add a translate op if none exists
-        translate_op = xform.AddTranslateOp(UsdGeom.XformOp.PrecisionDouble)
-    
-    # Set the value based on the op's precision
-    if translate_op.GetPrecision() == UsdGeom.XformOp.PrecisionFloat:
-        translate_op.Set(Gf.Vec3f(position), Usd.TimeCode.Default())
-    else:
-        translate_op.Set(position, Usd.TimeCode.Default())
+    _transform_writer.set_translation(xform, position)
+
+
+def set_translations(targets, positions):
+    """Set the translation of many Xforms at once, see TransformWriter.set_translations()."""
+    _transform_writer.set_translations(targets, positions)
 
 
 def set_rotation_on_xform(xform: UsdGeom.Xformable, rotation: Gf.Rotation):
-    """Safely set rotation on an Xform, adding rotate op if necessary."""
-    ops = xform.GetOrderedXformOps() or []
-    rotate_op = None
-    for op in ops:
-        if op.GetOpType() == UsdGeom.XformOp.TypeOrient:
-            rotate_op = op
-            break
-    if not rotate_op:
-        # Add a rotate op if none exists
-        rotate_op = xform.AddOrientOp(UsdGeom.XformOp.PrecisionDouble)
-    
-    # Set the value based on the op's precision
-    quat = rotation.GetQuat()
-    if rotate_op.GetPrecision() == UsdGeom.XformOp.PrecisionFloat:
-        rotate_op.Set(Gf.Quatf(quat), Usd.TimeCode.Default())
-    else:
-        rotate_op.Set(Gf.Quatd(quat), Usd.TimeCode.Default())
\ No newline at end of file
+    """Safely set rotation on an Xform, adding orient op if necessary."""
+    _transform_writer.set_rotation(xform, rotation)
+
+
+def set_rotations(targets, rotations):
+    """Set the rotation of many Xforms at once, see TransformWriter.set_rotations()."""
+    _transform_writer.set_rotations(targets, rotations)
+
+
+def set_orientations(targets, orientations):
+    """Set the orientation quaternion of many Xforms at once, see TransformWriter.set_orientations()."""
+    _transform_writer.set_orientations(targets, orientations)
@@ -1,12 +1,18 @@
 from pxr import Usd
 from injector import inject
-from sick.modellink.core.modellink_manager import linked, on_update, usd_attr
+from sick.modellink.core import get_signal_graph
+from sick.modellink.core.modellink_manager import linked, on_update, usd_attr, on_rebind
 
 import math
+import numpy as np
+
+_WAVE_TYPES = {"sin": 1, "square": 2, "triangle": 3, "sawtooth": 4}
 
 
 @linked
 class WaveGenerator:
+    # parameters of all instances as arrays, built again when the instances or their parameters change
+    _columns: dict | None = None
 
     @inject
     def __init__(self, prim: Usd.Prim, stage: Usd.Stage) -> None:
@@ -26,29 +32,56 @@ class WaveGenerator:
         self.wave_type = type_attr.Get() if type_attr else "sin"
         self.time = 0.0
 
-    @usd_attr("vac:amplitude;vac:frequency;vac:phase;vac:type")
+    @usd_attr("vac:amplitude;vac:frequency;vac:phase;vac:type", grouped=True)
     def _update_params(self):
+        WaveGenerator._store_columns()
         self._set_params()
 
-    @on_update()
-    def update(self, prim: Usd.Prim):
-        self.time += 0.016  # Assume ~60 FPS, dt=1/60
-        t = self.time * self.frequency + self.phase
-        if self.wave_type == "sin":
-            value = self.amplitude * math.sin(t)
-        elif self.wave_type == "square":
-            value = self.amplitude * (1 if math.sin(t) > 0 else -1)
-        elif self.wave_type == "triangle":
-            value = self.amplitude * (2 / math.pi) * math.asin(math.sin(t))
-        elif self.wave_type == "sawtooth":
-            value = self.amplitude * (2 * (t / (2 * math.pi) - math.floor(0.5 + t / (2 * math.pi))))
-        else:
-            value = 0.0
+    @on_rebind
+    def rebind(self, prim: Usd.Prim, stage: Usd.Stage):
+        # the stage was reopened or the prim resynced, the parameters may have changed
+        self.prim = prim
+        self.stage = stage
+        self._update_params()
+
+    @on_update(batch=True)
+    def update(cls, instances: list["WaveGenerator"], prims: list[Usd.Prim], dt: float):
+        columns = cls._columns
+        if columns is None or columns["instances"] is not instances:
+            cls._store_columns()
+            columns = cls._columns = cls._load_columns(instances)
+
+        time = columns["time"]
+        time += dt
+        t = time * columns["frequency"] + columns["phase"]
+        sin = np.sin(t)
+        wave_type = columns["wave_type"]
+        value = np.select(
+            [wave_type == _WAVE_TYPES["sin"], wave_type == _WAVE_TYPES["square"],
+             wave_type == _WAVE_TYPES["triangle"], wave_type == _WAVE_TYPES["sawtooth"]],
+            [sin, np.where(sin > 0, 1.0, -1.0),
+             (2 / math.pi) * np.arcsin(sin),
+             2 * (t / (2 * math.pi) - np.floor(0.5 + t / (2 * math.pi)))],
+            0.0) * columns["amplitude"]
 
         # Send via stateReceiver
-        rel = self.prim.GetRelationship("stateReceiver")
-        for target in rel.GetForwardedTargets():
-            target_prim = self.stage.GetPrimAtPath(target)
-            attr = target_prim.GetAttribute("vac:value")
-            if attr:
-                attr.Set(value, Usd.TimeCode.Default())
\ No newline at end of file
+        get_signal_graph().send_many(prims, "stateReceiver", "vac:value", value.tolist())
+
+    @classmethod
+    def _load_columns(cls, instances: list["WaveGenerator"]) -> dict:
+        return {
+            "instances": instances,
+            "amplitude": np.array([i.amplitude for i in instances], dtype=float),
+            "frequency": np.array([i.frequency for i in instances], dtype=float),
+            "phase": np.array([i.phase for i in instances], dtype=float),
+            "wave_type": np.array([_WAVE_TYPES.get(i.wave_type, 0) for i in instances]),
+            "time": np.array([i.time for i in instances], dtype=float),
+        }
+
+    @classmethod
+    def _store_columns(cls):
+        # the time is only advanced in the columns, keep it when they are built again
+        if cls._columns is not None:
+            for instance, time in zip(cls._columns["instances"], cls._columns["time"].tolist()):
+                instance.time = time
+            cls._columns = None
\ No newline at end of file
@@ -0,0 +1,101 @@
+import importlib.util
+import os
+import sys
+import pytest
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for _ext in ("sick.modellink.core", "sick.modellink.vac"):
+    sys.path.insert(0, os.path.join(_ROOT, "exts", _ext))
+
+if importlib.util.find_spec("carb") is None:  # outside of Kit
+    from kit_stubs import install
+    install()
+
+import carb.settings  # noqa: E402
+import omni.timeline  # noqa: E402
+import omni.usd  # noqa: E402
+from pxr import Usd  # noqa: E402
+import sick.modellink.core.modellink_manager as modellink_manager  # noqa: E402
+from sick.modellink.core import ModelLinkManager  # noqa: E402
+
+
+class Clock:
+    """ Replaces time.perf_counter(), advanced by the test. """
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(modellink_manager.time, "perf_counter", clock)
+    return clock
+
+
+@pytest.fixture
+def settings():
+    """ Sets carb settings for one test, e.g. settings(path, value). """
+    carb_settings = carb.settings.get_settings()
+    previous = {}
+
+    def set_setting(path: str, value):
+        previous.setdefault(path, carb_settings.get(path))
+        carb_settings.set(path, value)
+
+    yield set_setting
+    for path, value in previous.items():
+        carb_settings.set(path, value)
+
+
+@pytest.fixture
+def timeline():
+    timeline = omni.timeline.get_timeline_interface()
+    playing = timeline.is_playing()
+    timeline.playing = True
+    yield timeline
+    timeline.playing = playing
+
+
+@pytest.fixture
+def manager(timeline):
+    """ The ModelLinkManager without links. The activators are kept, they are registered when a test module
+        is imported, so every test module links its own classes.
+    """
+    manager = ModelLinkManager()
+    yield manager
+    manager.clear_links()
+    manager.get_work_queue().clear()
+    manager.get_relationship_cache().clear()
+    manager.get_signal_table().clear()
+    manager.get_signal_graph().clear()
+    manager.get_detection_cache()._last = None
+
+
+@pytest.fixture
+def stage():
+    """ An in-memory stage, set as the stage of the UsdContext. """
+    stage = Usd.Stage.CreateInMemory()
+    context = omni.usd.get_context()
+    previous, context.stage = context.stage, stage
+    yield stage
+    context.stage = previous
+
+
+def frame(manager, event: str = "update"):
+    """ Runs one frame: begin_frame() and the dispatch of event. """
+    manager.begin_frame()
+    manager.dispatch_events(modellink_manager.type_for(event))
+
+
+def define(stage: Usd.Stage, path: str, class_name: str, type_name: str = "Xform") -> Usd.Prim:
+    """ Defines a prim linked to the class with the name class_name. """
+    prim = stage.DefinePrim(path, type_name)
+    prim.SetCustomDataByKey("linkedClass", class_name)
+    return prim
@@ -0,0 +1,178 @@
+""" Minimal stand-ins for the Kit modules used by the extensions, so the tests run with plain pytest.
+    Only installed if the real modules cannot be imported, see conftest.py.
+"""
+import sys
+import tempfile
+import types
+import zlib
+from pxr import UsdUtils
+
+
+class IEvent:
+    def __init__(self, event_type, payload) -> None:
+        self.type = event_type
+        self.payload = payload
+
+
+class _Subscription:
+    def __init__(self, subscriptions: list, fn, order: int) -> None:
+        self._subscriptions = subscriptions
+        self.fn = fn
+        self.order = order
+
+    def unsubscribe(self):
+        if self in self._subscriptions:
+            self._subscriptions.remove(self)
+
+
+class IEventStream:
+    def __init__(self) -> None:
+        self.subscriptions: list[_Subscription] = []
+        self.queue: list[IEvent] = []
+
+    def push(self, event_type, payload=None):
+        self.queue.append(IEvent(event_type, payload or {}))
+
+    def pump(self):
+        queue, self.queue = self.queue, []
+        for event in queue:
+            for subscription in sorted(self.subscriptions, key=lambda s: s.order):
+                subscription.fn(event)
+
+    def dispatch(self, event_type, payload=None):
+        self.push(event_type, payload)
+        self.pump()
+
+    def create_subscription_to_pop(self, fn, order=0, name=None):
+        subscription = _Subscription(self.subscriptions, fn, order)
+        self.subscriptions.append(subscription)
+        return subscription
+
+
+class ISettings:
+    def __init__(self) -> None:
+        self.values = {}
+
+    def get(self, path):
+        return self.values.get(path)
+
+    def set(self, path, value):
+        self.values[path] = value
+
+    def set_default(self, path, value):
+        self.values.setdefault(path, value)
+
+
+class ITimeline:
+    def __init__(self) -> None:
+        self.playing = True
+        self.stream = IEventStream()
+
+    def is_playing(self) -> bool:
+        return self.playing
+
+    def get_timeline_event_stream(self):
+        return self.stream
+
+
+class IApp:
+    def __init__(self) -> None:
+        self.update = IEventStream()
+        self.pre_update = IEventStream()
+
+    def get_update_event_stream(self):
+        return self.update
+
+    def get_pre_update_event_stream(self):
+        return self.pre_update
+
+    def get_app_window(self):
+        return None
+
+
+class Selection:
+    def get_selected_prim_paths(self):
+        return []
+
+
+class UsdContext:
+    OPENED, CLOSED = 101, 102
+
+    def __init__(self) -> None:
+        self.stage = None
+        self.stream = IEventStream()
+        self.selection = Selection()
+
+    def get_stage(self):
+        return self.stage
+
+    def get_stage_id(self):
+        return UsdUtils.StageCache.Get().Insert(self.stage).ToLongInt() if self.stage else 0
+
+    def get_stage_event_stream(self):
+        return self.stream
+
+    def get_selection(self):
+        return self.selection
+
+    def open(self, stage):
+        self.stage = stage
+        self.stream.dispatch(self.OPENED)
+
+    def close(self):
+        self.stage = None
+        self.stream.dispatch(self.CLOSED)
+
+
+def _module(name: str, **attrs) -> types.ModuleType:
+    module = types.ModuleType(name)
+    module.__dict__.update(attrs)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition('.')
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    return module
+
+
+def install():
+    settings, timeline, app, context = ISettings(), ITimeline(), IApp(), UsdContext()
+    log = []
+
+    _module("carb", LOG=log,
+            log_info=lambda m: log.append(("info", m)),
+            log_warn=lambda m: log.append(("warn", m)),
+            log_error=lambda m: log.append(("error", m)))
+    _module("carb.events", IEvent=IEvent, IEventStream=IEventStream,
+            type_from_string=lambda s: zlib.crc32(s.encode()),
+            acquire_events_interface=lambda: types.SimpleNamespace(create_event_stream=IEventStream))
+    _module("carb.settings", ISettings=ISettings, get_settings=lambda: settings)
+    _module("carb.input", IInput=object, acquire_input_interface=lambda: None)
+    _module("carb.tokens", get_tokens_interface=lambda: types.SimpleNamespace(
+        resolve=lambda s: s.replace("${data}", tempfile.gettempdir())))
+
+    _module("omni")
+    _module("omni.ext", IExt=object)
+    _module("omni.kit")
+    _module("omni.kit.app", IApp=IApp, get_app=lambda: app)
+    _module("omni.kit.app._app", IApp=IApp)
+    _module("omni.kit.raycast")
+    _module("omni.kit.raycast.query", Ray=lambda *args: None, RayQueryResult=object,
+            acquire_raycast_query_interface=lambda: types.SimpleNamespace(
+                submit_raycast_query=lambda ray, callback: None))
+    _module("omni.appwindow")
+    _module("omni.appwindow._appwindow", IAppWindow=object)
+    _module("omni.timeline", ITimeline=ITimeline, get_timeline_interface=lambda: timeline,
+            TimelineEventType=types.SimpleNamespace(PLAY=1, PAUSE=2, STOP=3))
+    _module("omni.timeline._timeline", ITimeline=ITimeline)
+    _module("omni.usd", UsdContext=UsdContext, Selection=Selection, get_context=lambda: context,
+            StageEventType=types.SimpleNamespace(OPENED=UsdContext.OPENED, CLOSED=UsdContext.CLOSED))
+    _module("omni.usd._usd", UsdContext=UsdContext, Selection=Selection)
+
+    try:
+        import paho.mqtt.client  # noqa: F401
+    except ImportError:
+        client = type("Client", (), {name: lambda self, *args: None for name in
+                                     ("connect", "subscribe", "unsubscribe", "loop_start", "publish")})
+        _module("paho")
+        _module("paho.mqtt")
+        _module("paho.mqtt.client", Client=client)
@@ -0,0 +1,74 @@
+from pxr import Usd, Sdf
+from sick.modellink.core.modellink_manager import LINKING_SLICE_SETTING, LinkingPass, linked, usd_attr
+from conftest import define
+
+delivered = []
+
+
+@linked
+class AsyncSized:
+
+    def __init__(self) -> None:
+        pass
+
+    @usd_attr("size")
+    def on_size(self, prim: Usd.Prim, size: float):
+        delivered.append((str(prim.GetPath()), size))
+
+
+def build(stage, count: int = 200):
+    delivered.clear()
+    stage.DefinePrim("/World/Plain").CreateAttribute("size", Sdf.ValueTypeNames.Double).Set(1.0)
+    for i in range(count):
+        define(stage, f"/World/P{i:03}", "AsyncSized").CreateAttribute("size", Sdf.ValueTypeNames.Double).Set(1.0)
+
+
+def change(manager, stage, path: str, value: float):
+    attr = stage.GetPrimAtPath(path).GetAttribute("size")
+    attr.Set(value)
+    manager._properties_changed([attr.GetPath()])  # the notice of the ModelEventRegistry
+
+
+def finish(manager):
+    while manager.is_linking():
+        manager.begin_frame()
+
+
+def test_changes_of_unlinked_prims_are_coalesced_and_delivered_once(manager, stage, clock, settings):
+    settings(LINKING_SLICE_SETTING, 0.0)  # 64 prims per frame, the clock does not advance
+    build(stage)
+    manager.link_stage_async(stage)
+    manager.begin_frame()
+    assert 0 < len(manager._links) < 200
+    for value in (2.0, 3.0, 4.0):
+        change(manager, stage, "/World/P199", value)
+    assert list(manager._linking.changes) == [Sdf.Path("/World/P199")]
+    assert len(manager._linking.changes[Sdf.Path("/World/P199")]) == 1
+    finish(manager)
+    assert delivered == [("/World/P199", 4.0)]
+    assert len(manager._links) == 200
+
+
+def test_changes_of_prims_visited_without_link_are_dropped(manager, stage, clock, settings):
+    settings(LINKING_SLICE_SETTING, 0.0)
+    build(stage)
+    manager.link_stage_async(stage)
+    change(manager, stage, "/World/Plain", 2.0)
+    manager.begin_frame()
+    assert manager.is_linking()
+    assert Sdf.Path("/World/Plain") not in manager._linking.changes
+    finish(manager)
+    assert delivered == []
+
+
+def test_change_buffer_is_bounded(manager, stage, clock, settings, monkeypatch):
+    monkeypatch.setattr(LinkingPass, "MAX_CHANGED_PRIMS", 2)
+    build(stage, 3)
+    manager.link_stage_async(stage)
+    dropped = manager.get_notice_stats()["dropped"]
+    for i in range(3):
+        change(manager, stage, f"/World/P{i:03}", 2.0)
+    assert len(manager._linking.changes) == 2
+    assert manager.get_notice_stats()["dropped"] == dropped + 1
+    finish(manager)
+    assert sorted(delivered) == [("/World/P000", 2.0), ("/World/P001", 2.0)]
@@ -0,0 +1,101 @@
+from pxr import Sdf
+from sick.modellink.core.modellink_manager import linked, usd_attr
+from conftest import define
+
+calls = []
+
+
+@linked
+class Coalesced:
+
+    def __init__(self) -> None:
+        pass
+
+    @usd_attr("size", coalesce=True)
+    def on_size(self, size: float):
+        calls.append(("size", size))
+
+    @usd_attr("width", param_name="value")
+    def on_width(self, value: float):
+        calls.append(("width", value))
+
+    @usd_attr("length;depth", grouped=True)
+    def on_extent(self, changes: dict):
+        calls.append(("extent", changes))
+
+    @usd_attr("vac:offset;vac:factor", grouped=True, coalesce=True)
+    def on_params(self, changes: dict):
+        calls.append(("params", changes))
+
+
+def build(manager, stage):
+    calls.clear()
+    prim = define(stage, "/World/C", "Coalesced")
+    for name in ("size", "width", "length", "depth", "vac:offset", "vac:factor"):
+        prim.CreateAttribute(name, Sdf.ValueTypeNames.Double).Set(0.0)
+    manager.link_entire_stage(stage)
+    return prim
+
+
+def change(manager, prim, name: str, value: float):
+    attr = prim.GetAttribute(name)
+    attr.Set(value)
+    manager.properties_changed([attr.GetPath()])  # the notice of the ModelEventRegistry
+
+
+def test_coalesced_changes_are_delivered_once_with_the_latest_value(manager, stage):
+    prim = build(manager, stage)
+    for value in (1.0, 2.0, 3.0):
+        change(manager, prim, "size", value)
+    assert calls == []
+    manager.begin_frame()
+    assert calls == [("size", 3.0)]
+    manager.begin_frame()
+    assert calls == [("size", 3.0)]
+
+
+def test_other_changes_are_delivered_immediately(manager, stage):
+    prim = build(manager, stage)
+    change(manager, prim, "width", 1.0)
+    change(manager, prim, "width", 2.0)
+    assert calls == [("width", 1.0), ("width", 2.0)]
+
+
+def test_grouped_coalesced_changes_are_delivered_in_one_call(manager, stage):
+    prim = build(manager, stage)
+    change(manager, prim, "vac:offset", 1.0)
+    change(manager, prim, "vac:factor", 2.0)
+    change(manager, prim, "vac:offset", 3.0)
+    manager.begin_frame()
+    assert calls == [("params", {"vac:offset": 3.0, "vac:factor": 2.0})]
+
+
+def test_changes_of_a_removed_link_are_not_delivered(manager, stage):
+    prim = build(manager, stage)
+    change(manager, prim, "size", 1.0)
+    change(manager, prim, "vac:offset", 1.0)
+    manager.remove_link(prim.GetPath())
+    manager.begin_frame()
+    assert calls == []
+
+
+def test_changes_nobody_observes_are_counted_as_dropped(manager, stage):
+    prim = build(manager, stage)
+    stats = manager.get_notice_stats()
+    prim.CreateAttribute("color", Sdf.ValueTypeNames.Double).Set(1.0)
+    manager.properties_changed([prim.GetPath().AppendProperty("color"),  # not observed by the link
+                                Sdf.Path("/World/Missing.width")])  # no link, the prim is not looked up
+    change(manager, prim, "width", 1.0)
+    counts = {name: value - stats[name] for name, value in manager.get_notice_stats().items()}
+    assert counts == {"processed": 1, "dropped": 2}
+    assert calls == [("width", 1.0)]
+
+
+def test_grouped_changes_are_delivered_once_per_notice(manager, stage):
+    prim = build(manager, stage)
+    prim.GetAttribute("length").Set(1.0)
+    prim.GetAttribute("depth").Set(2.0)
+    manager.properties_changed([prim.GetPath().AppendProperty(name) for name in ("length", "width", "depth")])
+    assert calls == [("width", 0.0), ("extent", {"length": 1.0, "depth": 2.0})]
+    change(manager, prim, "depth", 3.0)
+    assert calls[2:] == [("extent", {"depth": 3.0})]
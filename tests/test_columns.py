@@ -0,0 +1,34 @@
+import numpy as np
+from sick.modellink.vac.columns import ColumnStore
+
+
+class Instance:
+
+    def __init__(self, speed: float) -> None:
+        self.speed = speed
+
+
+def load(instance: Instance) -> dict:
+    return {"speed": instance.speed, "direction": (1.0, 0.0, 0.0)}
+
+
+def test_sync_grows_removes_and_reuses_rows():
+    store = ColumnStore({"speed": (float, ()), "direction": (float, (3,))}, capacity=2)
+    a, b, c = Instance(1.0), Instance(2.0), Instance(3.0)
+    store.sync([a, b, c], load)
+    assert len(store) == 3 and len(store["speed"]) == 4  # grown by doubling
+    assert list(store["speed"][:3]) == [1.0, 2.0, 3.0]  # the rows written before growing are kept
+    assert store["direction"].shape == (4, 3) and np.all(store["direction"][:3, 0] == 1.0)
+
+    store.set(a, dirty=True, speed=5.0)
+    store.set(b, dirty=True, speed=6.0)
+    store.sync([a, c], load)
+    assert b not in store and not store.set(b, speed=7.0)
+    slots, owners = store.take_dirty()
+    assert list(owners) == [a] and store["speed"][slots[0]] == 5.0  # the dirty mark of b was removed with it
+    assert len(store.take_dirty()[0]) == 0
+
+    d = Instance(4.0)
+    store.sync([a, c, d], load)
+    assert store["speed"][1] == 4.0  # the row of b is reused
+    assert len(store["speed"]) == 4
@@ -0,0 +1,92 @@
+import pytest
+from pxr import Sdf, UsdGeom
+from sick.modellink.core.modellink_manager import linked
+
+
+@linked(isa=UsdGeom.PointBased)
+class PointBased:
+
+    def __init__(self) -> None:
+        pass
+
+
+@linked(isa="BasisCurves")
+class Curves:
+
+    def __init__(self) -> None:
+        pass
+
+
+@linked(has_api=UsdGeom.MotionAPI)
+class Moving:
+
+    def __init__(self) -> None:
+        pass
+
+
+def is_sensor(prim) -> bool:
+    return prim.GetAttribute("sensor:id").Get() == 42
+
+
+@linked(is_sensor, type_names=["Cube"], attributes=["sensor:id"], paths=["/World/Sensors"])
+class Sensor:
+
+    def __init__(self) -> None:
+        pass
+
+
+@linked(has_api="CollectionAPI")
+class Collecting:
+
+    def __init__(self) -> None:
+        pass
+
+
+def linked_classes(manager) -> dict[str, str]:
+    return {str(path): type(link._instance).__name__ for path, link in manager._links.items()}
+
+
+def test_isa_and_api_rules(manager, stage):
+    stats = manager.get_detection_stats()
+    stage.DefinePrim("/World/Mesh", "Mesh")
+    stage.DefinePrim("/World/Points", "Points")
+    stage.DefinePrim("/World/Curves", "BasisCurves")
+    stage.DefinePrim("/World/Sphere", "Sphere")
+    UsdGeom.MotionAPI.Apply(stage.DefinePrim("/World/Moving", "Scope"))
+    stage.DefinePrim("/World/Collecting", "Scope").ApplyAPI("CollectionAPI", "lights")
+    manager.link_entire_stage(stage)
+    assert linked_classes(manager) == {
+        "/World/Mesh": "PointBased",  # derived from the schema class, resolved to its type name
+        "/World/Points": "PointBased",
+        "/World/Curves": "Curves",  # the most derived match wins
+        "/World/Moving": "Moving",  # the API schema class is resolved to its schema name
+        "/World/Collecting": "Collecting",  # a multiple-apply schema is matched without its instance name
+    }
+    counts = {kind: value - stats[kind] for kind, value in manager.get_detection_stats().items()}
+    assert counts["isa"] == 3 and counts["api"] == 2
+    assert counts["none"] >= 2  # /World and /World/Sphere
+
+
+def test_isa_is_memoized_per_type_name(manager, stage):
+    for i in range(3):
+        stage.DefinePrim(f"/World/Mesh{i}", "Mesh")
+    manager.link_entire_stage(stage)
+    detector = manager._detector
+    assert detector._isa_memo["Mesh"].clazz is PointBased
+    assert Sdf.Path("/World/Mesh2") in manager._links
+
+
+@pytest.mark.parametrize("path, type_name, attribute, called", [
+    ("/World/Sensors/A", "Cube", True, True),
+    ("/World/Sensors/A", "Sphere", True, False),  # type_names
+    ("/World/Sensors/A", "Cube", False, False),  # attributes
+    ("/World/Other/A", "Cube", True, False),  # paths
+])
+def test_the_function_is_only_called_for_prims_meeting_the_prefilter(manager, stage, path, type_name, attribute, called):
+    prim = stage.DefinePrim(path, type_name)
+    if attribute:
+        prim.CreateAttribute("sensor:id", Sdf.ValueTypeNames.Int).Set(42)
+    calls = manager.get_predicate_calls().get("is_sensor;Sensor", 0)
+    manager.link_entire_stage(stage)
+    assert manager.get_predicate_calls()["is_sensor;Sensor"] - calls == int(called)
+    assert (Sdf.Path(path) in manager._links) == called
@@ -0,0 +1,140 @@
+import json
+import os
+import pytest
+from pxr import Usd, Sdf
+from injector import inject
+from sick.modellink.core.detection_cache import ENABLED_SETTING, PATH_SETTING, VALIDATE_SETTING
+from sick.modellink.core.modellink_manager import linked
+from conftest import define
+
+
+@linked
+class Cached:
+
+    def __init__(self) -> None:
+        pass
+
+
+@linked
+class Authoring:
+
+    @inject
+    def __init__(self, prim: Usd.Prim) -> None:
+        prim.CreateAttribute("state", Sdf.ValueTypeNames.Int).Set(1)
+
+
+class Cache:
+    """ The DetectionCache with the stats counted since the test started. """
+
+    def __init__(self, cache) -> None:
+        self.cache = cache
+        self._start = cache.get_stats()
+
+    def stats(self) -> dict[str, int]:
+        return {name: value - self._start[name] for name, value in self.cache.get_stats().items()}
+
+    def activator_id(self, manager, clazz) -> str:
+        return self.cache.activator_id(next(a for a in manager.get_activators() if a.clazz is clazz))
+
+
+@pytest.fixture
+def cache(manager, settings, tmp_path):
+    settings(ENABLED_SETTING, True)
+    settings(VALIDATE_SETTING, False)
+    settings(PATH_SETTING, str(tmp_path / "cache"))
+    return Cache(manager.get_detection_cache())
+
+
+@pytest.fixture
+def stage_file(tmp_path):
+    stage = Usd.Stage.CreateNew(str(tmp_path / "scene.usda"))
+    for i in range(3):
+        define(stage, f"/World/C{i}", "Cached")
+    stage.DefinePrim("/World/Plain")
+    stage.Save()
+    return str(tmp_path / "scene.usda")
+
+
+def reopen(manager, path: str) -> Usd.Stage:
+    manager.clear_links()
+    stage = Usd.Stage.Open(path)
+    manager.link_entire_stage(stage)
+    return stage
+
+
+def linked_paths(manager) -> list[str]:
+    return sorted(str(path) for path in manager._links)
+
+
+def detected(manager) -> int:
+    return sum(manager.get_detection_stats().values())
+
+
+def test_reopening_an_unchanged_stage_hits(manager, cache, stage_file):
+    reopen(manager, stage_file)
+    assert cache.stats()["misses"] == 1 and cache.stats()["stored"] == 1
+    expected = linked_paths(manager)
+    assert expected == ["/World/C0", "/World/C1", "/World/C2"]
+
+    before = detected(manager)
+    reopen(manager, stage_file)
+    assert cache.stats()["hits"] == 1
+    assert linked_paths(manager) == expected
+    assert detected(manager) == before  # no prim was detected
+
+
+def test_a_changed_layer_misses(manager, cache, stage_file):
+    stage = reopen(manager, stage_file)
+    define(stage, "/World/C3", "Cached")
+    stage.Save()
+    os.utime(stage_file, ns=(0, 0))  # the modification time may not change within its resolution
+    reopen(manager, stage_file)
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 2
+    assert "/World/C3" in linked_paths(manager)
+
+
+def test_unsaved_changes_miss(manager, cache, stage_file):
+    stage = reopen(manager, stage_file)
+    define(stage, "/World/C3", "Cached")
+    manager.clear_links()
+    manager.link_entire_stage(stage)
+    assert cache.stats()["hits"] == 0
+    assert "/World/C3" in linked_paths(manager)
+
+
+def test_a_disabled_activator_misses(manager, cache, stage_file):
+    reopen(manager, stage_file)
+    manager.set_class_enabled(Cached, False)
+    try:
+        reopen(manager, stage_file)
+        assert cache.stats()["hits"] == 0
+        assert linked_paths(manager) == []
+    finally:
+        manager.set_class_enabled(Cached, True)
+
+
+def test_validation_replaces_a_wrong_entry(manager, cache, stage_file, settings, tmp_path):
+    reopen(manager, stage_file)
+    entry, = (tmp_path / "cache").iterdir()
+    data = json.loads(entry.read_text())
+    data["links"] = [link for link in data["links"] if link[0] != "/World/C1"]
+    entry.write_text(json.dumps(data))
+
+    settings(VALIDATE_SETTING, True)
+    reopen(manager, stage_file)
+    assert cache.stats()["hits"] == 1 and cache.stats()["mismatches"] == 1
+    assert linked_paths(manager) == ["/World/C0", "/World/C1", "/World/C2"]
+    assert ["/World/C1", cache.activator_id(manager, Cached)] in json.loads(entry.read_text())["links"]
+
+
+def test_links_authoring_while_linked_still_hit(manager, cache, stage_file, settings):
+    stage = Usd.Stage.Open(stage_file)
+    define(stage, "/World/Authoring", "Authoring")
+    stage.Save()
+    assert reopen(manager, stage_file).GetRootLayer().dirty  # the link authored after the key was computed
+    del stage
+
+    settings(VALIDATE_SETTING, True)
+    reopen(manager, stage_file)
+    assert cache.stats()["hits"] == 1 and cache.stats()["mismatches"] == 0
+    assert "/World/Authoring" in linked_paths(manager)
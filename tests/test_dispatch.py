@@ -0,0 +1,101 @@
+from pxr import Usd, Sdf
+from sick.modellink.core.modellink_manager import linked, on_update, on_event, type_for
+from conftest import frame, define
+
+calls = []
+
+
+@linked
+class Dispatched:
+
+    def __init__(self) -> None:
+        pass
+
+    @on_update
+    def playing_only(self, prim: Usd.Prim):
+        calls.append(("playing", str(prim.GetPath())))
+
+    @on_update(editmode=True)
+    def always(self, prim: Usd.Prim):
+        calls.append(("always", str(prim.GetPath())))
+
+    @on_update(priority="high")
+    def first(self):
+        calls.append(("first", None))
+
+    @on_event("custom")
+    def custom(self, prim: Usd.Prim):
+        calls.append(("custom", str(prim.GetPath())))
+
+
+@linked
+class Batched:
+
+    def __init__(self) -> None:
+        pass
+
+    @on_update(batch=True)
+    def update_all(cls, instances: list, prims: list):
+        calls.append(("batch", instances, [str(prim.GetPath()) for prim in prims]))
+
+
+def link(manager, stage, count: int = 2):
+    calls.clear()
+    for i in range(count):
+        define(stage, f"/World/D{i}", "Dispatched")
+    manager.link_entire_stage(stage)
+
+
+def test_handlers_are_called_per_link_high_priority_first(manager, stage):
+    link(manager, stage)
+    frame(manager)
+    assert [kind for kind, _ in calls[:2]] == ["first", "first"]
+    assert sorted(calls[2:]) == [("always", "/World/D0"), ("always", "/World/D1"),
+                                 ("playing", "/World/D0"), ("playing", "/World/D1")]
+
+
+def test_only_editmode_handlers_are_called_when_not_playing(manager, stage, timeline):
+    link(manager, stage)
+    timeline.playing = False
+    frame(manager)
+    assert sorted(calls) == [("always", "/World/D0"), ("always", "/World/D1")]
+
+
+def test_events_are_dispatched_by_type(manager, stage):
+    link(manager, stage)
+    frame(manager, "custom")
+    assert sorted(calls) == [("custom", "/World/D0"), ("custom", "/World/D1")]
+    calls.clear()
+    manager.dispatch_events(type_for("unknown"))
+    assert calls == []
+
+
+def test_removed_link_is_not_dispatched(manager, stage):
+    link(manager, stage)
+    frame(manager)  # builds the dispatch lists
+    manager.remove_link(Sdf.Path("/World/D0"))
+    calls.clear()
+    frame(manager)
+    assert {path for _, path in calls if path} == {"/World/D1"}
+    assert len(calls) == 3
+
+
+def test_batch_handlers_get_all_live_instances(manager, stage):
+    calls.clear()
+    for i in range(3):
+        define(stage, f"/World/B{i}", "Batched")
+    manager.link_entire_stage(stage)
+    frame(manager)
+    frame(manager)
+    (_, first, paths), (_, second, _) = calls
+    assert sorted(paths) == ["/World/B0", "/World/B1", "/World/B2"]
+    assert first is second  # kept until a link of the class is added or removed
+    assert all(type(instance) is Batched for instance in first)
+
+    removed = manager._links[Sdf.Path("/World/B1")]._instance
+    manager.remove_link(Sdf.Path("/World/B1"))
+    calls.clear()
+    frame(manager)
+    (_, instances, paths), = calls
+    assert sorted(paths) == ["/World/B0", "/World/B2"]
+    assert len(instances) == 2 and removed not in instances
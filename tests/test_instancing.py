@@ -0,0 +1,69 @@
+import pytest
+from pxr import Sdf
+from sick.modellink.core.modellink_manager import INSTANCE_PROXIES_SETTING, linked
+
+
+@linked("Cone")
+class InstancedPart:
+
+    def __init__(self) -> None:
+        pass
+
+
+@pytest.fixture
+def only_instanced_part(manager):
+    """ Detects with the activator of InstancedPart only, the scoped activators of other test modules
+        make the detection depend on the path, which turns the per-prototype results off.
+    """
+    activator = next(a for a in manager.get_activators() if a.clazz is InstancedPart)
+    manager.get_activators = lambda: iter([activator])
+    manager._detector.invalidate()
+    yield
+    del manager.get_activators
+    manager._detector.invalidate()
+
+
+def build(stage, count: int = 3):
+    stage.DefinePrim("/Prototypes/Robot/Arm", "Cone")
+    stage.DefinePrim("/Prototypes/Robot/Base", "Cube")
+    for i in range(count):
+        prim = stage.DefinePrim(f"/World/Robot{i}")
+        prim.GetReferences().AddInternalReference("/Prototypes/Robot")
+        prim.SetInstanceable(True)
+
+
+def world_links(manager) -> list[str]:
+    return sorted(str(path) for path in manager._links if str(path).startswith("/World"))
+
+
+def test_instance_proxies_are_only_linked_with_the_setting(manager, stage, settings):
+    build(stage)
+    settings(INSTANCE_PROXIES_SETTING, False)
+    manager.link_entire_stage(stage)
+    assert world_links(manager) == []
+
+    settings(INSTANCE_PROXIES_SETTING, True)
+    manager.link_entire_stage(stage)
+    assert world_links(manager) == ["/World/Robot0/Arm", "/World/Robot1/Arm", "/World/Robot2/Arm"]
+    assert all(manager._links[Sdf.Path(path)]._prim.IsInstanceProxy() for path in world_links(manager))
+
+
+def test_instance_proxies_are_detected_once_per_prototype_prim(manager, stage, settings, only_instanced_part):
+    settings(INSTANCE_PROXIES_SETTING, True)
+    build(stage, 10)
+    before = manager.get_detection_stats()["prototype"]
+    manager.link_entire_stage(stage)
+    assert len(world_links(manager)) == 10
+    # the first instance is detected, the proxies of the other instances reuse its result
+    assert manager.get_detection_stats()["prototype"] - before == 2 * 9
+
+
+def test_a_change_in_the_prototype_relinks_all_instances(manager, stage, settings):
+    settings(INSTANCE_PROXIES_SETTING, True)
+    build(stage)
+    manager.link_entire_stage(stage)
+    old = {path: manager._links[Sdf.Path(path)] for path in world_links(manager)}
+    prototype = stage.GetPrimAtPath("/World/Robot0").GetPrototype()
+    manager.relink_subtree(prototype.GetPath().AppendChild("Arm"), stage)
+    assert world_links(manager) == sorted(old)
+    assert all(manager._links[Sdf.Path(path)] is not link for path, link in old.items())
@@ -0,0 +1,135 @@
+import os
+import threading
+import carb
+import pytest
+from pxr import Usd, Sdf
+from sick.modellink.core.modellink_manager import OFFLOAD_WORKERS_SETTING, linked, on_update, type_for
+from conftest import frame, define
+
+MAIN = threading.get_ident()
+UPDATE = type_for("update")
+
+
+@linked
+class OffloadFilter:
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.threads = set()
+
+    def snapshot(self):
+        assert threading.get_ident() == MAIN
+        self.count += 1
+        return self.count
+
+    @on_update(offload=True)
+    def compute(self, snapshot):
+        self.threads.add(threading.get_ident())
+        return {"out": float(snapshot * 2)}
+
+
+@linked
+class OffloadNone:
+
+    def __init__(self) -> None:
+        self.snapshots = []
+
+    def snapshot(self):
+        return None
+
+    @on_update(offload=True)
+    def compute(self, snapshot):
+        self.snapshots.append(snapshot)
+
+
+@linked
+class OffloadWithoutSnapshot:
+
+    def __init__(self) -> None:
+        pass
+
+    @on_update(offload=True)
+    def compute(self, snapshot):
+        return {}
+
+
+@linked
+class OffloadWithPrim:
+
+    def __init__(self) -> None:
+        pass
+
+    def snapshot(self):
+        return 0
+
+    @on_update(offload=True)
+    def compute(self, prim: Usd.Prim):
+        return {}
+
+
+def wait(manager):
+    for call in manager._offloaded:
+        call.future.exception(timeout=5)
+
+
+def test_offloaded_result_is_committed_in_the_next_frame(manager, stage):
+    prim = define(stage, "/World/Filter", "OffloadFilter")
+    prim.CreateAttribute("out", Sdf.ValueTypeNames.Double).Set(0.0)
+    manager.link_entire_stage(stage)
+    frame(manager)
+    wait(manager)
+    assert prim.GetAttribute("out").Get() == 0.0
+    manager.begin_frame()
+    assert prim.GetAttribute("out").Get() == 2.0
+    instance = manager._links[prim.GetPath()]._instance
+    assert MAIN not in instance.threads
+
+
+def test_result_of_a_removed_link_is_discarded(manager, stage):
+    prim = define(stage, "/World/Filter", "OffloadFilter")
+    prim.CreateAttribute("out", Sdf.ValueTypeNames.Double).Set(0.0)
+    manager.link_entire_stage(stage)
+    frame(manager)
+    wait(manager)
+    manager.remove_link(prim.GetPath())
+    manager.begin_frame()
+    assert prim.GetAttribute("out").Get() == 0.0
+    assert not manager._offloaded
+
+
+def test_snapshot_none_is_passed(manager, stage):
+    define(stage, "/World/None", "OffloadNone")
+    manager.link_entire_stage(stage)
+    frame(manager)
+    wait(manager)
+    calls = list(manager._offloaded)
+    manager.begin_frame()
+    assert calls[0].future is None  # committed
+    assert manager._links[Sdf.Path("/World/None")]._instance.snapshots == [None]
+
+
+@pytest.mark.parametrize("class_name", ["OffloadWithoutSnapshot", "OffloadWithPrim"])
+def test_offloaded_method_is_rejected(manager, stage, class_name):
+    define(stage, "/World/Rejected", class_name)
+    manager.link_entire_stage(stage)
+    link = manager._links[Sdf.Path("/World/Rejected")]
+    assert not link._event_plans.get(UPDATE)
+    frame(manager)
+    assert not manager._offloaded
+    log = getattr(carb, "LOG", None)  # only recorded by the test doubles
+    if log is not None:
+        assert any(level == "warn" and class_name in message for level, message in log)
+
+
+@pytest.mark.parametrize("workers, expected", [(0, os.cpu_count()), (3, 3)])
+def test_worker_count(manager, stage, settings, monkeypatch, workers, expected):
+    settings(OFFLOAD_WORKERS_SETTING, workers)
+    monkeypatch.setattr(manager, "_executor", None)  # created with the setting on the first offload
+    define(stage, "/World/None", "OffloadNone")
+    manager.link_entire_stage(stage)
+    frame(manager)
+    wait(manager)
+    executor = manager._executor
+    manager.begin_frame()
+    executor.shutdown()
+    assert executor._max_workers == expected
@@ -0,0 +1,112 @@
+import time
+import pytest
+from pxr import Usd
+from sick.modellink.core.modellink_manager import linked, on_update
+from sick.modellink.vac.wave_generator import WaveGenerator
+from conftest import frame, define
+
+calls = []
+
+
+@linked
+class RateLimited:
+
+    def __init__(self) -> None:
+        pass
+
+    @on_update(hz=10)
+    def tick(self, dt: float):
+        calls.append(("tick", dt, time.perf_counter()))
+
+
+@linked
+class RateLimitedBatch:
+
+    def __init__(self) -> None:
+        pass
+
+    @on_update(batch=True, hz=10)
+    def tick_all(cls, instances: list, dt: float):
+        calls.append(("batch", dt, time.perf_counter()))
+
+
+@linked
+class RateLimitedPath:
+
+    def __init__(self) -> None:
+        pass
+
+    @on_update(hz=10)
+    def tick(self, prim: Usd.Prim):
+        calls.append(("path", str(prim.GetPath()), time.perf_counter()))
+
+
+@pytest.fixture(autouse=True)
+def clear_calls():
+    calls.clear()
+
+
+def run_frames(manager, clock, count: int, seconds: float = 1 / 60):
+    for _ in range(count):
+        clock.advance(seconds)
+        frame(manager)
+
+
+@pytest.mark.parametrize("class_name, kind", [("RateLimited", "tick"), ("RateLimitedBatch", "batch")])
+def test_rate_is_limited(manager, stage, clock, class_name, kind):
+    define(stage, "/World/A", class_name)
+    manager.link_entire_stage(stage)
+    run_frames(manager, clock, 60)
+    dts = [dt for name, dt, _ in calls if name == kind]
+    assert 8 <= len(dts) <= 11
+    assert all(dt <= 0.1 + 1 / 60 + 1e-9 for dt in dts)
+    # no time is lost between the calls
+    times = [t for name, _, t in calls if name == kind]
+    assert sum(dts[1:]) == pytest.approx(times[-1] - times[0], abs=1e-6)
+
+
+@pytest.mark.parametrize("class_name, kind", [("RateLimited", "tick"), ("RateLimitedBatch", "batch")])
+def test_pause_does_not_count(manager, stage, clock, timeline, class_name, kind):
+    define(stage, "/World/A", class_name)
+    manager.link_entire_stage(stage)
+    run_frames(manager, clock, 30)
+    timeline.playing = False
+    run_frames(manager, clock, 30)  # 0.5 s paused
+    calls.clear()
+    timeline.playing = True
+    run_frames(manager, clock, 12)
+    dts = [dt for name, dt, _ in calls if name == kind]
+    assert dts and max(dts) <= 0.1 + 1 / 60 + 1e-9
+
+
+def test_calls_are_spread_over_the_first_frames_after_play(manager, stage, clock, timeline):
+    timeline.playing = False
+    for i in range(20):
+        define(stage, f"/World/A{i}", "RateLimitedPath")
+    manager.link_entire_stage(stage)
+    run_frames(manager, clock, 30)  # 0.5 s stopped
+    assert calls == []
+    timeline.playing = True
+    counts = []
+    for _ in range(7):  # one period at 60 fps and a frame
+        before = len(calls)
+        run_frames(manager, clock, 1)
+        counts.append(len(calls) - before)
+    assert {path for _, path, _ in calls} == {f"/World/A{i}" for i in range(20)}
+    assert max(counts) <= 5
+
+
+def test_pause_does_not_move_the_wave(manager, stage, clock, timeline):
+    define(stage, "/World/Wave", "WaveGenerator")
+    manager.link_entire_stage(stage)
+    run_frames(manager, clock, 30)
+    WaveGenerator._store_columns()
+    instance = next(manager.get_modellinks())._instance
+    before = instance.time
+
+    timeline.playing = False
+    run_frames(manager, clock, 30)  # 0.5 s paused
+    timeline.playing = True
+    run_frames(manager, clock, 1)
+    WaveGenerator._store_columns()
+    assert instance.time - before <= 1 / 30 + 1e-9
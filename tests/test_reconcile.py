@@ -0,0 +1,160 @@
+import pytest
+import carb.settings
+from pxr import Usd, Sdf
+from injector import inject
+import sick.modellink.core as core
+from sick.modellink.core.modellink_manager import RECONCILE_SETTING, linked, on_rebind, on_update
+from conftest import frame, define
+
+events = []
+
+
+@linked
+class Rebindable:
+
+    @inject
+    def __init__(self, prim: Usd.Prim) -> None:
+        self.prim = prim
+
+    @on_rebind
+    def rebind(self, prim: Usd.Prim):
+        events.append(("rebind", str(prim.GetPath())))
+        self.prim = prim
+
+    @on_update
+    def update(self, prim: Usd.Prim):
+        events.append(("update", prim))
+
+
+@linked
+class Injected:
+
+    @on_rebind
+    def rebind(self):
+        pass
+
+    @on_update
+    def update(self, settings: carb.settings.ISettings):
+        events.append(("injected", settings))
+
+
+@linked
+class NotRebindable:
+
+    def __init__(self) -> None:
+        pass
+
+
+@pytest.fixture(autouse=True)
+def removed():
+    """ The paths of the removed links, of current and of suspended ones. """
+    paths = []
+
+    def on_event(e):
+        if e.type == core.MODELLINK_REMOVED:
+            paths.append(str(e.payload["prim_path"]))
+        elif e.type == core.MODELLINK_BATCH_REMOVED:
+            paths.extend(e.payload["prim_paths"])
+    subscription = core.get_event_stream().create_subscription_to_pop(on_event)
+    yield paths
+    subscription.unsubscribe()
+
+
+def build(stage):
+    events.clear()
+    for name in ("A", "B"):
+        define(stage, f"/World/{name}", "Rebindable")
+    define(stage, "/World/N", "NotRebindable")
+
+
+def instances(manager) -> dict[str, object]:
+    return {str(path): link._instance for path, link in manager._links.items()}
+
+
+def reopen(manager, stage) -> Usd.Stage:
+    # the same layers in a new stage, like closing and opening the file
+    manager.suspend_links()
+    assert not manager._links
+    reopened = Usd.Stage.Open(stage.GetRootLayer())
+    manager.reconcile_stage(reopened)
+    return reopened
+
+
+def test_reopen_keeps_and_rebinds_links(manager, stage, removed):
+    build(stage)
+    manager.link_entire_stage(stage)
+    before = instances(manager)
+    stage.RemovePrim("/World/B")
+    define(stage, "/World/C", "Rebindable")
+    events.clear()
+
+    reopened = reopen(manager, stage)
+    after = instances(manager)
+    assert sorted(after) == ["/World/A", "/World/C", "/World/N"]
+    assert after["/World/A"] is before["/World/A"]
+    assert after["/World/N"] is not before["/World/N"]  # without @on_rebind it is created again
+    assert [e for e in events if e[0] != "update"] == [("rebind", "/World/A")]
+    assert sorted(removed) == ["/World/B", "/World/N"]
+    assert after["/World/A"].prim.GetStage() == reopened
+
+    events.clear()
+    frame(manager)
+    assert {e[1].GetStage() for e in events if e[0] == "update"} == {reopened}
+
+
+def test_prim_detected_by_another_class_is_linked_again(manager, stage, removed):
+    build(stage)
+    manager.link_entire_stage(stage)
+    before = instances(manager)
+    stage.GetPrimAtPath("/World/A").SetCustomDataByKey("linkedClass", "NotRebindable")
+    reopen(manager, stage)
+    assert type(instances(manager)["/World/A"]) is NotRebindable
+    assert "/World/A" in removed and ("rebind", "/World/A") not in events
+    assert instances(manager)["/World/B"] is before["/World/B"]
+
+
+def test_without_suspended_links_the_stage_is_linked(manager, stage):
+    build(stage)
+    manager.reconcile_stage(stage)
+    assert sorted(instances(manager)) == ["/World/A", "/World/B", "/World/N"]
+    assert events == []
+
+
+def test_relink_subtree_reconciles(manager, stage, settings):
+    settings(RECONCILE_SETTING, True)
+    build(stage)
+    manager.link_entire_stage(stage)
+    before = instances(manager)
+    manager.relink_subtree(Sdf.Path("/World"), stage)
+    after = instances(manager)
+    assert after["/World/A"] is before["/World/A"] and after["/World/B"] is before["/World/B"]
+    assert after["/World/N"] is not before["/World/N"]
+    assert sorted(events) == [("rebind", "/World/A"), ("rebind", "/World/B")]
+
+
+def test_clear_links_removes_suspended_links(manager, stage, removed):
+    build(stage)
+    manager.link_entire_stage(stage)
+    manager.suspend_links()
+    manager.clear_links()
+    assert sorted(removed) == ["/World/A", "/World/B", "/World/N"]
+    manager.reconcile_stage(stage)
+    assert events == []
+
+
+def test_rebind_resolves_the_injected_parameters_again(manager, stage, monkeypatch):
+    resolved = []
+    get = manager._injector.get
+    monkeypatch.setattr(manager._injector, "get", lambda interface: resolved.append(interface) or get(interface))
+    define(stage, "/World/I", "Injected")
+    manager.link_entire_stage(stage)
+    events.clear()
+    for _ in range(3):
+        frame(manager)
+    assert len(resolved) == 1  # once per link, not per call
+    assert [e[1] for e in events] == [carb.settings.get_settings()] * 3
+
+    reopen(manager, stage)
+    frame(manager)
+    frame(manager)
+    assert resolved == [carb.settings.ISettings] * 2
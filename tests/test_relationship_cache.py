@@ -0,0 +1,97 @@
+import pytest
+from pxr import Usd, Sdf, Tf
+from sick.modellink.core.relationship_cache import RelationshipCache
+
+
+@pytest.fixture
+def cache(stage):
+    """ A RelationshipCache told about the changes of the stage like by the ModelEventRegistry. """
+    cache = RelationshipCache()
+
+    def on_changed(notice, sender):
+        cache.changed(notice.GetResyncedPaths(), notice.GetChangedInfoOnlyPaths())
+    listener = Tf.Notice.Register(Usd.Notice.ObjectsChanged, on_changed, stage)
+    yield cache
+    listener.Revoke()
+
+
+def targets(*paths) -> list[Sdf.Path]:
+    return [Sdf.Path(path) for path in paths]
+
+
+def build(stage):
+    for name in ("A", "B", "C"):
+        stage.DefinePrim(f"/World/{name}").CreateAttribute("vac:value", Sdf.ValueTypeNames.Double)
+    source = stage.DefinePrim("/World/Source")
+    source.CreateRelationship("stateReceiver").SetTargets(targets("/World/A", "/World/B"))
+    return source
+
+
+def test_targets_are_cached(stage, cache):
+    source = build(stage)
+    first = cache.get_prims(source, "stateReceiver")
+    assert [p.GetName() for p in first] == ["A", "B"]
+    assert cache.get_prims(source, "stateReceiver") is first
+
+
+def test_a_target_edit_invalidates(stage, cache):
+    source = build(stage)
+    cache.get_prims(source, "stateReceiver")
+    cache.get_attributes(source, "stateReceiver", "vac:value")
+    source.GetRelationship("stateReceiver").SetTargets(targets("/World/C"))
+    assert [p.GetName() for p in cache.get_prims(source, "stateReceiver")] == ["C"]
+    assert [str(a.GetPath()) for a in cache.get_attributes(source, "stateReceiver", "vac:value")] == \
+        ["/World/C.vac:value"]
+
+
+def test_a_target_edit_of_a_forwarded_relationship_invalidates(stage, cache):
+    source = build(stage)
+    hub = stage.DefinePrim("/World/Hub").CreateRelationship("out")
+    hub.SetTargets(targets("/World/A"))
+    source.GetRelationship("stateReceiver").SetTargets([hub.GetPath()])
+    assert cache.get_targets(source, "stateReceiver") == tuple(targets("/World/A"))
+    hub.SetTargets(targets("/World/B"))
+    assert cache.get_targets(source, "stateReceiver") == tuple(targets("/World/B"))
+
+
+def test_a_resynced_target_invalidates(stage, cache):
+    source = build(stage)
+    assert len(cache.get_attributes(source, "stateReceiver", "vac:value")) == 2
+    stage.RemovePrim("/World/B")
+    assert [p.GetName() for p in cache.get_prims(source, "stateReceiver")] == ["A"]
+    assert len(cache.get_attributes(source, "stateReceiver", "vac:value")) == 1
+    stage.DefinePrim("/World/B").CreateAttribute("vac:value", Sdf.ValueTypeNames.Double)
+    assert [p.GetName() for p in cache.get_prims(source, "stateReceiver")] == ["A", "B"]
+    assert len(cache.get_attributes(source, "stateReceiver", "vac:value")) == 2
+
+
+def test_value_changes_keep_the_entry(stage, cache):
+    source = build(stage)
+    first = cache.get_attributes(source, "stateReceiver", "vac:value")
+    stage.GetPrimAtPath("/World/A").GetAttribute("vac:value").Set(1.0)
+    assert cache.get_attributes(source, "stateReceiver", "vac:value") is first
+
+
+def test_targets_of_instance_proxies_are_mapped_to_their_instance(stage, cache):
+    stage.DefinePrim("/Prototypes/Robot/Arm").CreateAttribute("vac:value", Sdf.ValueTypeNames.Double)
+    stage.DefinePrim("/Prototypes/Robot/Sensor").CreateRelationship("stateReceiver").SetTargets(
+        targets("/Prototypes/Robot/Arm"))
+    for i in range(2):
+        instance = stage.DefinePrim(f"/World/Robot{i}")
+        instance.GetReferences().AddInternalReference("/Prototypes/Robot")
+        instance.SetInstanceable(True)
+
+    for i in range(2):
+        sensor = stage.GetPrimAtPath(f"/World/Robot{i}/Sensor")
+        assert sensor.IsInstanceProxy()
+        assert cache.get_targets(sensor, "stateReceiver") == tuple(targets(f"/World/Robot{i}/Arm"))
+        attr, = cache.get_attributes(sensor, "stateReceiver", "vac:value")
+        assert attr.GetPath() == Sdf.Path(f"/World/Robot{i}/Arm.vac:value")
+
+    # an edit of the prototype is reported for the prototype, it invalidates the entries of all instances
+    stage.DefinePrim("/Prototypes/Robot/Base").CreateAttribute("vac:value", Sdf.ValueTypeNames.Double)
+    stage.GetPrimAtPath("/Prototypes/Robot/Sensor").GetRelationship("stateReceiver").SetTargets(
+        targets("/Prototypes/Robot/Base"))
+    for i in range(2):
+        sensor = stage.GetPrimAtPath(f"/World/Robot{i}/Sensor")
+        assert cache.get_targets(sensor, "stateReceiver") == tuple(targets(f"/World/Robot{i}/Base"))
@@ -0,0 +1,85 @@
+import pytest
+from pxr import Sdf
+import sick.modellink.core as core
+from sick.modellink.core.modellink_manager import linked
+from conftest import define
+
+
+@linked
+class Relinked:
+
+    def __init__(self) -> None:
+        pass
+
+
+@pytest.fixture
+def events():
+    received = []
+    subscription = core.get_event_stream().create_subscription_to_pop(
+        lambda e: received.append((e.type, dict(e.payload))))
+    yield received
+    subscription.unsubscribe()
+
+
+def build(manager, stage):
+    for path in ("/World/A1", "/World/A1/B", "/World/A1/B/C", "/World/A10", "/World/A2"):
+        define(stage, path, "Relinked")
+    manager.link_entire_stage(stage)
+
+
+def paths(values) -> list[str]:
+    return [str(path) for path in values]
+
+
+def test_link_paths_under_a_root(manager, stage):
+    build(manager, stage)
+    assert paths(manager.get_link_paths_under(Sdf.Path("/World/A1"))) == \
+        ["/World/A1", "/World/A1/B", "/World/A1/B/C"]
+    assert paths(manager.get_link_paths_under(Sdf.Path("/World/A1/B/C"))) == ["/World/A1/B/C"]
+    assert manager.get_link_paths_under(Sdf.Path("/World/X")) == []
+
+
+def test_relink_renews_only_the_subtree(manager, stage):
+    build(manager, stage)
+    outside = {path: manager._links[Sdf.Path(path)] for path in ("/World/A10", "/World/A2")}
+    inside = manager._links[Sdf.Path("/World/A1/B")]
+    stage.RemovePrim("/World/A1/B/C")
+    define(stage, "/World/A1/D", "Relinked")
+    manager.relink_subtree(Sdf.Path("/World/A1"), stage)
+    assert paths(manager.get_link_paths_under(Sdf.Path("/World/A1"))) == ["/World/A1", "/World/A1/B", "/World/A1/D"]
+    assert manager._links[Sdf.Path("/World/A1/B")] is not inside
+    assert all(manager._links[Sdf.Path(path)] is link for path, link in outside.items())
+    assert paths(sorted(manager._links)) == sorted(paths(manager._link_paths))
+
+
+def test_relink_of_a_removed_or_inactive_root_removes_its_links(manager, stage, events):
+    build(manager, stage)
+    stage.GetPrimAtPath("/World/A1").SetActive(False)
+    manager.relink_subtree(Sdf.Path("/World/A1"), stage)
+    assert paths(manager._link_paths) == ["/World/A10", "/World/A2"]
+    removed = [payload["prim_paths"] for kind, payload in events if kind == core.MODELLINK_BATCH_REMOVED]
+    assert removed == [["/World/A1", "/World/A1/B", "/World/A1/B/C"]]
+
+    stage.RemovePrim("/World/A10")
+    manager.relink_subtree(Sdf.Path("/World/A10"), stage)
+    assert paths(manager._link_paths) == ["/World/A2"]
+
+
+def test_bulk_linking_fires_one_batched_event(manager, stage, events):
+    build(manager, stage)
+    kinds = [kind for kind, _ in events]
+    assert kinds.count(core.MODELLINK_BATCH_ADDED) == 1 and core.MODELLINK_ADDED not in kinds
+    added, = [payload["prim_paths"] for kind, payload in events if kind == core.MODELLINK_BATCH_ADDED]
+    assert sorted(added) == ["/World/A1", "/World/A1/B", "/World/A1/B/C", "/World/A10", "/World/A2"]
+
+    events.clear()
+    with manager.bulk_linking():
+        with manager.bulk_linking():  # nested, the outermost context fires the event
+            manager.create_new_link(define(stage, "/World/A3", "Relinked"))
+        assert events == []
+        manager.create_new_link(define(stage, "/World/A4", "Relinked"))
+    assert events == [(core.MODELLINK_BATCH_ADDED, {"prim_paths": ["/World/A3", "/World/A4"]})]
+
+    events.clear()
+    manager.clear_links()
+    assert [(kind, len(payload["prim_paths"])) for kind, payload in events] == [(core.MODELLINK_BATCH_REMOVED, 7)]
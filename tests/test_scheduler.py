@@ -0,0 +1,52 @@
+from pxr import Usd
+from sick.modellink.core.modellink_manager import FRAME_BUDGET_SETTING, MAX_DEFER_FRAMES_SETTING, linked, on_update
+from conftest import frame, define
+
+calls = []
+clock_ref = []
+
+
+@linked
+class LowPriority:
+
+    def __init__(self) -> None:
+        pass
+
+    @on_update(priority="low")
+    def work(self, prim: Usd.Prim):
+        calls.append(prim.GetPath())
+        clock_ref[0].advance(0.001)
+
+
+def link(manager, stage, clock, count: int = 20):
+    calls.clear()
+    clock_ref[:] = [clock]
+    for i in range(count):
+        define(stage, f"/World/Low_{i}", "LowPriority")
+    manager.link_entire_stage(stage)
+
+
+def test_without_budget_nothing_is_deferred(manager, stage, clock, settings):
+    settings(FRAME_BUDGET_SETTING, 0.0)
+    link(manager, stage, clock)
+    frame(manager)  # reads the settings
+    calls.clear()
+    frame(manager)
+    assert len(calls) == 20
+
+
+def test_budget_defers_low_priority_but_calls_every_one(manager, stage, clock, settings):
+    settings(FRAME_BUDGET_SETTING, 5.0)
+    settings(MAX_DEFER_FRAMES_SETTING, 10)
+    link(manager, stage, clock)
+    frame(manager)
+    calls.clear()
+    counts = []
+    for _ in range(10):
+        before = len(calls)
+        frame(manager)
+        counts.append(len(calls) - before)
+    assert max(counts) < 20
+    assert min(counts) >= 2  # the starvation minimum, 20 handlers within 10 frames
+    assert len(set(calls)) == 20
+    assert manager.get_scheduler_stats()["deferred"] > 0
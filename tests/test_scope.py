@@ -0,0 +1,41 @@
+import pytest
+from pxr import Sdf
+from sick.modellink.core.modellink_manager import SKIP_MARKER_SETTING, linked
+from conftest import define
+
+
+@linked(include=["/World/Cells"])
+class ScopedCell:
+
+    def __init__(self) -> None:
+        pass
+
+
+def build(stage):
+    for name in ("A", "Skip/B", "Skip/C"):
+        define(stage, f"/World/Cells/{name}", "ScopedCell")
+    define(stage, "/World/Outside/D", "ScopedCell")
+    stage.GetPrimAtPath("/World/Cells/Skip").SetCustomDataByKey("modellink:skip", True)
+
+
+def linked_paths(manager) -> set[str]:
+    return {str(path) for path in manager._links}
+
+
+@pytest.mark.parametrize("skip_marker, expected", [
+    (False, {"/World/Cells/A", "/World/Cells/Skip/B", "/World/Cells/Skip/C"}),
+    (True, {"/World/Cells/A"}),
+])
+def test_scope_and_skip_marker(manager, stage, settings, skip_marker, expected):
+    settings(SKIP_MARKER_SETTING, skip_marker)
+    build(stage)
+    manager.link_entire_stage(stage)
+    assert linked_paths(manager) == expected
+
+
+def test_relink_below_a_skipped_prim(manager, stage, settings):
+    settings(SKIP_MARKER_SETTING, True)
+    build(stage)
+    manager.link_entire_stage(stage)
+    manager.relink_subtree(Sdf.Path("/World/Cells/Skip/B"), stage)
+    assert linked_paths(manager) == {"/World/Cells/A"}
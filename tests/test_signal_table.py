@@ -0,0 +1,75 @@
+from pxr import Usd, Sdf, Tf, UsdGeom
+from sick.modellink.core import signal_table
+from sick.modellink.core.signal_table import MIRROR_RATE_SETTING
+import sick.modellink.vac.enabler  # noqa: F401, links Enabler
+from conftest import define
+
+
+def add_signal(manager, stage, path: str = "/World/Signal"):
+    prim = stage.DefinePrim(path)
+    prim.CreateAttribute("vac:value", Sdf.ValueTypeNames.Double).Set(0.0)
+    table = manager.get_signal_table()
+    return table, table.get_id(prim.GetPath(), "vac:value"), prim.GetAttribute("vac:value")
+
+
+def test_values_are_mirrored_every_frame(manager, stage, settings):
+    settings(MIRROR_RATE_SETTING, 0)
+    table, signal_id, attr = add_signal(manager, stage)
+    table.set(signal_id, 2.5)
+    assert table.get_value(Sdf.Path("/World/Signal"), "vac:value") == 2.5
+    assert attr.Get() == 0.0
+    table.update()
+    assert attr.Get() == 2.5
+
+
+def test_negative_rate_mirrors_on_demand(manager, stage, settings):
+    settings(MIRROR_RATE_SETTING, -1)
+    table, signal_id, attr = add_signal(manager, stage)
+    table.set(signal_id, 2.5)
+    table.update()
+    assert attr.Get() == 0.0
+    table.mirror()
+    assert attr.Get() == 2.5
+
+
+def test_authored_values_are_taken_over(manager, stage, settings):
+    table, signal_id, attr = add_signal(manager, stage)
+    attr.Set(4.0)
+    manager._properties_changed([attr.GetPath()])  # the notice of the ModelEventRegistry
+    assert table.get(signal_id) == 4.0
+
+
+def test_mirror_rate_throttles_the_writes(manager, stage, settings, monkeypatch):
+    now = [signal_table.time.monotonic() + 1.0]
+    monkeypatch.setattr(signal_table.time, "monotonic", lambda: now[0])
+    settings(MIRROR_RATE_SETTING, 10)
+    table, signal_id, attr = add_signal(manager, stage)
+    writes = []
+    listener = Tf.Notice.Register(Usd.Notice.ObjectsChanged,
+                                  lambda notice, sender: writes.extend(notice.GetChangedInfoOnlyPaths()), stage)
+    try:
+        for frame in range(60):  # one second at 60 fps
+            table.set(signal_id, float(frame))
+            table.update()
+            now[0] += 1 / 60
+    finally:
+        listener.Revoke()
+    assert 8 <= writes.count(attr.GetPath()) <= 10  # a period ends on the frame after it elapsed
+    assert attr.Get() >= 54.0  # the latest value was written within the last period
+
+
+def test_enabler_sets_the_visibility_through_the_table(manager, stage, settings):
+    settings(MIRROR_RATE_SETTING, -1)
+    light = stage.DefinePrim("/World/Light", "SphereLight")
+    define(stage, "/World/Enabler", "Enabler").CreateRelationship("vac:target").SetTargets(
+        [light.GetPath().AppendProperty("visibility")])
+    manager.link_entire_stage(stage)
+    table = manager.get_signal_table()
+    assert table.get_value(light.GetPath(), "visibility") == UsdGeom.Tokens.invisible
+    enabler = manager._links[Sdf.Path("/World/Enabler")]._instance
+    enabler.enable_light(True)
+    assert table.get_value(light.GetPath(), "visibility") == UsdGeom.Tokens.inherited
+    assert UsdGeom.Imageable(light).GetVisibilityAttr().Get() == UsdGeom.Tokens.inherited  # not mirrored yet
+    enabler.enable_light(False)
+    table.mirror()
+    assert UsdGeom.Imageable(light).GetVisibilityAttr().Get() == UsdGeom.Tokens.invisible
@@ -0,0 +1,44 @@
+import pytest
+from pxr import Gf, UsdGeom
+from sick.modellink.vac import geo_tools
+from sick.modellink.vac.utils import TransformWriter
+
+
+@pytest.fixture
+def writer(manager):
+    writer = TransformWriter()
+    yield writer
+    manager.remove_property_observer(UsdGeom.Tokens.xformOpOrder, writer._on_op_order_changed)
+
+
+def test_the_op_is_looked_up_again_after_the_op_order_changed(manager, stage, writer):
+    xform = UsdGeom.Xform.Define(stage, "/World/Target")
+    first = xform.AddTranslateOp(UsdGeom.XformOp.PrecisionDouble)
+    writer.set_translation(xform, Gf.Vec3d(1, 2, 3))
+    assert first.Get() == Gf.Vec3d(1, 2, 3)
+
+    xform.ClearXformOpOrder()
+    second = xform.AddTranslateOp(UsdGeom.XformOp.PrecisionFloat, "moved")
+    writer.set_translation(xform, Gf.Vec3d(4, 5, 6))
+    assert second.Get() is None  # the cached op is still used until the change is reported
+
+    manager._properties_changed([xform.GetPrim().GetAttribute(UsdGeom.Tokens.xformOpOrder).GetPath()])
+    writer.set_translation(xform, Gf.Vec3d(7, 8, 9))
+    assert second.Get() == Gf.Vec3f(7, 8, 9)
+    assert first.Get() == Gf.Vec3d(4, 5, 6)
+
+
+def test_set_rotate_writes_the_op_of_the_rotation_order(manager, stage):
+    xform = UsdGeom.Xform.Define(stage, "/World/Rotated")
+    xform.AddTranslateOp()
+    xform.AddRotateZYXOp(UsdGeom.XformOp.PrecisionDouble).Set(Gf.Vec3d(0, 0, 0))
+    for angle in (10.0, 20.0):
+        geo_tools.setRotate(xform.GetPrim(), Gf.Vec3f(0, angle, 0))
+    assert xform.GetPrim().GetAttribute("xformOp:rotateZYX").Get() == Gf.Vec3d(0, 20, 0)
+
+
+def test_set_rotate_adds_a_rotate_op(manager, stage):
+    prim = UsdGeom.Xform.Define(stage, "/World/Plain").GetPrim()
+    geo_tools.setRotate(prim, Gf.Vec3f(0, 10, 0))
+    geo_tools.setRotate(prim, Gf.Vec3f(0, 20, 0))
+    assert prim.GetAttribute("xformOp:rotateXYZ").Get() == Gf.Vec3f(0, 20, 0)
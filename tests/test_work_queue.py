@@ -0,0 +1,89 @@
+import threading
+from sick.modellink.core import post
+from sick.modellink.core.modellink_manager import linked, on_post
+from sick.modellink.core.work_queue import BATCH_SIZE_SETTING
+from conftest import define
+
+received = []
+
+
+@linked
+class Posted:
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    @on_post
+    def on_value(self, value):
+        received.append((threading.get_ident(), value))
+
+
+def link(manager, stage):
+    received.clear()
+    define(stage, "/World/P", "Posted")
+    manager.link_entire_stage(stage)
+
+
+def test_values_posted_by_threads_are_delivered_on_the_main_thread(manager, stage):
+    link(manager, stage)
+    threads = [threading.Thread(target=post, args=("/World/P", i, "keep_all", f"source{i}")) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert received == []
+    manager.begin_frame()
+    assert sorted(value for _, value in received) == [0, 1, 2, 3]
+    assert {ident for ident, _ in received} == {threading.get_ident()}
+
+
+def test_policies(manager, stage):
+    link(manager, stage)
+    for i in range(3):
+        post("/World/P", i, "latest", "latest")
+        post("/World/P", i, "keep_all", "all")
+        post("/World/P", i, "aggregate", "aggregate")
+    manager.begin_frame()
+    assert sorted((value for _, value in received), key=repr) == [0, 1, 2, 2, [0, 1, 2]]
+
+
+def test_callables_are_called_with_the_instance(manager, stage):
+    link(manager, stage)
+    post("/World/P", lambda instance: setattr(instance, "calls", instance.calls + 1), "keep_all")
+    manager.begin_frame()
+    assert next(manager.get_modellinks())._instance.calls == 1
+
+
+def test_batch_size_spreads_items_over_frames(manager, stage, settings):
+    settings(BATCH_SIZE_SETTING, 2)
+    link(manager, stage)
+    for i in range(5):
+        post("/World/P", i, "keep_all")
+    counts = []
+    for _ in range(3):
+        before = len(received)
+        manager.begin_frame()
+        counts.append(len(received) - before)
+    assert counts == [2, 2, 1]
+    assert [value for _, value in received] == [0, 1, 2, 3, 4]
+
+
+def test_items_without_link_are_dropped(manager, stage):
+    link(manager, stage)
+    queue = manager.get_work_queue()
+    dropped = queue.get_stats()["dropped"]
+    post("/World/Missing", 1)
+    manager.begin_frame()
+    assert received == []
+    assert queue.get_stats()["dropped"] == dropped + 1 and queue.get_depth() == 0
+
+
+def test_batch_size_limits_aggregated_lists(manager, stage, settings):
+    settings(BATCH_SIZE_SETTING, 2)
+    link(manager, stage)
+    for i in range(5):
+        post("/World/P", i, "aggregate")
+    for _ in range(3):
+        manager.begin_frame()
+    assert [value for _, value in received] == [[0, 1], [2, 3], [4]]
+    assert manager.get_work_queue().get_depth() == 0
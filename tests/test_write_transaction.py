@@ -0,0 +1,33 @@
+from pxr import Sdf
+
+
+def attribute(stage, path: str):
+    prim = stage.DefinePrim(path)
+    return prim.CreateAttribute("value", Sdf.ValueTypeNames.Double)
+
+
+def test_writes_are_collected_until_the_transaction_ends(manager, stage):
+    attr = attribute(stage, "/World/A")
+    with manager.write_transaction():
+        manager.set_value(attr, 1.0)
+        manager.set_value(attr, 2.0)
+        assert attr.Get() is None
+    assert attr.Get() == 2.0
+
+
+def test_an_expired_attribute_does_not_discard_the_other_writes(manager, stage):
+    expired, valid = attribute(stage, "/World/A"), attribute(stage, "/World/B")
+    with manager.write_transaction():
+        manager.set_value(expired, 1.0)
+        stage.RemovePrim("/World/A")  # e.g. by a handler earlier in the frame
+        manager.set_value(valid, 2.0)
+    assert valid.Get() == 2.0
+
+
+def test_a_failed_write_does_not_discard_the_other_writes(manager, stage):
+    wrong, valid = attribute(stage, "/World/A"), attribute(stage, "/World/B")
+    with manager.write_transaction():
+        manager.set_value(wrong, "not a double")
+        manager.set_value(valid, 2.0)
+    assert wrong.Get() is None
+    assert valid.Get() == 2.0